@@ -21,6 +21,7 @@ from .continuous import (
     ContinuousPointwiseIterableDataset,
     ContinuousIntegralIterableDataset,
     DictImportanceSampledPointwiseIterableDataset,
+    DictMemmapPointwiseIterableDataset,
     DictVariationalDataset,
     DictInferencePointwiseDataset,
 )
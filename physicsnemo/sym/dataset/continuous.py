@@ -16,10 +16,13 @@
 
 """PhysicsNeMo Dataset constructors for continuous type data"""
 
-from typing import Dict, List, Callable
+from typing import Dict, List, Callable, Union
 
 import numpy as np
+import torch
 
+from physicsnemo.sym.constants import tf_dt
+from physicsnemo.sym.distributed import DistributedManager
 from physicsnemo.sym.utils.io.vtk import var_to_polyvtk
 from .dataset import Dataset, IterableDataset, _DictDatasetMixin
 
@@ -94,6 +97,8 @@ class ContinuousPointwiseIterableDataset(IterableDataset):
     """
     An infinitely iterable dataset for a continuous set of pointwise training examples.
     This will resample training examples (create new ones) every iteration.
+    If `device` is given the functions return tensors on that device and the
+    batches are not pinned.
     """
 
     def __init__(
@@ -101,14 +106,21 @@ class ContinuousPointwiseIterableDataset(IterableDataset):
         invar_fn: Callable,
         outvar_fn: Callable,
         lambda_weighting_fn: Callable = None,
+        device: Union[str, torch.device, None] = None,
     ):
         self.invar_fn = invar_fn
         self.outvar_fn = outvar_fn
         self.lambda_weighting_fn = lambda_weighting_fn
+        self.pin_memory = device is None
         if lambda_weighting_fn is None:
 
             def lambda_weighting_fn(_, outvar):
-                return {key: np.ones_like(x) for key, x in outvar.items()}
+                return {
+                    key: torch.ones_like(x)
+                    if isinstance(x, torch.Tensor)
+                    else np.ones_like(x)
+                    for key, x in outvar.items()
+                }
 
         def iterable_function():
             while True:
@@ -216,6 +228,199 @@ class DictImportanceSampledPointwiseIterableDataset(
         yield from self.iterable_function()
 
 
+class DictMemmapPointwiseIterableDataset(IterableDataset):
+    """
+    An infinitely iterable dataset for a finite set of pointwise training
+    examples that may be larger than memory, e.g. memory mapped `.npy` files.
+
+    Unlike `DictPointwiseDataset` the arrays are not converted to tensors up
+    front, every batch is read from contiguous blocks of rows. Every epoch
+    shuffles the order of the blocks and the rows within a window of
+    `shuffle_blocks` blocks, so reads stay sequential. The blocks are split
+    between the dataloader workers and data parallel ranks.
+
+    Parameters
+    ----------
+    invar : Dict[str, Union[float, np.array, str]]
+        Dictionary of numpy arrays as input, or paths of `.npy` files that are
+        memory mapped. Files are opened in every dataloader worker, so they
+        are shared between workers without copies. Constant inputs (e.g.
+        `area`) can be given as scalars.
+    outvar : Dict[str, Union[np.array, str]]
+        Dictionary of numpy arrays or `.npy` paths as target outputs.
+    batch_size : int
+        Batch size
+    lambda_weighting : Dict[str, Union[float, np.array, str]], optional
+        Dictionary of weightings of the outputs. Constant weightings are given
+        as scalars and only expanded for each batch, by default 1.0
+    shuffle : bool, optional
+        Randomly shuffle examples, by default True
+    block_size : int, optional
+        Number of consecutive rows read at once, by default 65536
+    shuffle_blocks : int, optional
+        Number of blocks whose rows are shuffled together, by default 16
+    seed : int, optional
+        Seed of the shuffling, must be the same on every rank, by default 0
+    """
+
+    def __init__(
+        self,
+        invar: Dict[str, Union[float, np.array, str]],
+        outvar: Dict[str, Union[np.array, str]],
+        batch_size: int,
+        lambda_weighting: Dict[str, Union[float, np.array, str]] = None,
+        shuffle: bool = True,
+        block_size: int = 65536,
+        shuffle_blocks: int = 16,
+        seed: int = 0,
+    ):
+        if lambda_weighting is None:
+            lambda_weighting = {key: 1.0 for key in outvar.keys()}
+        self.paths = {
+            key: value
+            for key, value in {**invar, **outvar}.items()
+            if isinstance(value, str)
+        }
+        self.paths.update(
+            {
+                "lambda_" + key: value
+                for key, value in lambda_weighting.items()
+                if isinstance(value, str)
+            }
+        )
+        self._invar_keys = list(invar.keys())
+        self._outvar_keys = list(outvar.keys())
+        self.arrays = {
+            **invar,
+            **outvar,
+            **{"lambda_" + key: value for key, value in lambda_weighting.items()},
+        }
+        self._open_files()
+
+        lengths = [len(value) for value in self.arrays.values() if np.ndim(value) > 0]
+        assert lengths and lengths[0] > 0, "error, dataset is empty"
+        self.length = lengths[0]
+        self.batch_size = batch_size
+        self.shuffle = shuffle
+        self.block_size = block_size
+        self.shuffle_blocks = shuffle_blocks
+        self.seed = seed
+
+    def _open_files(self):
+        for key, path in self.paths.items():
+            self.arrays[key] = np.load(path, mmap_mode="r")
+
+    def worker_init_fn(self, iworker):
+        super().worker_init_fn(iworker)
+        # each worker maps the files itself instead of receiving a copy
+        self._open_files()
+
+    def __getstate__(self):
+        # files are mapped again in the worker, see worker_init_fn
+        state = self.__dict__.copy()
+        state["arrays"] = {
+            key: value for key, value in self.arrays.items() if key not in self.paths
+        }
+        return state
+
+    def __iter__(self):
+        # split the blocks between data parallel ranks and dataloader workers
+        manager = DistributedManager()
+        rank = manager.group_rank("data_parallel") if manager.distributed else 0
+        size = manager.group_size("data_parallel") if manager.distributed else 1
+        worker_info = torch.utils.data.get_worker_info()
+        if worker_info is not None:
+            rank = rank * worker_info.num_workers + worker_info.id
+            size = size * worker_info.num_workers
+        nr_blocks = -(-self.length // self.block_size)
+
+        epoch = 0
+        pending = None
+        while True:
+            if self.shuffle:
+                rng = np.random.default_rng([self.seed, epoch])
+                blocks = rng.permutation(nr_blocks)
+            else:
+                blocks = np.arange(nr_blocks)
+            # with fewer blocks than shards every shard reads all blocks
+            if nr_blocks >= size:
+                blocks = blocks[rank::size]
+
+            for i in range(0, len(blocks), self.shuffle_blocks):
+                window = self._read_blocks(np.sort(blocks[i : i + self.shuffle_blocks]))
+                if self.shuffle:
+                    perm = rng.permutation(len(next(iter(window.values()))))
+                    window = {key: value[perm] for key, value in window.items()}
+                if pending is not None:
+                    window = {
+                        key: np.concatenate([pending[key], value])
+                        for key, value in window.items()
+                    }
+
+                # yield full batches, the rest is carried to the next window
+                nr_rows = len(next(iter(window.values())))
+                start = 0
+                while nr_rows - start >= self.batch_size:
+                    yield self._batch(
+                        {
+                            key: value[start : start + self.batch_size]
+                            for key, value in window.items()
+                        }
+                    )
+                    start += self.batch_size
+                pending = {key: value[start:] for key, value in window.items()}
+            epoch += 1
+
+    def _read_blocks(self, blocks):
+        window = {}
+        for key, value in self.arrays.items():
+            if np.ndim(value) == 0:
+                continue  # constants are expanded in _batch
+            window[key] = np.concatenate(
+                [
+                    value[block * self.block_size : (block + 1) * self.block_size]
+                    for block in blocks
+                ]
+            )
+        return window
+
+    def _batch(self, rows):
+        # expand constants to the batch, outputs and weightings share their shape
+        nr_rows = len(next(iter(rows.values())))
+        tensors = {}
+        for key in self._outvar_keys + self._invar_keys:
+            value = self.arrays[key]
+            if np.ndim(value) == 0:
+                tensors[key] = torch.full((nr_rows, 1), float(value), dtype=tf_dt)
+            else:
+                tensors[key] = torch.as_tensor(rows[key], dtype=tf_dt)
+        for key in self._outvar_keys:
+            value = self.arrays["lambda_" + key]
+            if np.ndim(value) == 0:
+                tensors["lambda_" + key] = torch.full_like(tensors[key], float(value))
+            else:
+                tensors["lambda_" + key] = torch.as_tensor(
+                    rows["lambda_" + key], dtype=tf_dt
+                )
+
+        invar = {key: tensors[key] for key in self._invar_keys}
+        outvar = {key: tensors[key] for key in self._outvar_keys}
+        lambda_weighting = {key: tensors["lambda_" + key] for key in self._outvar_keys}
+        return (invar, outvar, lambda_weighting)
+
+    @property
+    def invar_keys(self):
+        return list(self._invar_keys)
+
+    @property
+    def outvar_keys(self):
+        return list(self._outvar_keys)
+
+    def save_dataset(self, filename):
+        # Dataset may not fit in memory
+        pass
+
+
 class ListIntegralDataset(_DictDatasetMixin, Dataset):
     """
     A map-style dataset for a finite set of integral training examples.
@@ -28,6 +28,9 @@ from physicsnemo.sym.distributed import DistributedManager
 class _BaseDataset:
     "Defines common requirements across map- and iterable- style datasets"
 
+    # datasets that already produce device tensors cannot use pinned memory
+    pin_memory = True
+
     def worker_init_fn(self, iworker):
         "Called by each worker in torch dataloader when it initialises"
 
@@ -21,6 +21,7 @@ from typing import Union, Dict, List
 
 import numpy as np
 import h5py
+import torch
 
 from physicsnemo.sym.utils.io.vtk import grid_to_vtk
 from physicsnemo.sym.dataset.dataset import Dataset, _DictDatasetMixin
@@ -71,7 +72,27 @@ class DictGridDataset(_DictGridDatasetMixin, Dataset):
 
 
 class HDF5GridDataset(Dataset):
-    """lazy-loading HDF5 map-style grid dataset"""
+    """lazy-loading HDF5 map-style grid dataset
+
+    Batches are read with one hyperslab read per variable, in increasing
+    index order, and the decompressed chunks are kept in the HDF5 chunk cache
+    of every worker so examples sharing a chunk are only decompressed once.
+
+    Parameters
+    ----------
+    filename : Union[str, Path]
+        Path of the HDF5 file
+    invar_keys : List[str]
+        Names of the input variables in the file, arrays of form [N, cin, xdim, ...]
+    outvar_keys : List[str]
+        Names of the target output variables in the file
+    n_examples : int, optional
+        Number of examples to use, by default all examples in the file
+    chunk_cache_mb : int, optional
+        Size of the chunk cache of every variable in MB, by default 64
+    """
+
+    auto_collation = True
 
     def __init__(
         self,
@@ -79,10 +100,12 @@ class HDF5GridDataset(Dataset):
         invar_keys: List[str],
         outvar_keys: List[str],
         n_examples: int = None,
+        chunk_cache_mb: int = 64,
     ):
         self._invar_keys = invar_keys
         self._outvar_keys = outvar_keys
         self.path = Path(filename)
+        self.chunk_cache_mb = chunk_cache_mb
 
         # check path
         assert self.path.is_file(), f"Could not find file {self.path}"
@@ -109,17 +132,32 @@ class HDF5GridDataset(Dataset):
         self.length = length
 
     def __getitem__(self, idx):
-        invar = Dataset._to_tensor_dict(
-            {k: self.f[k][idx, ...] for k in self.invar_keys}
-        )
-        outvar = Dataset._to_tensor_dict(
-            {k: self.f[k][idx, ...] for k in self.outvar_keys}
-        )
-        lambda_weighting = Dataset._to_tensor_dict(
-            {k: np.ones_like(v) for k, v in outvar.items()}
-        )
+        # idx is a batch of indices, or a single index for a single example
+        if np.ndim(idx) == 0:
+            var = {k: self.f[k][idx, ...] for k in self.invar_keys + self.outvar_keys}
+        else:
+            var = self._read_batch(np.asarray(idx, dtype=np.int64))
+        invar = Dataset._to_tensor_dict({k: var[k] for k in self.invar_keys})
+        outvar = Dataset._to_tensor_dict({k: var[k] for k in self.outvar_keys})
+        # constant weighting, created once per batch
+        lambda_weighting = {k: torch.ones_like(v) for k, v in outvar.items()}
         return invar, outvar, lambda_weighting
 
+    def _read_batch(self, idx):
+        # h5py requires increasing indices, read the sorted unique indices
+        # (a contiguous slice if possible) and restore the order of the batch
+        unique_idx, inverse = np.unique(idx, return_inverse=True)
+        if unique_idx[-1] - unique_idx[0] + 1 == len(unique_idx):
+            selection = slice(int(unique_idx[0]), int(unique_idx[-1]) + 1)
+        else:
+            selection = unique_idx
+        in_order = len(unique_idx) == len(idx) and np.all(unique_idx == idx)
+        var = {}
+        for k in self.invar_keys + self.outvar_keys:
+            value = self.f[k][selection, ...]
+            var[k] = value if in_order else value[inverse]
+        return var
+
     def __len__(self):
         return self.length
 
@@ -129,7 +167,12 @@ class HDF5GridDataset(Dataset):
         # note each torch DataLoader worker process should open file individually when reading
         # do not share open file descriptors across separate workers!
         # note files are closed when worker process is destroyed so no need to explicitly close
-        self.f = h5py.File(self.path, "r")
+        self.f = h5py.File(
+            self.path,
+            "r",
+            rdcc_nbytes=self.chunk_cache_mb * 1024**2,
+            rdcc_nslots=100003,  # prime, much larger than the number of cached chunks
+        )
 
     @property
     def invar_keys(self):
@@ -17,6 +17,7 @@
 import torch
 import torch.nn.functional as F
 import torch.distributed as dist
+from torch._utils import _flatten_dense_tensors, _unflatten_dense_tensors
 
 
 def get_memory_format(tensor):
@@ -165,3 +166,82 @@ def _gather(input_, dim_, group=None):
     output = torch.cat(tensor_list, dim=dim_).contiguous(memory_format=input_format)
 
     return output
+
+
+def broadcast_parameters(module, src=0, group=None):
+    """Broadcast the parameters and buffers of a module from rank `src`."""
+    if dist.get_world_size(group=group) == 1:
+        return
+    with torch.no_grad():
+        for tensor in list(module.parameters()) + list(module.buffers()):
+            dist.broadcast(tensor.data, src=src, group=group)
+
+
+def all_reduce_gradients(parameters, group=None, bucket_cap_mb=25, keep_graph=False):
+    """
+    Average the gradients of `parameters` across the process group.
+
+    Gradients are flattened into buckets of at most `bucket_cap_mb` megabytes
+    (per dtype) so that a typical model is synchronized with a single
+    all-reduce call instead of one call per parameter.
+
+    With `keep_graph`, gradients created with `create_graph=True` keep their
+    local autograd graph: a detached copy is averaged and the gradient is
+    replaced by its local value plus the constant difference to the average.
+    """
+    world_size = dist.get_world_size(group=group)
+    if world_size == 1:
+        return
+
+    # missing gradients are zero so every rank reduces the same buckets
+    params, grads = [], []
+    for param in parameters:
+        if not param.requires_grad:
+            continue
+        if param.grad is None:
+            param.grad = torch.zeros_like(param)
+        params.append(param)
+        grads.append(param.grad)
+
+    if keep_graph:
+        reduced = [grad.detach().clone() for grad in grads]
+        all_reduce_mean(reduced, group=group, bucket_cap_mb=bucket_cap_mb)
+        for param, grad, mean in zip(params, grads, reduced):
+            param.grad = grad + (mean - grad.detach())
+    else:
+        all_reduce_mean(grads, group=group, bucket_cap_mb=bucket_cap_mb)
+
+
+def all_reduce_mean(tensors, group=None, bucket_cap_mb=25):
+    """
+    Average a list of tensors in place across the process group, using one
+    all-reduce per bucket of at most `bucket_cap_mb` megabytes.
+    """
+    world_size = dist.get_world_size(group=group)
+    if world_size == 1:
+        return
+
+    # group tensors into buckets of the same dtype and device
+    bucket_cap = bucket_cap_mb * 1024 * 1024
+    buckets, bucket_size = {}, {}
+    list_buckets = []
+    for tensor in tensors:
+        key = (tensor.dtype, tensor.device)
+        nbytes = tensor.numel() * tensor.element_size()
+        if key in buckets and bucket_size[key] + nbytes > bucket_cap:
+            list_buckets.append(buckets.pop(key))
+        if key not in buckets:
+            buckets[key] = []
+            bucket_size[key] = 0
+        buckets[key].append(tensor)
+        bucket_size[key] += nbytes
+    list_buckets.extend(buckets.values())
+
+    # one all-reduce per bucket
+    with torch.no_grad():
+        for bucket in list_buckets:
+            flat = _flatten_dense_tensors(bucket)
+            dist.all_reduce(flat, group=group)
+            flat.div_(world_size)
+            for tensor, reduced in zip(bucket, _unflatten_dense_tensors(flat, bucket)):
+                tensor.copy_(reduced)
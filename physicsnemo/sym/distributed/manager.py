@@ -51,6 +51,8 @@ class DistributedManager(object):
             obj._find_unused_parameters = False
         if not hasattr(obj, "_cuda_graphs"):
             obj._cuda_graphs = False
+        if not hasattr(obj, "_ddp_mode"):
+            obj._ddp_mode = "constraint"
 
         return obj
 
@@ -161,6 +163,35 @@ class DistributedManager(object):
 
         self._cuda_graphs = graphs
 
+    @property
+    def ddp_mode(self):
+        return self._ddp_mode
+
+    @ddp_mode.setter
+    def ddp_mode(self, mode: str):
+        # "constraint" wraps every constraint graph in its own DDP instance,
+        # "domain" synchronizes the gradients of the global optimizer model once per step
+        if mode not in ["constraint", "domain"]:
+            raise ValueError(
+                f"Unknown ddp_mode {mode}, supported modes are 'constraint' and 'domain'"
+            )
+        self._ddp_mode = mode
+
+    @staticmethod
+    def barrier(name=None):
+        """
+        Barrier over the named process group that also works with the gloo
+        backend, where `device_ids` is not supported
+        """
+        manager = DistributedManager()
+        if not manager.distributed:
+            return
+        group = manager.group(name)
+        if dist.get_backend(group) == "nccl":
+            dist.barrier(group=group, device_ids=[manager.local_rank])
+        else:
+            dist.barrier(group=group)
+
     @staticmethod
     def get_available_backend():
         if torch.cuda.is_available() and torch.distributed.is_nccl_available():
@@ -175,7 +206,7 @@ class DistributedManager(object):
         if "LOCAL_RANK" in os.environ:
             local_rank = int(os.environ.get("LOCAL_RANK"))
         else:
-            local_rank = rank % torch.cuda.device_count()
+            local_rank = rank % max(torch.cuda.device_count(), 1)
         addr = os.environ.get("MASTER_ADDR")
         port = os.environ.get("MASTER_PORT")
 
@@ -265,7 +296,7 @@ class DistributedManager(object):
             manager._rank = rank
             manager._world_size = world_size
             if local_rank is None:
-                manager._local_rank = rank % torch.cuda.device_count()
+                manager._local_rank = rank % max(torch.cuda.device_count(), 1)
             else:
                 manager._local_rank = local_rank
 
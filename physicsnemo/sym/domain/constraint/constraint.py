@@ -14,7 +14,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from typing import Union, List
+from typing import Union, List, Dict
 
 import torch
 import logging
@@ -34,6 +34,62 @@ logger = logging.getLogger(__name__)
 Tensor = torch.Tensor
 
 
+class _BatchBufferPool:
+    """
+    Packs all tensors of a batch into one contiguous host buffer and copies it
+    to the device in a single transfer, returning views of the device buffer.
+
+    The host buffer is pinned so the copy is asynchronous. Buffers are reused
+    while the batches fit, so the views of a transfer are overwritten by the
+    next transfer.
+    """
+
+    def __init__(self, device: torch.device):
+        self.device = torch.device(device)
+        self._host = None
+        self._device = None
+        self._copied = None
+
+    def transfer(
+        self, tensor_dicts: List[Dict[str, Tensor]], requires_grad: List[bool]
+    ) -> List[Dict[str, Tensor]]:
+        tensor_dicts = [
+            {key: torch.as_tensor(value, dtype=tf_dt) for key, value in d.items()}
+            for d in tensor_dicts
+        ]
+        numel = sum(value.numel() for d in tensor_dicts for value in d.values())
+        pin = self.device.type == "cuda"
+        if self._host is None or self._host.numel() < numel:
+            self._host = torch.empty(numel, dtype=tf_dt, pin_memory=pin)
+            self._device = torch.empty(numel, dtype=tf_dt, device=self.device)
+            self._copied = None
+        elif self._copied is not None:
+            # the previous copy may still read from the host buffer
+            self._copied.synchronize()
+
+        # pack on the host and copy once
+        host = self._host[:numel]
+        torch.cat(
+            [value.reshape(-1) for d in tensor_dicts for value in d.values()], out=host
+        )
+        self._device[:numel].copy_(host, non_blocking=pin)
+        if pin:
+            self._copied = torch.cuda.Event()
+            self._copied.record()
+
+        # device views of each key
+        offset = 0
+        out = []
+        for d, grad in zip(tensor_dicts, requires_grad):
+            views = {}
+            for key, value in d.items():
+                view = self._device[offset : offset + value.numel()].view(value.shape)
+                views[key] = view.requires_grad_(grad) if grad else view
+                offset += value.numel()
+            out.append(views)
+        return out
+
+
 class Constraint:
     """Base class for constraints"""
 
@@ -73,22 +129,7 @@ class Constraint:
             Key.convert_list(self.dataset.outvar_keys),
         )
         self.model.to(self.device)
-        if self.manager.distributed:
-            # https://pytorch.org/docs/master/notes/cuda.html#id5
-            s = torch.cuda.Stream()
-            s.wait_stream(torch.cuda.current_stream())
-            with torch.cuda.stream(s):
-                self.model = DistributedDataParallel(
-                    self.model,
-                    device_ids=[self.manager.local_rank],
-                    output_device=self.device,
-                    broadcast_buffers=self.manager.broadcast_buffers,
-                    find_unused_parameters=self.manager.find_unused_parameters,
-                    process_group=self.manager.group(
-                        "data_parallel"
-                    ),  # None by default
-                )
-            torch.cuda.current_stream().wait_stream(s)
+        self.model = Constraint._distributed_model(self.model)
 
         self._input_names = Key.convert_list(dataset.invar_keys)
         self._output_names = Key.convert_list(dataset.outvar_keys)
@@ -120,6 +161,64 @@ class Constraint:
     def save_batch(self, filename: str):
         raise NotImplementedError("Subclass of Constraint needs to implement this")
 
+    @staticmethod
+    def _distributed_model(model):
+        # in "domain" ddp mode gradients are synchronized once per step by the trainer
+        manager = DistributedManager()
+        if not manager.distributed or manager.ddp_mode == "domain":
+            return model
+        if not manager.cuda:
+            return DistributedDataParallel(
+                model,
+                broadcast_buffers=manager.broadcast_buffers,
+                find_unused_parameters=manager.find_unused_parameters,
+                process_group=manager.group("data_parallel"),  # None by default
+            )
+
+        # https://pytorch.org/docs/master/notes/cuda.html#id5
+        s = torch.cuda.Stream()
+        s.wait_stream(torch.cuda.current_stream())
+        with torch.cuda.stream(s):
+            model = DistributedDataParallel(
+                model,
+                device_ids=[manager.local_rank],
+                output_device=manager.device,
+                broadcast_buffers=manager.broadcast_buffers,
+                find_unused_parameters=manager.find_unused_parameters,
+                process_group=manager.group("data_parallel"),  # None by default
+            )
+        torch.cuda.current_stream().wait_stream(s)
+        return model
+
+    def _set_device_batch(
+        self, tensor_dicts: List[Dict[str, Tensor]], requires_grad: List[bool]
+    ) -> List[Dict[str, Tensor]]:
+        "Move the dictionaries of a training batch to the constraint device"
+        # "cuda" matches the tensors on the current device, e.g. "cuda:0"
+        device = None if self.device is None else torch.device(self.device)
+        on_device = device is not None and all(
+            value.device.type == device.type
+            and device.index in (None, value.device.index)
+            for d in tensor_dicts
+            for value in d.values()
+        )
+        if device is None or device.type == "cpu" or on_device:
+            # host tensors and batches sampled on the device are used without copies
+            return [
+                Constraint._set_device(d, device=self.device, requires_grad=grad)
+                for d, grad in zip(tensor_dicts, requires_grad)
+            ]
+        if getattr(self, "_buffer_pool", None) is None:
+            self._buffer_pool = _BatchBufferPool(self.device)
+        return self._buffer_pool.transfer(tensor_dicts, requires_grad)
+
+    @staticmethod
+    def _copy_static(static_dict: Dict[str, Tensor], tensor_dict: Dict[str, Tensor]):
+        "Copy a batch into the static tensors, unless they are already the same memory"
+        for key, value in tensor_dict.items():
+            if static_dict[key].data_ptr() != value.data_ptr():
+                static_dict[key].data.copy_(value)
+
     @staticmethod
     def _set_device(tensor_dict, device=None, requires_grad=False):
         # convert np to torch if needed
@@ -195,7 +294,7 @@ class Constraint:
                     dataset,
                     batch_size=None,
                     sampler=batch_sampler,
-                    pin_memory=True,
+                    pin_memory=dataset.pin_memory,
                     num_workers=num_workers,
                     worker_init_fn=dataset.worker_init_fn,
                     persistent_workers=persistent_workers,
@@ -208,7 +307,7 @@ class Constraint:
                 dataloader = DataLoader(
                     dataset,
                     batch_sampler=batch_sampler,
-                    pin_memory=True,
+                    pin_memory=dataset.pin_memory,
                     num_workers=num_workers,
                     worker_init_fn=dataset.worker_init_fn,
                     persistent_workers=persistent_workers,
@@ -220,7 +319,7 @@ class Constraint:
             dataloader = DataLoader(
                 dataset,
                 batch_size=None,
-                pin_memory=True,
+                pin_memory=dataset.pin_memory,
                 num_workers=num_workers,
                 worker_init_fn=dataset.worker_init_fn,
                 persistent_workers=persistent_workers,
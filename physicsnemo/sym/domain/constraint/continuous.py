@@ -16,8 +16,8 @@
 
 """Continuous type constraints"""
 
+import functools
 import torch
-from torch.nn.parallel import DistributedDataParallel
 import numpy as np
 from typing import Dict, List, Union, Tuple, Callable
 import sympy as sp
@@ -33,6 +33,7 @@ from physicsnemo.sym.loss import Loss, PointwiseLossNorm, IntegralLossNorm
 from physicsnemo.sym.distributed import DistributedManager
 
 from physicsnemo.sym.geometry import Geometry
+from physicsnemo.sym.geometry.parallel import sample_parallel
 from physicsnemo.sym.geometry.parameterization import Parameterization
 
 from physicsnemo.sym.dataset import (
@@ -41,6 +42,7 @@ from physicsnemo.sym.dataset import (
     ContinuousPointwiseIterableDataset,
     ContinuousIntegralIterableDataset,
     DictImportanceSampledPointwiseIterableDataset,
+    DictMemmapPointwiseIterableDataset,
     DictVariationalDataset,
 )
 
@@ -48,6 +50,11 @@ Tensor = torch.Tensor
 logger = logging.getLogger(__name__)
 
 
+def _defining_class(obj, name: str):
+    "Return the class in the MRO of obj that defines the attribute name"
+    return next((cls for cls in type(obj).__mro__ if name in vars(cls)), None)
+
+
 class PointwiseConstraint(Constraint):
     """
     Base class for all Pointwise Constraints
@@ -92,12 +99,11 @@ class PointwiseConstraint(Constraint):
         # get train points from dataloader
         invar, true_outvar, lambda_weighting = next(self.dataloader)
 
-        self._input_vars = Constraint._set_device(
-            invar, device=self.device, requires_grad=True
-        )
-        self._target_vars = Constraint._set_device(true_outvar, device=self.device)
-        self._lambda_weighting = Constraint._set_device(
-            lambda_weighting, device=self.device
+        self._input_vars, self._target_vars, self._lambda_weighting = (
+            self._set_device_batch(
+                [invar, true_outvar, lambda_weighting],
+                requires_grad=[True, False, False],
+            )
         )
 
     def load_data_static(self):
@@ -108,20 +114,14 @@ class PointwiseConstraint(Constraint):
             # get train points from dataloader
             invar, true_outvar, lambda_weighting = next(self.dataloader)
             # Set grads to false here for inputs, static var has allocation already
-            input_vars = Constraint._set_device(
-                invar, device=self.device, requires_grad=False
-            )
-            target_vars = Constraint._set_device(true_outvar, device=self.device)
-            lambda_weighting = Constraint._set_device(
-                lambda_weighting, device=self.device
+            input_vars, target_vars, lambda_weighting = self._set_device_batch(
+                [invar, true_outvar, lambda_weighting],
+                requires_grad=[False, False, False],
             )
 
-            for key in input_vars.keys():
-                self._input_vars[key].data.copy_(input_vars[key])
-            for key in target_vars.keys():
-                self._target_vars[key].copy_(target_vars[key])
-            for key in lambda_weighting.keys():
-                self._lambda_weighting[key].copy_(lambda_weighting[key])
+            Constraint._copy_static(self._input_vars, input_vars)
+            Constraint._copy_static(self._target_vars, target_vars)
+            Constraint._copy_static(self._lambda_weighting, lambda_weighting)
 
     def forward(self):
         # compute pred outvar
@@ -154,6 +154,7 @@ class PointwiseConstraint(Constraint):
         shuffle: bool = True,
         drop_last: bool = True,
         num_workers: int = 0,
+        memmap: bool = False,
     ):
         """
         Create custom pointwise constraint from numpy arrays.
@@ -179,8 +180,33 @@ class PointwiseConstraint(Constraint):
             Drop last mini-batch if dataset not fully divisible but batch_size, by default False
         num_workers : int
             Number of worker used in fetching data.
+        memmap : bool, optional
+            Use a `DictMemmapPointwiseIterableDataset` that reads batches from
+            the arrays (e.g. memory mapped arrays or `.npy` paths) instead of
+            loading them into memory, by default False
         """
 
+        if memmap:
+            # constant area and lambda weighting are kept as scalars
+            if "area" not in invar:
+                invar = {**invar, "area": 1.0}
+            dataset = DictMemmapPointwiseIterableDataset(
+                invar=invar,
+                outvar=outvar,
+                batch_size=batch_size,
+                lambda_weighting=lambda_weighting,
+                shuffle=shuffle,
+            )
+            return cls(
+                nodes=nodes,
+                dataset=dataset,
+                loss=loss,
+                batch_size=batch_size,
+                shuffle=shuffle,
+                drop_last=drop_last,
+                num_workers=num_workers,
+            )
+
         if "area" not in invar:
             invar["area"] = np.ones_like(next(iter(invar.values())))
         # TODO: better area definition?
@@ -257,6 +283,15 @@ class PointwiseBoundaryConstraint(PointwiseConstraint):
         PhysicsNeMo `Loss` module that defines the loss type, (e.g. L2, L1, ...).
     shuffle : bool, optional
         Randomly shuffle examples in dataset every epoch, by default True
+    sample_workers : int, optional
+        If `fixed_dataset=True`, number of processes used to sample the points
+        in chunks, see `sample_parallel`. By default the points are sampled in
+        the calling process.
+    sample_device : Union[str, torch.device, None], optional
+        If `fixed_dataset=False`, sample the points of every batch directly
+        as tensors on this device (e.g. `"cuda"`) instead of sampling them with
+        NumPy and copying them to the device. Requires `num_workers=0`,
+        by default None
     """
 
     def __init__(
@@ -275,21 +310,32 @@ class PointwiseBoundaryConstraint(PointwiseConstraint):
         num_workers: int = 0,
         loss: Loss = PointwiseLossNorm(),
         shuffle: bool = True,
+        sample_workers: int = 0,
+        sample_device: Union[str, torch.device, None] = None,
     ):
         # assert that not using importance measure with continuous dataset
         assert not ((not fixed_dataset) and (importance_measure is not None)), (
             "Using Importance measure with continuous dataset is not supported"
         )
+        assert sample_device is None or (not fixed_dataset and num_workers == 0), (
+            "sample_device requires fixed_dataset=False and num_workers=0"
+        )
 
         # if fixed dataset then sample points and fix for all of training
         if fixed_dataset:
             # sample boundary
-            invar = geometry.sample_boundary(
-                batch_size * batch_per_epoch,
+            sample_fn = functools.partial(
+                geometry.sample_boundary,
                 criteria=criteria,
                 parameterization=parameterization,
                 quasirandom=quasirandom,
             )
+            if sample_workers > 1:
+                invar = sample_parallel(
+                    sample_fn, batch_size * batch_per_epoch, sample_workers
+                )
+            else:
+                invar = sample_fn(batch_size * batch_per_epoch)
 
             # compute outvar
             outvar = _compute_outvar(invar, outvar)
@@ -326,6 +372,7 @@ class PointwiseBoundaryConstraint(PointwiseConstraint):
                     criteria=criteria,
                     parameterization=parameterization,
                     quasirandom=quasirandom,
+                    device=sample_device,
                 )
 
             # outvar function
@@ -341,6 +388,7 @@ class PointwiseBoundaryConstraint(PointwiseConstraint):
                 invar_fn=invar_fn,
                 outvar_fn=outvar_fn,
                 lambda_weighting_fn=lambda_weighting_fn,
+                device=sample_device,
             )
 
         # initialize constraint
@@ -409,6 +457,15 @@ class PointwiseInteriorConstraint(PointwiseConstraint):
         PhysicsNeMo `Loss` module that defines the loss type, (e.g. L2, L1, ...).
     shuffle : bool, optional
         Randomly shuffle examples in dataset every epoch, by default True
+    sample_workers : int, optional
+        If `fixed_dataset=True`, number of processes used to sample the points
+        in chunks, see `sample_parallel`. By default the points are sampled in
+        the calling process.
+    sample_device : Union[str, torch.device, None], optional
+        If `fixed_dataset=False`, sample the points of every batch directly
+        as tensors on this device (e.g. `"cuda"`) instead of sampling them with
+        NumPy and copying them to the device. Requires `num_workers=0`,
+        by default None
     """
 
     def __init__(
@@ -429,23 +486,34 @@ class PointwiseInteriorConstraint(PointwiseConstraint):
         num_workers: int = 0,
         loss: Loss = PointwiseLossNorm(),
         shuffle: bool = True,
+        sample_workers: int = 0,
+        sample_device: Union[str, torch.device, None] = None,
     ):
         # assert that not using importance measure with continuous dataset
         assert not ((not fixed_dataset) and (importance_measure is not None)), (
             "Using Importance measure with continuous dataset is not supported"
         )
+        assert sample_device is None or (not fixed_dataset and num_workers == 0), (
+            "sample_device requires fixed_dataset=False and num_workers=0"
+        )
 
         # if fixed dataset then sample points and fix for all of training
         if fixed_dataset:
             # sample interior
-            invar = geometry.sample_interior(
-                batch_size * batch_per_epoch,
+            sample_fn = functools.partial(
+                geometry.sample_interior,
                 bounds=bounds,
                 criteria=criteria,
                 parameterization=parameterization,
                 quasirandom=quasirandom,
                 compute_sdf_derivatives=compute_sdf_derivatives,
             )
+            if sample_workers > 1:
+                invar = sample_parallel(
+                    sample_fn, batch_size * batch_per_epoch, sample_workers
+                )
+            else:
+                invar = sample_fn(batch_size * batch_per_epoch)
 
             # compute outvar
             outvar = _compute_outvar(invar, outvar)
@@ -484,6 +552,7 @@ class PointwiseInteriorConstraint(PointwiseConstraint):
                     parameterization=parameterization,
                     quasirandom=quasirandom,
                     compute_sdf_derivatives=compute_sdf_derivatives,
+                    device=sample_device,
                 )
 
             # outvar function
@@ -499,6 +568,7 @@ class PointwiseInteriorConstraint(PointwiseConstraint):
                 invar_fn=invar_fn,
                 outvar_fn=outvar_fn,
                 lambda_weighting_fn=lambda_weighting_fn,
+                device=sample_device,
             )
 
         # initialize constraint
@@ -531,17 +601,39 @@ class IntegralConstraint(Constraint):
             }
             var_to_polyvtk(save_var, filename + "_batch_" + str(i))
 
+    @staticmethod
+    def _pack_integrals(invar, true_outvar, lambda_weighting):
+        # flatten the [nr_integrals, integral_batch_size, 1] batches into one
+        # point tensor plus a segment id per point, targets keep one row per integral
+        nr_integrals, integral_batch_size = next(iter(invar.values())).shape[:2]
+        invar = {
+            key: value.reshape(nr_integrals * integral_batch_size, -1)
+            for key, value in invar.items()
+        }
+        true_outvar = {
+            key: value.reshape(nr_integrals, -1) for key, value in true_outvar.items()
+        }
+        lambda_weighting = {
+            key: value.reshape(nr_integrals, -1)
+            for key, value in lambda_weighting.items()
+        }
+        segment_ids = torch.arange(nr_integrals).repeat_interleave(integral_batch_size)
+        return invar, true_outvar, lambda_weighting, segment_ids
+
     def load_data(self):
         # get train points from dataloader
         invar, true_outvar, lambda_weighting = next(self.dataloader)
-
-        self._input_vars = Constraint._set_device(
-            invar, device=self.device, requires_grad=True
+        invar, true_outvar, lambda_weighting, segment_ids = (
+            IntegralConstraint._pack_integrals(invar, true_outvar, lambda_weighting)
         )
-        self._target_vars = Constraint._set_device(true_outvar, device=self.device)
-        self._lambda_weighting = Constraint._set_device(
-            lambda_weighting, device=self.device
+
+        self._input_vars, self._target_vars, self._lambda_weighting = (
+            self._set_device_batch(
+                [invar, true_outvar, lambda_weighting],
+                requires_grad=[True, False, False],
+            )
         )
+        self._segment_ids = segment_ids.to(self.device)
 
     def load_data_static(self):
         if self._input_vars is None:
@@ -550,21 +642,18 @@ class IntegralConstraint(Constraint):
         else:
             # get train points from dataloader
             invar, true_outvar, lambda_weighting = next(self.dataloader)
-            # Set grads to false here for inputs, static var has allocation already
-            input_vars = Constraint._set_device(
-                invar, device=self.device, requires_grad=False
+            invar, true_outvar, lambda_weighting, _ = (
+                IntegralConstraint._pack_integrals(invar, true_outvar, lambda_weighting)
             )
-            target_vars = Constraint._set_device(true_outvar, device=self.device)
-            lambda_weighting = Constraint._set_device(
-                lambda_weighting, device=self.device
+            # Set grads to false here for inputs, static var has allocation already
+            input_vars, target_vars, lambda_weighting = self._set_device_batch(
+                [invar, true_outvar, lambda_weighting],
+                requires_grad=[False, False, False],
             )
 
-            for key in input_vars.keys():
-                self._input_vars[key].data.copy_(input_vars[key])
-            for key in target_vars.keys():
-                self._target_vars[key].copy_(target_vars[key])
-            for key in lambda_weighting.keys():
-                self._lambda_weighting[key].copy_(lambda_weighting[key])
+            Constraint._copy_static(self._input_vars, input_vars)
+            Constraint._copy_static(self._target_vars, target_vars)
+            Constraint._copy_static(self._lambda_weighting, lambda_weighting)
 
     @property
     def output_vars(self) -> Dict[str, Tensor]:
@@ -577,7 +666,7 @@ class IntegralConstraint(Constraint):
             self._output_vars[str(output)] = data[str(output)]
 
     def forward(self):
-        # compute pred outvar
+        # compute pred outvar for all integrals with a single forward
         self._output_vars = self.model(self._input_vars)
 
     def loss(self, step: int) -> Dict[str, torch.Tensor]:
@@ -585,25 +674,45 @@ class IntegralConstraint(Constraint):
             logger.warning("Calling loss without forward call")
             return {}
 
-        # split for individual integration
+        # segment-sum over the packed integrals, unless a subclass overrides forward
+        if _defining_class(self._loss, "forward_segmented") is _defining_class(
+            self._loss, "forward"
+        ):
+            return self._loss.forward_segmented(
+                self._input_vars,
+                self._output_vars,
+                self._target_vars,
+                self._lambda_weighting,
+                self._segment_ids,
+                step,
+            )
+
+        # split for individual integration with user defined integral losses
+        segment_sizes = torch.bincount(self._segment_ids).tolist()
         list_invar, list_pred_outvar, list_true_outvar, list_lambda_weighting = (
             [],
             [],
             [],
             [],
         )
-        for i in range(self.batch_size):
-            list_invar.append(
-                {key: value[i] for key, value in self._input_vars.items()}
-            )
+        split_invar = {
+            key: torch.split(value, segment_sizes)
+            for key, value in self._input_vars.items()
+        }
+        split_pred_outvar = {
+            key: torch.split(value, segment_sizes)
+            for key, value in self._output_vars.items()
+        }
+        for i in range(len(segment_sizes)):
+            list_invar.append({key: value[i] for key, value in split_invar.items()})
             list_pred_outvar.append(
-                {key: value[i] for key, value in self._output_vars.items()}
+                {key: value[i] for key, value in split_pred_outvar.items()}
             )
             list_true_outvar.append(
-                {key: value[i] for key, value in self._target_vars.items()}
+                {key: value[i : i + 1] for key, value in self._target_vars.items()}
             )
             list_lambda_weighting.append(
-                {key: value[i] for key, value in self._lambda_weighting.items()}
+                {key: value[i : i + 1] for key, value in self._lambda_weighting.items()}
             )
 
         # compute integral losses
@@ -846,22 +955,7 @@ class VariationalConstraint(Constraint):
         self.manager = DistributedManager()
         self.device = self.manager.device
         self.model.to(self.device)
-        if self.manager.distributed:
-            # https://pytorch.org/docs/master/notes/cuda.html#id5
-            s = torch.cuda.Stream()
-            s.wait_stream(torch.cuda.current_stream())
-            with torch.cuda.stream(s):
-                self.model = DistributedDataParallel(
-                    self.model,
-                    device_ids=[self.manager.local_rank],
-                    output_device=self.device,
-                    broadcast_buffers=self.manager.broadcast_buffers,
-                    find_unused_parameters=self.manager.find_unused_parameters,
-                    process_group=self.manager.group(
-                        "data_parallel"
-                    ),  # None by default
-                )
-            torch.cuda.current_stream().wait_stream(s)
+        self.model = Constraint._distributed_model(self.model)
 
         self._input_names = Key.convert_list(list(set(invar_keys)))
         self._output_names = Key.convert_list(list(set(outvar_keys)))
@@ -20,7 +20,6 @@ import logging
 from typing import Dict, List, Union
 
 import torch
-from torch.nn.parallel import DistributedDataParallel
 import numpy as np
 
 from physicsnemo.sym.domain.constraint import Constraint
@@ -122,12 +121,11 @@ class SupervisedGridConstraint(Constraint):
         # get train points from dataloader
         invar, true_outvar, lambda_weighting = next(self.dataloader)
 
-        self._input_vars = Constraint._set_device(
-            invar, device=self.device, requires_grad=True
-        )
-        self._target_vars = Constraint._set_device(true_outvar, device=self.device)
-        self._lambda_weighting = Constraint._set_device(
-            lambda_weighting, device=self.device
+        self._input_vars, self._target_vars, self._lambda_weighting = (
+            self._set_device_batch(
+                [invar, true_outvar, lambda_weighting],
+                requires_grad=[True, False, False],
+            )
         )
 
     def load_data_static(self):
@@ -138,20 +136,14 @@ class SupervisedGridConstraint(Constraint):
             # get train points from dataloader
             invar, true_outvar, lambda_weighting = next(self.dataloader)
             # Set grads to false here for inputs, static var has allocation already
-            input_vars = Constraint._set_device(
-                invar, device=self.device, requires_grad=False
-            )
-            target_vars = Constraint._set_device(true_outvar, device=self.device)
-            lambda_weighting = Constraint._set_device(
-                lambda_weighting, device=self.device
+            input_vars, target_vars, lambda_weighting = self._set_device_batch(
+                [invar, true_outvar, lambda_weighting],
+                requires_grad=[False, False, False],
             )
 
-            for key in input_vars.keys():
-                self._input_vars[key].data.copy_(input_vars[key])
-            for key in target_vars.keys():
-                self._target_vars[key].copy_(target_vars[key])
-            for key in lambda_weighting.keys():
-                self._lambda_weighting[key].copy_(lambda_weighting[key])
+            Constraint._copy_static(self._input_vars, input_vars)
+            Constraint._copy_static(self._target_vars, target_vars)
+            Constraint._copy_static(self._lambda_weighting, lambda_weighting)
 
     def forward(self):
         # compute pred outvar
@@ -218,22 +210,7 @@ class _DeepONetConstraint(Constraint):
             Key.convert_list(outvar.keys()),
         )
         self.model.to(self.device)
-        if self.manager.distributed:
-            # https://pytorch.org/docs/master/notes/cuda.html#id5
-            s = torch.cuda.Stream()
-            s.wait_stream(torch.cuda.current_stream())
-            with torch.cuda.stream(s):
-                self.model = DistributedDataParallel(
-                    self.model,
-                    device_ids=[self.manager.local_rank],
-                    output_device=self.device,
-                    broadcast_buffers=self.manager.broadcast_buffers,
-                    find_unused_parameters=self.manager.find_unused_parameters,
-                    process_group=self.manager.group(
-                        "data_parallel"
-                    ),  # None by default
-                )
-            torch.cuda.current_stream().wait_stream(s)
+        self.model = Constraint._distributed_model(self.model)
 
         self._input_names = Key.convert_list(self.dataset.invar_keys)
         self._output_names = Key.convert_list(self.dataset.outvar_keys)
@@ -289,12 +266,11 @@ class _DeepONetConstraint(Constraint):
         # get train points from dataloader
         invar, true_outvar, lambda_weighting = next(self.dataloader)
 
-        self._input_vars_branch = Constraint._set_device(
-            invar, device=self.device, requires_grad=True
-        )
-        self._target_vars = Constraint._set_device(true_outvar, device=self.device)
-        self._lambda_weighting = Constraint._set_device(
-            lambda_weighting, device=self.device
+        self._input_vars_branch, self._target_vars, self._lambda_weighting = (
+            self._set_device_batch(
+                [invar, true_outvar, lambda_weighting],
+                requires_grad=[True, False, False],
+            )
         )
 
     def load_data_static(self):
@@ -305,20 +281,14 @@ class _DeepONetConstraint(Constraint):
             # get train points from dataloader
             invar, true_outvar, lambda_weighting = next(self.dataloader)
             # Set grads to false here for inputs, static var has allocation already
-            input_vars = Constraint._set_device(
-                invar, device=self.device, requires_grad=False
-            )
-            target_vars = Constraint._set_device(true_outvar, device=self.device)
-            lambda_weighting = Constraint._set_device(
-                lambda_weighting, device=self.device
+            input_vars, target_vars, lambda_weighting = self._set_device_batch(
+                [invar, true_outvar, lambda_weighting],
+                requires_grad=[False, False, False],
             )
 
-            for key in input_vars.keys():
-                self._input_vars_branch[key].data.copy_(input_vars[key])
-            for key in target_vars.keys():
-                self._target_vars[key].copy_(target_vars[key])
-            for key in lambda_weighting.keys():
-                self._lambda_weighting[key].copy_(lambda_weighting[key])
+            Constraint._copy_static(self._input_vars_branch, input_vars)
+            Constraint._copy_static(self._target_vars, target_vars)
+            Constraint._copy_static(self._lambda_weighting, lambda_weighting)
 
     def forward(self):
         # compute pred outvar
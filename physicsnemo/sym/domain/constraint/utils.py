@@ -14,15 +14,13 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import numpy as np
-
-from physicsnemo.sym.utils.sympy import np_lambdify
+from physicsnemo.sym.geometry.helper import _array_namespace, _lambdify
 
 
 def _compute_outvar(invar, outvar_sympy):
     outvar = {}
     for key in outvar_sympy.keys():
-        outvar[key] = np_lambdify(outvar_sympy[key], {**invar})(**invar)
+        outvar[key] = _lambdify(outvar_sympy[key], {**invar})(**invar)
     return outvar
 
 
@@ -30,10 +28,11 @@ def _compute_lambda_weighting(invar, outvar, lambda_weighting_sympy):
     lambda_weighting = {}
     if lambda_weighting_sympy is None:
         for key in outvar.keys():
-            lambda_weighting[key] = np.ones_like(next(iter(invar.values())))
+            value = next(iter(invar.values()))
+            lambda_weighting[key] = _array_namespace(value).ones_like(value)
     else:
         for key in outvar.keys():
-            lambda_weighting[key] = np_lambdify(
+            lambda_weighting[key] = _lambdify(
                 lambda_weighting_sympy[key], {**invar, **outvar}
             )(**invar, **outvar)
     return lambda_weighting
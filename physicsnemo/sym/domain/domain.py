@@ -19,6 +19,7 @@
 import torch
 import torch.nn as nn
 from torch.utils.tensorboard import SummaryWriter
+import copy
 import itertools
 import os
 
@@ -28,6 +29,7 @@ from physicsnemo.sym.domain.inferencer import Inferencer
 from physicsnemo.sym.domain.monitor import Monitor
 from physicsnemo.sym.loss.aggregator import NTK
 from physicsnemo.sym.models.arch import FuncArch
+from physicsnemo.sym.utils.training.evaluation import evaluation_copy
 
 
 class Domain:
@@ -128,6 +130,23 @@ class Domain:
             metrics.update(monitor.save_results(key, writer, step, monitor_data_dir))
         return metrics
 
+    def evaluation_copy(self, memo: dict):
+        """
+        Copy of the domain whose validators, inferencers and monitors run on
+        the networks registered in `memo` (see `BackgroundEvaluator`)
+        """
+        domain = copy.copy(self)
+        domain.validators = {
+            key: evaluation_copy(value, memo) for key, value in self.validators.items()
+        }
+        domain.inferencers = {
+            key: evaluation_copy(value, memo) for key, value in self.inferencers.items()
+        }
+        domain.monitors = {
+            key: evaluation_copy(value, memo) for key, value in self.monitors.items()
+        }
+        return domain
+
     def get_num_losses(self):
         return len(
             set(itertools.chain(*[c.output_names for c in self.constraints.values()]))
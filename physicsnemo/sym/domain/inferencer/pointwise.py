@@ -26,6 +26,7 @@ from physicsnemo.sym.node import Node
 from physicsnemo.sym.distributed import DistributedManager
 from physicsnemo.sym.utils.io import InferencerPlotter
 from physicsnemo.sym.utils.io.vtk import var_to_polyvtk
+from physicsnemo.sym.utils.io.hdf5 import var_to_hdf5
 from physicsnemo.sym.dataset import DictInferencePointwiseDataset
 
 
@@ -122,6 +123,8 @@ class PointwiseInferencer(Inferencer):
         # save batch to vtk/np files TODO clean this up after graph unroll stuff
         if "np" in save_filetypes:
             np.savez(results_dir + name, {**invar, **predvar})
+        if "hdf5" in save_filetypes:
+            var_to_hdf5({**invar, **predvar}, results_dir + name, step)
         if "vtk" in save_filetypes:
             var_to_polyvtk({**invar, **predvar}, results_dir + name)
 
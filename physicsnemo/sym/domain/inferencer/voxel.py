@@ -22,6 +22,7 @@ import numpy as np
 from physicsnemo.sym.domain.inferencer import PointVTKInferencer
 from physicsnemo.sym.node import Node
 from physicsnemo.sym.utils.io.vtk import VTKUniformGrid
+from physicsnemo.sym.utils.io.hdf5 import var_to_hdf5
 
 
 class VoxelInferencer(PointVTKInferencer):
@@ -114,6 +115,9 @@ class VoxelInferencer(PointVTKInferencer):
 
             np.savez(results_dir + name, np_vars)
 
+        if "hdf5" in save_filetypes:
+            var_to_hdf5({**invar, **predvar}, results_dir + name, step)
+
         if "vtk" in save_filetypes:
             self.vtk_obj.file_dir = Path(results_dir)
             self.vtk_obj.file_name = Path(name).stem
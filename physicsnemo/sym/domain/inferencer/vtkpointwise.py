@@ -25,6 +25,7 @@ from physicsnemo.sym.domain.inferencer import PointwiseInferencer
 from physicsnemo.sym.domain.constraint import Constraint
 from physicsnemo.sym.node import Node
 from physicsnemo.sym.utils.io.vtk import VTKBase
+from physicsnemo.sym.utils.io.hdf5 import var_to_hdf5
 
 
 def _get_function_argspec(func):
@@ -246,6 +247,8 @@ class PointVTKInferencer(PointwiseInferencer):
         # Save batch to vtk/np files
         if "np" in save_filetypes:
             np.savez(results_dir + name, {**invar, **predvar})
+        if "hdf5" in save_filetypes:
+            var_to_hdf5({**invar, **predvar}, results_dir + name, step)
         if "vtk" in save_filetypes:
             self.vtk_obj.file_dir = Path(results_dir)
             self.vtk_obj.file_name = Path(name).stem
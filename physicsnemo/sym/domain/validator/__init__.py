@@ -14,6 +14,10 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from .validator import Validator
-from .continuous import PointwiseValidator, PointVTKValidator
+from .validator import Validator, StreamingErrorMetrics
+from .continuous import (
+    PointwiseValidator,
+    StreamingPointwiseValidator,
+    PointVTKValidator,
+)
 from .discrete import GridValidator, DeepONet_Physics_Validator, DeepONet_Data_Validator
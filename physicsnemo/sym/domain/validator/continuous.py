@@ -14,15 +14,18 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import os
+
 import numpy as np
 import torch
 
 from typing import List, Dict
 from pathlib import Path
 
-from physicsnemo.sym.domain.validator import Validator
+from physicsnemo.sym.domain.validator import Validator, StreamingErrorMetrics
 from physicsnemo.sym.domain.constraint import Constraint
 from physicsnemo.sym.utils.io.vtk import var_to_polyvtk, VTKBase
+from physicsnemo.sym.utils.io.hdf5 import var_to_hdf5, HDF5ResultsWriter
 from physicsnemo.sym.utils.io import ValidatorPlotter
 from physicsnemo.sym.graph import Graph
 from physicsnemo.sym.key import Key
@@ -148,6 +151,12 @@ class PointwiseValidator(Validator):
             np.savez(
                 results_dir + name, {**invar, **named_true_outvar, **named_pred_outvar}
             )
+        if "hdf5" in save_filetypes:
+            var_to_hdf5(
+                {**invar, **named_true_outvar, **named_pred_outvar},
+                results_dir + name,
+                step,
+            )
         if "vtk" in save_filetypes:
             var_to_polyvtk(
                 {**invar, **named_true_outvar, **named_pred_outvar}, results_dir + name
@@ -177,6 +186,134 @@ class PointwiseValidator(Validator):
         return losses
 
 
+class StreamingPointwiseValidator(PointwiseValidator):
+    """
+    Pointwise Validator that computes its metrics and writes its results
+    batch by batch, for validation sets too large to hold the inputs, true
+    and predicted outputs in memory at once.
+
+    The relative L2 error, max error and mean absolute error of every output
+    are accumulated with `StreamingErrorMetrics`. Results are written to a
+    memory mapped structured numpy file `<name>.npy` with one field per
+    variable (`np.load(file, mmap_mode="r")["pred_u"]`) instead of `<name>.npz`,
+    and appended batch by batch to `<name>.h5` if "hdf5" is in `save_filetypes`.
+    VTK files and plots need all points in memory and are created from this
+    file after the validation loop if requested.
+
+    Parameters
+    ----------
+    nodes : List[Node]
+        List of PhysicsNeMo Nodes to unroll graph with.
+    invar : Dict[str, np.ndarray (N, 1)]
+        Dictionary of numpy arrays as input.
+    true_outvar : Dict[str, np.ndarray (N, 1)]
+        Dictionary of numpy arrays used to validate against validation.
+    batch_size : int, optional
+            Batch size used when running validation, by default 1024
+    plotter : ValidatorPlotter
+        PhysicsNeMo plotter for showing results in tensorboard.
+    requires_grad : bool = False
+        If automatic differentiation is needed for computing results.
+    """
+
+    def save_results(self, name, results_dir, writer, save_filetypes, step):
+        metrics = StreamingErrorMetrics()
+        write_results = (
+            "np" in save_filetypes
+            or "vtk" in save_filetypes
+            or self.plotter is not None
+        )
+        results_file = results_dir + name + ".npy"
+        results = None
+        start = 0
+        hdf5_writer = None
+        if "hdf5" in save_filetypes:
+            hdf5_writer = HDF5ResultsWriter(results_dir + name, step)
+
+        # Loop through mini-batches
+        for i, (invar0, true_outvar0, lambda_weighting) in enumerate(self.dataloader):
+            invar = Constraint._set_device(
+                invar0, device=self.device, requires_grad=self.requires_grad
+            )
+            true_outvar = Constraint._set_device(
+                true_outvar0, device=self.device, requires_grad=self.requires_grad
+            )
+            pred_outvar = self.forward(invar)
+            metrics.update(true_outvar, pred_outvar)
+            if not write_results and hdf5_writer is None:
+                continue
+
+            # write the batch to its rows of the results file
+            batch = {
+                **{k: v.cpu().detach().numpy() for k, v in invar.items()},
+                **{
+                    "true_" + k: true_outvar[k].cpu().detach().numpy()
+                    for k in self.dataset.outvar_keys
+                },
+                **{
+                    "pred_" + k: pred_outvar[k].cpu().detach().numpy()
+                    for k in self.dataset.outvar_keys
+                },
+            }
+            if hdf5_writer is not None:
+                hdf5_writer.append(batch)
+            if not write_results:
+                continue
+            if results is None:
+                results = np.lib.format.open_memmap(
+                    results_file,
+                    mode="w+",
+                    dtype=[(k, v.dtype, v.shape[1:]) for k, v in batch.items()],
+                    shape=(len(self.dataset),),
+                )
+            batch_size = len(next(iter(batch.values())))
+            for k, v in batch.items():
+                results[k][start : start + batch_size] = v
+            start += batch_size
+        losses = metrics.compute()
+        if hdf5_writer is not None:
+            hdf5_writer.close()
+
+        if results is not None:
+            results.flush()
+            del results
+            results = np.load(results_file, mmap_mode="r")
+            invar = {k: results[k] for k in self.dataset.invar_keys}
+            true_outvar = {k: results["true_" + k] for k in self.dataset.outvar_keys}
+            pred_outvar = {k: results["pred_" + k] for k in self.dataset.outvar_keys}
+            if "vtk" in save_filetypes:
+                var_to_polyvtk(
+                    {k: np.asarray(results[k]) for k in results.dtype.names},
+                    results_dir + name,
+                )
+
+            # add tensorboard plots
+            if self.plotter is not None:
+                self.plotter._add_figures(
+                    "Validators",
+                    name,
+                    results_dir,
+                    writer,
+                    step,
+                    invar,
+                    true_outvar,
+                    pred_outvar,
+                )
+            del results, invar, true_outvar, pred_outvar
+            if "np" not in save_filetypes:
+                os.remove(results_file)
+
+        # add tensorboard scalars
+        for k, loss in losses.items():
+            if TF_SUMMARY:
+                writer.add_scalar("val/" + name + "/" + k, loss, step, new_style=True)
+            else:
+                writer.add_scalar(
+                    "Validators/" + name + "/" + k, loss, step, new_style=True
+                )
+        return losses
+
+
 class PointVTKValidator(PointwiseValidator):
     """
     Pointwise validator using mesh points of VTK object
@@ -302,6 +439,12 @@ class PointVTKValidator(PointwiseValidator):
             np.savez(
                 results_dir + name, {**invar, **named_true_outvar, **named_pred_outvar}
             )
+        if "hdf5" in save_filetypes:
+            var_to_hdf5(
+                {**invar, **named_true_outvar, **named_pred_outvar},
+                results_dir + name,
+                step,
+            )
         if "vtk" in save_filetypes:
             if self.log_iter:
                 self.vtk_obj.var_to_vtk(data_vars={**pred_outvar}, step=step)
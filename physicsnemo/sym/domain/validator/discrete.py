@@ -22,6 +22,7 @@ import numpy as np
 from physicsnemo.sym.domain.validator import Validator
 from physicsnemo.sym.domain.constraint import Constraint
 from physicsnemo.sym.utils.io.vtk import grid_to_vtk
+from physicsnemo.sym.utils.io.hdf5 import var_to_hdf5
 from physicsnemo.sym.utils.io import GridValidatorPlotter, DeepONetValidatorPlotter
 from physicsnemo.sym.graph import Graph
 from physicsnemo.sym.key import Key
@@ -142,6 +143,12 @@ class GridValidator(Validator):
             np.savez(
                 results_dir + name, {**invar, **named_true_outvar, **named_pred_outvar}
             )
+        if "hdf5" in save_filetypes:
+            var_to_hdf5(
+                {**invar, **named_true_outvar, **named_pred_outvar},
+                results_dir + name,
+                step,
+            )
         if "vtk" in save_filetypes:
             grid_to_vtk(
                 {**invar, **named_true_outvar, **named_pred_outvar}, results_dir + name
@@ -306,6 +313,12 @@ class DeepONet_Physics_Validator(_DeepONet_Validator):
             np.savez(
                 results_dir + name, {**invar, **named_true_outvar, **named_pred_outvar}
             )
+        if "hdf5" in save_filetypes:
+            var_to_hdf5(
+                {**invar, **named_true_outvar, **named_pred_outvar},
+                results_dir + name,
+                step,
+            )
 
         ndim = next(iter(self.invar_trunk.values())).shape[-1]
         invar_plotter = dict()
@@ -448,6 +461,12 @@ class DeepONet_Data_Validator(_DeepONet_Validator):
             np.savez(
                 results_dir + name, {**invar, **named_true_outvar, **named_pred_outvar}
             )
+        if "hdf5" in save_filetypes:
+            var_to_hdf5(
+                {**invar, **named_true_outvar, **named_pred_outvar},
+                results_dir + name,
+                step,
+            )
 
         # add tensorboard plots
         if self.plotter is not None:
@@ -14,6 +14,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from typing import Dict
+
 import torch
 
 
@@ -43,3 +45,69 @@ class Validator:
                 / torch.var(true_var[key])
             )
         return new_var
+
+
+class StreamingErrorMetrics:
+    """
+    Running accumulators of validation error metrics, updated batch by batch
+
+    The statistics are accumulated in double precision on the device of the
+    batches, so the full validation set never needs to be held in memory.
+    The variance of the true values is merged with Chan's parallel algorithm.
+    For every output key the following metrics are computed
+
+    - `l2_relative_error_<key>`: same as `Validator._l2_relative_error`
+    - `max_error_<key>`: maximum absolute error
+    - `mean_absolute_error_<key>`: mean absolute error
+    """
+
+    def __init__(self):
+        self.stats = {}
+
+    def update(
+        self, true_var: Dict[str, torch.Tensor], pred_var: Dict[str, torch.Tensor]
+    ):
+        """Add a batch of true and predicted values"""
+        for key in true_var.keys():
+            true = true_var[key].detach().double().flatten()
+            error = pred_var[key].detach().double().flatten() - true
+            count = true.numel()
+            if count == 0:
+                continue
+            mean = torch.mean(true)
+            batch = {
+                "count": count,
+                "mean": mean,
+                "m2": torch.sum(torch.square(true - mean)),
+                "square_error": torch.sum(torch.square(error)),
+                "absolute_error": torch.sum(torch.abs(error)),
+                "max_error": torch.max(torch.abs(error)),
+            }
+            if key not in self.stats:
+                self.stats[key] = batch
+                continue
+
+            stats = self.stats[key]
+            total = stats["count"] + count
+            delta = batch["mean"] - stats["mean"]
+            stats["m2"] = (
+                stats["m2"] + batch["m2"] + delta**2 * stats["count"] * count / total
+            )
+            stats["mean"] = stats["mean"] + delta * count / total
+            stats["count"] = total
+            stats["square_error"] = stats["square_error"] + batch["square_error"]
+            stats["absolute_error"] = stats["absolute_error"] + batch["absolute_error"]
+            stats["max_error"] = torch.maximum(stats["max_error"], batch["max_error"])
+
+    def compute(self) -> Dict[str, torch.Tensor]:
+        """Metrics of all batches added so far"""
+        metrics = {}
+        for key, stats in self.stats.items():
+            count = stats["count"]
+            variance = stats["m2"] / max(count - 1, 1)
+            metrics["l2_relative_error_" + str(key)] = torch.sqrt(
+                stats["square_error"] / count / variance
+            )
+            metrics["max_error_" + str(key)] = stats["max_error"]
+            metrics["mean_absolute_error_" + str(key)] = stats["absolute_error"] / count
+        return {key: value.float().cpu() for key, value in metrics.items()}
@@ -15,6 +15,7 @@
 # limitations under the License.
 
 import itertools
+import math
 import torch
 import logging
 
@@ -208,6 +209,153 @@ def _derivative_dict(var, derivatives, forward=False):
 
 
 # ==== Meshless finite derivs ====
+class AdaptiveDx:
+    """
+    Adaptive dx controller for meshless finite derivatives. Every `probe_freq`
+    forward passes, the meshless finite derivatives of a small probe batch are
+    compared against automatic differentiation for a few candidate spacings of
+    every independent variable, and the dx of that variable is moved to the most
+    accurate candidate. The probe cost is amortized over `probe_freq` steps.
+
+    Parameters
+    ----------
+    dx : Union[float, Dict[str, float]], optional
+        Initial dx of all or every independent variable, by default 0.001
+    probe_freq : int, optional
+        Number of forward passes between probes, by default 1000
+    probe_size : int, optional
+        Number of points of the probe batch, by default 64
+    factors : List[float], optional
+        Candidate spacings relative to the current dx, by default [0.5, 1.0, 2.0]
+    min_dx : float, optional
+        Lower bound of dx, by default 1e-5
+    max_dx : float, optional
+        Upper bound of dx, by default 0.1
+
+    Example
+    -------
+    >>> from physicsnemo.sym.eq.derivatives import AdaptiveDx, MeshlessFiniteDerivative
+    >>> dx = AdaptiveDx(dx=0.001, probe_freq=500)
+    >>> mfd_node = MeshlessFiniteDerivative.make_node(
+    ...     node_model=flow_net_node, derivatives=derivatives, dx=dx
+    ... ) # doctest: +SKIP
+    """
+
+    def __init__(
+        self,
+        dx: Union[float, Dict[str, float]] = 0.001,
+        probe_freq: int = 1000,
+        probe_size: int = 64,
+        factors: List[float] = [0.5, 1.0, 2.0],
+        min_dx: float = 1e-5,
+        max_dx: float = 0.1,
+    ):
+        self.initial_dx = dx
+        self.dx = dict(dx) if isinstance(dx, dict) else {}
+        self.probe_freq = probe_freq
+        self.probe_size = probe_size
+        self.factors = factors
+        self.min_dx = min_dx
+        self.max_dx = max_dx
+        self.count = 0
+
+    def __call__(self, count: int) -> Dict[str, float]:
+        return self.dx
+
+    def state_dict(self) -> Dict:
+        return {"dx": dict(self.dx), "count": self.count}
+
+    def load_state_dict(self, state_dict: Dict) -> None:
+        self.dx = dict(state_dict["dx"])
+        self.count = state_dict["count"]
+
+    def step(self, mfd: "MeshlessFiniteDerivative", inputs: Dict[str, Tensor]):
+        """Called at every forward pass of the meshless finite derivative"""
+        indep_vars = sorted(
+            {
+                str(var)
+                for keys in mfd.derivatives.values()
+                for key in keys
+                for var in key.derivatives
+            }
+        )
+        for var in indep_vars:
+            if var not in self.dx:
+                if isinstance(self.initial_dx, dict):
+                    raise KeyError(f"Initial dx of {var} not provided")
+                self.dx[var] = float(self.initial_dx)
+
+        if self.count % self.probe_freq == 0:
+            self.probe(mfd, inputs, indep_vars)
+        self.count += 1
+
+    def probe(
+        self,
+        mfd: "MeshlessFiniteDerivative",
+        inputs: Dict[str, Tensor],
+        indep_vars: List[str],
+    ):
+        """Tune the dx of every independent variable on a probe batch"""
+        # Probe batch, with gradients to compute the reference derivatives
+        if mfd.input_keys is None:
+            model_inputs = {k: v[: self.probe_size] for k, v in inputs.items()}
+        else:
+            model_inputs = {
+                str(k): inputs[str(k)][: self.probe_size] for k in mfd.input_keys
+            }
+        model_inputs = {k: v.detach().clone() for k, v in model_inputs.items()}
+        with torch.enable_grad():
+            for var in indep_vars:
+                model_inputs[var].requires_grad_(True)
+            model_outputs = mfd.model(model_inputs)
+
+            reference = {}
+            for var in indep_vars:
+                # Only the derivatives w.r.t. this variable guide its dx
+                keys = [
+                    key
+                    for keys in mfd.derivatives.values()
+                    for key in keys
+                    if all(str(d) == var for d in key.derivatives)
+                ]
+                for key in keys:
+                    value = model_outputs[key.name]
+                    for _ in key.derivatives:
+                        value = gradient_autodiff(value, [model_inputs[var]])[0]
+                    reference[str(key)] = (var, value.detach())
+
+        probe_inputs = {k: v.detach() for k, v in model_inputs.items()}
+        probe_inputs.update({k: v.detach() for k, v in model_outputs.items()})
+
+        dtype = next(iter(inputs.values())).dtype
+        for var in indep_vars:
+            keys = [k for k, (v, _) in reference.items() if v == var]
+            if not keys:
+                continue
+            errors = []
+            candidates = []
+            for factor in self.factors:
+                candidate = min(max(factor * self.dx[var], self.min_dx), self.max_dx)
+                dx = {**self.dx, var: candidate}
+                with torch.no_grad():
+                    outputs = mfd._finite_derivatives(
+                        probe_inputs, {order: dx for order in range(1, 5)}
+                    )
+                error = 0.0
+                for key in keys:
+                    true = reference[key][1].to(dtype)
+                    error += float(
+                        torch.linalg.norm(outputs[key].to(dtype) - true)
+                        / (torch.linalg.norm(true) + 1e-8)
+                    )
+                errors.append(error)
+                candidates.append(candidate)
+            best = candidates[errors.index(min(errors))]
+            if best != self.dx[var]:
+                logger.info(f"Adaptive MFD: dx of {var} changed to {best:.3e}")
+            self.dx[var] = best
+
+
 class MeshlessFiniteDerivative(torch.nn.Module):
     """
     Module to compute derivatives using meshless finite difference
@@ -218,9 +366,15 @@ class MeshlessFiniteDerivative(torch.nn.Module):
         Forward torch module for calculating stencil values
     derivatives : List[Key]
         List of derivative keys to calculate
-    dx : Union[float, Callable]
-        Spatial discretization of all axis, can be function with parameter `count` which is
-        the number of forward passes for dynamically adjusting dx
+    dx : Union[float, Dict[str, float], Callable, AdaptiveDx, str]
+        Spatial discretization of all axis, a dictionary with the discretization of
+        every independent variable, or a function with parameter `count` which is
+        the number of forward passes for dynamically adjusting dx. An `AdaptiveDx`
+        tunes the dx of every independent variable during training. If `"auto"`, a
+        separate dx is selected for every derivative order based on the precision
+        of the inputs, balancing truncation and round-off error. Auto dx assumes
+        the inputs are of order one (i.e. non-dimensionalized) and is rounded to a
+        power of two so that the stencil offsets are exactly representable
     order : int, optional
         Order of derivative, by default 2
     max_batch_size : Union[int, None], optional
@@ -229,6 +383,11 @@ class MeshlessFiniteDerivative(torch.nn.Module):
         Cast fields to double precision to calculate derivatives, by default True
     jit : bool, optional
         Use torch script for finite deriv calcs, by default True
+    richardson : bool, optional
+        Use Richardson extrapolation of the derivatives computed with dx and 2 * dx,
+        which increases the accuracy order by two. Combined with `dx="auto"` and
+        `double_cast=False` this allows computing accurate derivatives in single
+        precision, by default False
 
     """
 
@@ -236,21 +395,27 @@ class MeshlessFiniteDerivative(torch.nn.Module):
         self,
         model: torch.nn.Module,
         derivatives: List[Key],
-        dx: Union[float, Callable],
+        dx: Union[float, Dict[str, float], Callable, "AdaptiveDx", str],
         order: int = 2,
         max_batch_size: Union[int, None] = None,
         double_cast: bool = True,
         input_keys: Union[List[Key], None] = None,
+        richardson: bool = False,
     ):
         super().__init__()
 
         self.model = model
         self._dx = dx
+        self.order = order
         self.double_cast = double_cast
+        self.richardson = richardson
         self.max_batch_size = max_batch_size
         self.input_keys = input_keys
         self.count = 0
 
+        if isinstance(dx, str) and dx != "auto":
+            raise ValueError(f"dx should be a float, a callable or 'auto', got {dx}")
+
         self.derivatives = {1: [], 2: [], 3: [], 4: []}
         for key in derivatives:
             try:
@@ -268,28 +433,48 @@ class MeshlessFiniteDerivative(torch.nn.Module):
     @torch.jit.ignore()
     def forward(self, inputs: Dict[str, torch.Tensor]) -> Dict[str, torch.Tensor]:
         self.count += 1
-        dx = self.dx
-        self.first_deriv.dx = dx
-        self.second_deriv.dx = dx
-        self.third_deriv.dx = dx
-        self.fourth_deriv.dx = dx
+        if isinstance(self._dx, AdaptiveDx):
+            self._dx.step(self, inputs)
+        dtype = next(iter(inputs.values())).dtype
+        deriv_dx = {
+            deriv_order: self.deriv_dx(deriv_order, dtype)
+            for deriv_order in range(1, 5)
+        }
+        return self._finite_derivatives(inputs, deriv_dx)
+
+    def _finite_derivatives(
+        self,
+        inputs: Dict[str, torch.Tensor],
+        deriv_dx: Dict[int, Union[float, Dict[str, float]]],
+    ) -> Dict[str, torch.Tensor]:
+        """Computes the derivatives with the given spacing for every derivative order"""
+        derivs = {
+            1: self.first_deriv,
+            2: self.second_deriv,
+            3: self.third_deriv,
+            4: self.fourth_deriv,
+        }
+        # Spacings used by every derivative order, Richardson needs dx and 2 * dx
+        deriv_dx = {
+            deriv_order: ([dx, self._scale_dx(dx, 2.0)] if self.richardson else [dx])
+            for deriv_order, dx in deriv_dx.items()
+        }
         torch.cuda.nvtx.range_push("Calculating meshless finite derivatives")
 
-        # Assemble global stencil
-        global_stencil = []
-        for deriv in [
-            self.first_deriv,
-            self.second_deriv,
-            self.third_deriv,
-            self.fourth_deriv,
-        ]:
-            stencil_list = deriv.stencil
-            # Remove centered stencil points if already in input dictionary
-            for i, point in enumerate(stencil_list):
-                if point.split("::")[1] == str(0) and point.split("::")[0] in inputs:
-                    stencil_list.pop(i)
-            global_stencil.extend(stencil_list)
-        global_stencil = list(set(global_stencil))
+        # Assemble global stencil, points are identified by their physical offsets
+        # so that stencils of different derivatives / spacings are shared
+        global_stencil = {}
+        for deriv_order, deriv in derivs.items():
+            for dx in deriv_dx[deriv_order]:
+                for point in deriv.stencil:
+                    # Remove centered stencil points if already in input dictionary
+                    if (
+                        point.split("::")[1] == str(0)
+                        and point.split("::")[0] in inputs
+                    ):
+                        continue
+                    global_stencil.setdefault(self._stencil_key(point, dx), (point, dx))
+        global_stencil = list(global_stencil.items())
 
         # Number of stencil points to fit into a forward pass
         input_batch_size = next(iter(inputs.values())).size(0)
@@ -299,17 +484,18 @@ class MeshlessFiniteDerivative(torch.nn.Module):
             num_batch = max([self.max_batch_size, input_batch_size]) // input_batch_size
         # Stencil forward passes
         index = 0
-        finite_diff_inputs = inputs.copy()
+        stencil_outputs = {}
         while index < len(global_stencil):
             torch.cuda.nvtx.range_push("Running stencil forward pass")
             # Batch up stencil inputs
-            stencil_batch = [global_stencil[index]]
-            index += 1
-            for j in range(1, min([len(global_stencil) - (index - 1), num_batch])):
-                stencil_batch.append(global_stencil[index])
-                index += 1
+            stencil_batch = global_stencil[index : index + num_batch]
+            index += len(stencil_batch)
 
-            model_inputs = self._get_stencil_input(inputs, stencil_batch)
+            model_inputs = self._get_stencil_input(
+                inputs,
+                [point for _, (point, _) in stencil_batch],
+                [dx for _, (_, dx) in stencil_batch],
+            )
 
             # Model forward
             outputs = self.model(model_inputs)
@@ -317,40 +503,51 @@ class MeshlessFiniteDerivative(torch.nn.Module):
             # Dissassemble batched inputs
             for key, value in outputs.items():
                 outputs[key] = torch.split(value.view(-1, len(stencil_batch)), 1, dim=1)
-            for i, stencil_str in enumerate(stencil_batch):
-                for key, value in outputs.items():
-                    finite_diff_inputs[f"{key}>>{stencil_str}"] = value[i]
+            for i, (stencil_key, _) in enumerate(stencil_batch):
+                stencil_outputs[stencil_key] = {
+                    key: value[i] for key, value in outputs.items()
+                }
             torch.cuda.nvtx.range_pop()
 
         # Calc finite diff grads
         torch.cuda.nvtx.range_push("Calc finite difference")
+        base_inputs = inputs.copy()
         if self.double_cast:  # Cast tensors to doubles for finite diff calc
-            for key, value in finite_diff_inputs.items():
-                finite_diff_inputs[key] = value.double()
-
-        outputs_first = self.first_deriv(finite_diff_inputs)
-        outputs_second = self.second_deriv(finite_diff_inputs)
-        outputs_third = self.third_deriv(finite_diff_inputs)
-        outputs_fourth = self.fourth_deriv(finite_diff_inputs)
-
-        outputs = inputs
-        if self.double_cast:
-            dtype = torch.get_default_dtype()
-            for key, value in outputs_first.items():
-                outputs_first[key] = value.type(dtype)
-            for key, value in outputs_second.items():
-                outputs_second[key] = value.type(dtype)
-            for key, value in outputs_third.items():
-                outputs_third[key] = value.type(dtype)
-            for key, value in outputs_fourth.items():
-                outputs_fourth[key] = value.type(dtype)
-        outputs = {
-            **inputs,
-            **outputs_first,
-            **outputs_second,
-            **outputs_third,
-            **outputs_fourth,
-        }
+            for key, value in base_inputs.items():
+                base_inputs[key] = value.double()
+            for stencil_key, values in stencil_outputs.items():
+                for key, value in values.items():
+                    values[key] = value.double()
+
+        outputs = {**inputs}
+        for deriv_order, deriv in derivs.items():
+            deriv_outputs = []
+            for dx in deriv_dx[deriv_order]:
+                finite_diff_inputs = base_inputs.copy()
+                for point in deriv.stencil:
+                    stencil_key = self._stencil_key(point, dx)
+                    if stencil_key in stencil_outputs:
+                        for key, value in stencil_outputs[stencil_key].items():
+                            finite_diff_inputs[f"{key}>>{point}"] = value
+                deriv.dx = dx
+                deriv_outputs.append(deriv(finite_diff_inputs))
+
+            if self.richardson:
+                # Cancel the leading truncation error term of D(dx) using D(2 * dx)
+                factor = 2.0**self.order
+                deriv_outputs = {
+                    key: (factor * deriv_outputs[0][key] - deriv_outputs[1][key])
+                    / (factor - 1.0)
+                    for key in deriv_outputs[0].keys()
+                }
+            else:
+                deriv_outputs = deriv_outputs[0]
+
+            if self.double_cast:
+                dtype = torch.get_default_dtype()
+                for key, value in deriv_outputs.items():
+                    deriv_outputs[key] = value.type(dtype)
+            outputs.update(deriv_outputs)
         torch.cuda.nvtx.range_pop()
         torch.cuda.nvtx.range_pop()
         return outputs
@@ -362,8 +559,59 @@ class MeshlessFiniteDerivative(torch.nn.Module):
         else:
             return self._dx
 
+    def deriv_dx(
+        self, deriv_order: int, dtype: torch.dtype = torch.float32
+    ) -> Union[float, Dict[str, float]]:
+        """Spacing used for the derivatives of a given order
+
+        Parameters
+        ----------
+        deriv_order : int
+            Order of the derivative (1 for first derivatives etc.)
+        dtype : torch.dtype, optional
+            Precision of the stencil values, only used when dx is "auto",
+            by default torch.float32
+
+        Returns
+        -------
+        Union[float, Dict[str, float]]
+            dx used for the finite difference calculation, or dx of every
+            independent variable
+        """
+        if not isinstance(self._dx, str):
+            return self.dx
+        # Truncation error scales with dx**accuracy and round-off with eps/dx**order,
+        # the total error is minimized for dx ~ eps**(1/(accuracy + order))
+        accuracy = self.order + 2 if self.richardson else self.order
+        dx = torch.finfo(dtype).eps ** (1.0 / (accuracy + deriv_order))
+        return 2.0 ** round(math.log2(dx))
+
+    @staticmethod
+    def _var_dx(dx: Union[float, Dict[str, float]], var: str) -> float:
+        """dx of an independent variable"""
+        return dx[var] if isinstance(dx, dict) else dx
+
+    @staticmethod
+    def _scale_dx(
+        dx: Union[float, Dict[str, float]], factor: float
+    ) -> Union[float, Dict[str, float]]:
+        if isinstance(dx, dict):
+            return {var: factor * value for var, value in dx.items()}
+        return factor * dx
+
+    @classmethod
+    def _stencil_key(cls, point: str, dx: Union[float, Dict[str, float]]) -> str:
+        """Unique identifier of the physical location of a stencil point"""
+        return "&&".join(
+            f"{var}::{int(spacing) * cls._var_dx(dx, var)!r}"
+            for var, spacing in (p.split("::") for p in point.split("&&"))
+        )
+
     def _get_stencil_input(
-        self, inputs: Dict[str, Tensor], stencil_strs: List[str]
+        self,
+        inputs: Dict[str, Tensor],
+        stencil_strs: List[str],
+        stencil_dx: Optional[List[Union[float, Dict[str, float]]]] = None,
     ) -> Dict[str, Tensor]:
         """Creates a copy of the inputs tensor and adjusts its values based on
         the stencil str.
@@ -374,6 +622,8 @@ class MeshlessFiniteDerivative(torch.nn.Module):
             Input tensor dictionary
         stencil_strs : List[str]
             batch list of stencil string from derivative class
+        stencil_dx : Optional[List[Union[float, Dict[str, float]]]], optional
+            dx of every stencil string, by default uses dx for all of them
 
         Returns
         -------
@@ -393,12 +643,17 @@ class MeshlessFiniteDerivative(torch.nn.Module):
         for key, value in outputs.items():
             outputs[key] = value.repeat(1, len(stencil_strs))
 
-        for i, stencil_str in enumerate(stencil_strs):
+        if stencil_dx is None:
+            stencil_dx = [self.dx for _ in stencil_strs]
+
+        for i, (stencil_str, dx) in enumerate(zip(stencil_strs, stencil_dx)):
             # Loop through points
             for point in stencil_str.split("&&"):
                 var_name = point.split("::")[0]
                 spacing = int(point.split("::")[1])
-                outputs[var_name][:, i] = outputs[var_name][:, i] + spacing * self.dx
+                outputs[var_name][:, i] = outputs[var_name][:, i] + spacing * (
+                    self._var_dx(dx, var_name)
+                )
 
         for key, value in outputs.items():
             outputs[key] = value.view(-1, 1)
@@ -410,12 +665,13 @@ class MeshlessFiniteDerivative(torch.nn.Module):
         cls,
         node_model: Union[Node, torch.nn.Module],
         derivatives: List[Key],
-        dx: Union[float, Callable],
+        dx: Union[float, Dict[str, float], Callable, "AdaptiveDx", str],
         order: int = 2,
         max_batch_size: Union[int, None] = None,
         name: str = None,
         double_cast: bool = True,
         input_keys: Union[List[Key], List[str], None] = None,
+        richardson: bool = False,
     ):
         """Makes a meshless finite derivative node.
 
@@ -428,8 +684,9 @@ class MeshlessFiniteDerivative(torch.nn.Module):
             variables and output the functional value
         derivatives : List[Key]
             List of derivatives to be computed
-        dx : Union[float, Callable]
-            Spatial discretization for finite diff calcs, can be function
+        dx : Union[float, Dict[str, float], Callable, AdaptiveDx, str]
+            Spatial discretization for finite diff calcs, can be per independent
+            variable, function, `AdaptiveDx` or "auto"
         order : int, optional
             Order of accuracy of finite diff calcs, by default 2
         max_batch_size : Union[int, None], optional
@@ -441,6 +698,9 @@ class MeshlessFiniteDerivative(torch.nn.Module):
         input_keys : Union[List[Key], List[str], None], optional
             List of input keys to be used for input of forward model.
             Should be used if node_model is not a :obj:`Node`, by default None
+        richardson : bool, optional
+            Use Richardson extrapolation to increase the accuracy order of the
+            finite diff calcs by two, by default False
         """
 
         # We have two sets of input keys:
@@ -476,6 +736,7 @@ class MeshlessFiniteDerivative(torch.nn.Module):
             max_batch_size=max_batch_size,
             double_cast=double_cast,
             input_keys=input_keys,
+            richardson=richardson,
         )
 
         derivative_node = Node(
@@ -14,11 +14,35 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import itertools
+
+import numpy as np
 import torch
 from typing import Union, List
 
 Tensor = torch.Tensor
 
+# central difference coefficients keyed by accuracy order
+# Ref: https://en.wikipedia.org/wiki/Finite_difference_coefficient
+_CENTRAL_FIRST_DERIV = {
+    2: [-1.0 / 2.0, 0.0, 1.0 / 2.0],
+    4: [1.0 / 12.0, -2.0 / 3.0, 0.0, 2.0 / 3.0, -1.0 / 12.0],
+    6: [-1.0 / 60.0, 3.0 / 20.0, -3.0 / 4.0, 0.0, 3.0 / 4.0, -3.0 / 20.0, 1.0 / 60.0],
+}
+_CENTRAL_SECOND_DERIV = {
+    2: [1.0, -2.0, 1.0],
+    4: [-1.0 / 12.0, 4.0 / 3.0, -5.0 / 2.0, 4.0 / 3.0, -1.0 / 12.0],
+    6: [
+        1.0 / 90.0,
+        -3.0 / 20.0,
+        3.0 / 2.0,
+        -49.0 / 18.0,
+        3.0 / 2.0,
+        -3.0 / 20.0,
+        1.0 / 90.0,
+    ],
+}
+
 
 class FirstDerivSecondOrder(torch.nn.Module):
     """Module to compute first derivative with 2nd order accuracy"""
@@ -237,3 +261,162 @@ class MixedSecondDerivSecondOrder(torch.nn.Module):
             result.append(conv_result)
 
         return result
+
+
+class FusedDerivs(torch.nn.Module):
+    """Module to compute first, second and mixed derivatives of several variables
+    using a single grouped convolution.
+
+    Every variable is treated as an input channel and every derivative stencil as
+    an output channel of that group, so all the derivatives of all the variables
+    are computed by one `conv1d`/`conv2d`/`conv3d` call.
+
+    Parameters
+    ----------
+    dim : int
+        Dimensionality of the input (1D, 2D, or 3D)
+    dx : Union[float, List[float]]
+        Grid spacing. If float, the same value is used across all dimensions.
+    nr_vars : int, optional
+        Number of variables (channels) in the input, by default 1
+    orders : List[int], optional
+        Derivative orders to compute, by default [1, 2]
+    return_mixed_derivs : bool, optional
+        Whether to include mixed derivatives (requires order 2), by default False
+    accuracy_order : int, optional
+        Accuracy order of the central stencils. Supported values are 2, 4 and 6,
+        by default 2
+    padding : str, optional
+        Boundary handling. `"replicate"` repeats the boundary values (same as
+        `FirstDerivSecondOrder`), `"periodic"` wraps the domain around and
+        `"one_sided"` fills the ghost cells by polynomial extrapolation of the
+        interior values which makes the boundary stencils one-sided with the
+        same accuracy order, by default "replicate"
+    """
+
+    def __init__(
+        self,
+        dim: int,
+        dx: Union[float, List[float]],
+        nr_vars: int = 1,
+        orders: List[int] = [1, 2],
+        return_mixed_derivs: bool = False,
+        accuracy_order: int = 2,
+        padding: str = "replicate",
+    ):
+        super().__init__()
+        self.dim = dim
+        if isinstance(dx, (float, int)):
+            dx = [dx for _ in range(dim)]
+        self.dx = dx
+        self.nr_vars = nr_vars
+        self.accuracy_order = accuracy_order
+        self.padding = padding
+        self.half_width = accuracy_order // 2
+
+        assert len(self.dx) == self.dim, "Mismatch between dx and dim"
+        assert accuracy_order in _CENTRAL_FIRST_DERIV, (
+            f"Accuracy order {accuracy_order} not supported, "
+            + f"choose from {list(_CENTRAL_FIRST_DERIV.keys())}"
+        )
+        assert padding in ["replicate", "periodic", "one_sided"], (
+            f"Padding {padding} not supported"
+        )
+        if return_mixed_derivs:
+            assert self.dim > 1, "Mixed Derivatives only supported for 2D and 3D inputs"
+            assert 2 in orders, "Mixed Derivatives require second order derivatives"
+
+        # build the stencils, one per output channel of each group
+        axis_list = ["x", "y", "z"]
+        d1 = np.array(_CENTRAL_FIRST_DERIV[accuracy_order])
+        d2 = np.array(_CENTRAL_SECOND_DERIV[accuracy_order])
+        self.stencil_names = []
+        stencils = []
+        if 1 in orders:
+            for axis in range(self.dim):
+                self.stencil_names.append(axis_list[axis])
+                stencils.append(self._axis_stencil({axis: d1 / self.dx[axis]}))
+        if 2 in orders:
+            for axis in range(self.dim):
+                self.stencil_names.append(f"{axis_list[axis]}__{axis_list[axis]}")
+                stencils.append(self._axis_stencil({axis: d2 / self.dx[axis] ** 2}))
+            if return_mixed_derivs:
+                for axis_i, axis_j in itertools.combinations(range(self.dim), 2):
+                    self.stencil_names.append(
+                        f"{axis_list[axis_i]}__{axis_list[axis_j]}"
+                    )
+                    stencils.append(
+                        self._axis_stencil(
+                            {
+                                axis_i: d1 / self.dx[axis_i],
+                                axis_j: d1 / self.dx[axis_j],
+                            }
+                        )
+                    )
+
+        # [nr_vars * nr_stencils, 1, K, ...]
+        kernel = np.stack(stencils, axis=0)[:, None]
+        kernel = np.concatenate([kernel] * self.nr_vars, axis=0)
+        self.register_buffer("kernel", torch.Tensor(kernel))
+
+        # ghost cell extrapolation weights for one-sided boundary stencils
+        if self.padding == "one_sided":
+            nr_points = accuracy_order + 2
+            nodes = np.arange(nr_points)
+            ghosts = -np.arange(self.half_width, 0, -1)
+            weights = np.ones((self.half_width, nr_points))
+            for j in range(nr_points):
+                for m in range(nr_points):
+                    if m != j:
+                        weights[:, j] *= (ghosts - nodes[m]) / (nodes[j] - nodes[m])
+            self.register_buffer("extrapolation_weights", torch.Tensor(weights))
+
+    def _axis_stencil(self, axis_coefficients):
+        """Outer product of the 1D coefficients along the given axes"""
+        size = 2 * self.half_width + 1
+        stencil = np.ones(self.dim * [size])
+        for axis in range(self.dim):
+            coefficients = np.zeros(size)
+            if axis in axis_coefficients:
+                coefficients[:] = axis_coefficients[axis]
+            else:
+                coefficients[self.half_width] = 1.0
+            shape = [1] * self.dim
+            shape[axis] = size
+            stencil = stencil * coefficients.reshape(shape)
+        return stencil
+
+    def _pad_one_sided(self, u):
+        weights = self.extrapolation_weights.to(u.dtype)
+        nr_points = weights.shape[1]
+        for axis in range(2, self.dim + 2):
+            assert u.shape[axis] >= nr_points, (
+                f"One-sided padding requires at least {nr_points} grid points per axis"
+            )
+            u = u.movedim(axis, -1)
+            lower = torch.matmul(u[..., :nr_points], weights.t())
+            upper = torch.matmul(u[..., -nr_points:].flip(-1), weights.t()).flip(-1)
+            u = torch.cat([lower, u, upper], dim=-1).movedim(-1, axis)
+        return u
+
+    def forward(self, u) -> Tensor:
+        assert u.shape[1] == self.nr_vars, (
+            f"Expected {self.nr_vars} channels, but got {u.shape[1]}"
+        )
+        pad = self.dim * (self.half_width, self.half_width)
+        if self.padding == "replicate":
+            u = torch.nn.functional.pad(u, pad, "replicate")
+        elif self.padding == "periodic":
+            u = torch.nn.functional.pad(u, pad, "circular")
+        else:
+            u = self._pad_one_sided(u)
+
+        kernel = self.kernel.to(u.dtype)
+        conv = [
+            torch.nn.functional.conv1d,
+            torch.nn.functional.conv2d,
+            torch.nn.functional.conv3d,
+        ][self.dim - 1]
+        result = conv(u, kernel, stride=1, padding=0, bias=None, groups=self.nr_vars)
+        # [N, nr_vars, nr_stencils, ...]
+        return result.unflatten(1, (self.nr_vars, len(self.stencil_names)))
@@ -17,7 +17,7 @@
 import torch
 
 from physicsnemo.sym.key import Key
-from typing import Dict, List
+from typing import Dict, List, Union
 
 Tensor = torch.Tensor
 
@@ -33,10 +33,11 @@ class FirstDerivSecondOrder(torch.nn.Module):
 
     def forward(self, inputs: Dict[str, Tensor], dx: float) -> Dict[str, Tensor]:
         outputs = {}
-        # [0.5, -0.5]
-        outputs[self.out_name] = (0.5 / dx) * inputs[
-            f"{self.var}>>{self.indep_var}::1"
-        ] + (-0.5 / dx) * inputs[f"{self.var}>>{self.indep_var}::-1"]
+        # [0.5, -0.5], differences are taken before scaling to limit round-off
+        outputs[self.out_name] = (0.5 / dx) * (
+            inputs[f"{self.var}>>{self.indep_var}::1"]
+            - inputs[f"{self.var}>>{self.indep_var}::-1"]
+        )
         return outputs
 
 
@@ -52,11 +53,16 @@ class FirstDerivFourthOrder(torch.nn.Module):
     def forward(self, inputs: Dict[str, Tensor], dx: float) -> Dict[str, Tensor]:
         outputs = {}
         # [-1.0 / 12.0, 8.0 / 12.0, -8.0 / 12.0, 1.0 / 12.0]
-        outputs[self.out_name] = (
-            (-1.0 / (dx * 12.0)) * inputs[f"{self.var}>>{self.indep_var}::2"]
-            + (8.0 / (dx * 12.0)) * inputs[f"{self.var}>>{self.indep_var}::1"]
-            + (-8.0 / (dx * 12.0)) * inputs[f"{self.var}>>{self.indep_var}::-1"]
-            + (1.0 / (dx * 12.0)) * inputs[f"{self.var}>>{self.indep_var}::-2"]
+        outputs[self.out_name] = (1.0 / (dx * 12.0)) * (
+            8.0
+            * (
+                inputs[f"{self.var}>>{self.indep_var}::1"]
+                - inputs[f"{self.var}>>{self.indep_var}::-1"]
+            )
+            - (
+                inputs[f"{self.var}>>{self.indep_var}::2"]
+                - inputs[f"{self.var}>>{self.indep_var}::-2"]
+            )
         )
         return outputs
 
@@ -73,10 +79,10 @@ class SecondDerivSecondOrder(torch.nn.Module):
     def forward(self, inputs: Dict[str, Tensor], dx: float) -> Dict[str, Tensor]:
         outputs = {}
         # [1.0, -2.0, 1.0]
-        outputs[self.out_name] = (
-            (1.0 / (dx**2)) * inputs[f"{self.var}>>{self.indep_var}::1"]
-            + (-2.0 / (dx**2)) * inputs[f"{self.var}"]
-            + (1.0 / (dx**2)) * inputs[f"{self.var}>>{self.indep_var}::-1"]
+        center = inputs[f"{self.var}"]
+        outputs[self.out_name] = (1.0 / (dx**2)) * (
+            (inputs[f"{self.var}>>{self.indep_var}::1"] - center)
+            + (inputs[f"{self.var}>>{self.indep_var}::-1"] - center)
         )
         return outputs
 
@@ -93,12 +99,17 @@ class SecondDerivFourthOrder(torch.nn.Module):
     def forward(self, inputs: Dict[str, Tensor], dx: float) -> Dict[str, Tensor]:
         outputs = {}
         # [-1/12, 4/3, -5/2, 4/3, -1/12]
-        outputs[self.out_name] = (
-            (-1.0 / (12.0 * dx**2)) * inputs[f"{self.var}>>{self.indep_var}::2"]
-            + (4.0 / (3.0 * dx**2)) * inputs[f"{self.var}>>{self.indep_var}::1"]
-            + (-5.0 / (2.0 * dx**2)) * inputs[f"{self.var}"]
-            + (4.0 / (3.0 * dx**2)) * inputs[f"{self.var}>>{self.indep_var}::-1"]
-            + (-1.0 / (12.0 * dx**2)) * inputs[f"{self.var}>>{self.indep_var}::-2"]
+        center = inputs[f"{self.var}"]
+        outputs[self.out_name] = (1.0 / (12.0 * dx**2)) * (
+            16.0
+            * (
+                (inputs[f"{self.var}>>{self.indep_var}::1"] - center)
+                + (inputs[f"{self.var}>>{self.indep_var}::-1"] - center)
+            )
+            - (
+                (inputs[f"{self.var}>>{self.indep_var}::2"] - center)
+                + (inputs[f"{self.var}>>{self.indep_var}::-2"] - center)
+            )
         )
         return outputs
 
@@ -116,17 +127,25 @@ class MixedSecondDerivSecondOrder(torch.nn.Module):
         self.indep_vars.sort()
         self.out_name = out_name
 
-    def forward(self, inputs: Dict[str, Tensor], dx: float) -> Dict[str, Tensor]:
+    def forward(
+        self, inputs: Dict[str, Tensor], dx: Union[float, List[float]]
+    ) -> Dict[str, Tensor]:
         outputs = {}
-        outputs[self.out_name] = (
-            (0.25 / (dx**2))
-            * inputs[f"{self.var}>>{self.indep_vars[0]}::1&&{self.indep_vars[1]}::1"]
-            + (-0.25 / (dx**2))
-            * inputs[f"{self.var}>>{self.indep_vars[0]}::-1&&{self.indep_vars[1]}::1"]
-            + (-0.25 / (dx**2))
-            * inputs[f"{self.var}>>{self.indep_vars[0]}::1&&{self.indep_vars[1]}::-1"]
-            + (0.25 / (dx**2))
-            * inputs[f"{self.var}>>{self.indep_vars[0]}::-1&&{self.indep_vars[1]}::-1"]
+        # different spacing of the two independent variables
+        dx_0, dx_1 = dx if isinstance(dx, (list, tuple)) else (dx, dx)
+        outputs[self.out_name] = (0.25 / (dx_0 * dx_1)) * (
+            (
+                inputs[f"{self.var}>>{self.indep_vars[0]}::1&&{self.indep_vars[1]}::1"]
+                - inputs[
+                    f"{self.var}>>{self.indep_vars[0]}::-1&&{self.indep_vars[1]}::1"
+                ]
+            )
+            - (
+                inputs[f"{self.var}>>{self.indep_vars[0]}::1&&{self.indep_vars[1]}::-1"]
+                - inputs[
+                    f"{self.var}>>{self.indep_vars[0]}::-1&&{self.indep_vars[1]}::-1"
+                ]
+            )
         )
         return outputs
 
@@ -144,11 +163,16 @@ class ThirdDerivSecondOrder(torch.nn.Module):
     def forward(self, inputs: Dict[str, Tensor], dx: float) -> Dict[str, Tensor]:
         outputs = {}
         # [1/2, -1.0, 1.0, -1/2]
-        outputs[self.out_name] = (
-            (0.5 / (dx**3)) * inputs[f"{self.var}>>{self.indep_var}::2"]
-            + (-1.0 / (dx**3)) * inputs[f"{self.var}>>{self.indep_var}::1"]
-            + (1.0 / (dx**3)) * inputs[f"{self.var}>>{self.indep_var}::-1"]
-            + (-0.5 / (dx**3)) * inputs[f"{self.var}>>{self.indep_var}::-2"]
+        outputs[self.out_name] = (0.5 / (dx**3)) * (
+            (
+                inputs[f"{self.var}>>{self.indep_var}::2"]
+                - inputs[f"{self.var}>>{self.indep_var}::-2"]
+            )
+            - 2.0
+            * (
+                inputs[f"{self.var}>>{self.indep_var}::1"]
+                - inputs[f"{self.var}>>{self.indep_var}::-1"]
+            )
         )
         return outputs
 
@@ -165,12 +189,17 @@ class FourthDerivSecondOrder(torch.nn.Module):
     def forward(self, inputs: Dict[str, Tensor], dx: float) -> Dict[str, Tensor]:
         outputs = {}
         # [1.0, -4.0, 6.0, -4.0, 1.0]
-        outputs[self.out_name] = (
-            (1.0 / (dx**4)) * inputs[f"{self.var}>>{self.indep_var}::2"]
-            + (-4.0 / (dx**4)) * inputs[f"{self.var}>>{self.indep_var}::1"]
-            + (6.0 / (dx**4)) * inputs[f"{self.var}"]
-            + (-4.0 / (dx**4)) * inputs[f"{self.var}>>{self.indep_var}::-1"]
-            + (1.0 / (dx**4)) * inputs[f"{self.var}>>{self.indep_var}::-2"]
+        center = inputs[f"{self.var}"]
+        outputs[self.out_name] = (1.0 / (dx**4)) * (
+            (
+                (inputs[f"{self.var}>>{self.indep_var}::2"] - center)
+                + (inputs[f"{self.var}>>{self.indep_var}::-2"] - center)
+            )
+            - 4.0
+            * (
+                (inputs[f"{self.var}>>{self.indep_var}::1"] - center)
+                + (inputs[f"{self.var}>>{self.indep_var}::-1"] - center)
+            )
         )
         return outputs
 
@@ -219,7 +248,13 @@ class DerivBase(torch.nn.Module):
         """
         outputs = {}
         for module in self._eval:
-            outputs.update(module(inputs, self.dx))
+            dx = self.dx
+            if isinstance(dx, dict):  # dx of every independent variable
+                if hasattr(module, "indep_vars"):
+                    dx = [dx[var] for var in module.indep_vars]
+                else:
+                    dx = dx[module.indep_var]
+            outputs.update(module(inputs, dx))
         return outputs
 
 
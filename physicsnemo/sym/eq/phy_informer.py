@@ -16,7 +16,7 @@
 
 import copy
 import logging
-from typing import List, Optional, Union
+from typing import Dict, List, Optional, Tuple, Union
 
 import numpy as np
 import torch
@@ -83,6 +83,11 @@ class PhysicsInformer:
             difference assuming regular grid. Ideal for use with regular grids / images.
             The `.forward` call requires input dict with the relevant variables in
             `[N, 1, H, W, D]` for 3D, `[N, 1, H, W]` for 2D and `[N, 1, H]` for 1D.
+            `fused_finite_difference`: Same as `finite_difference`, but all the
+            variables are stacked as channels and all the first, second and mixed
+            derivatives are computed using a single grouped convolution. Supports
+            higher accuracy orders and periodic / one-sided boundary handling
+            through `fd_accuracy_order` and `fd_padding`.
             `spectral`: The spatial gradients are computed using FFTs. Note: this can
             lead to boundary artifacts for non-periodic signals. Ideal for use with
             regular grids / images.
@@ -105,6 +110,12 @@ class PhysicsInformer:
         by default 0.001
     bounds : List[float], optional
         bounds to be used for spectral derivatives, by default [2 * np.pi, 2 * np.pi, 2 * np.pi]
+    fd_accuracy_order : int, optional
+        Accuracy order of the stencils used for fused finite difference (2, 4 or 6),
+        by default 2
+    fd_padding : str, optional
+        Boundary handling used for fused finite difference. Options are
+        "replicate", "periodic" and "one_sided", by default "replicate"
     compute_connectivity : bool, optional
         Wether to compute the connectivity tensor during forward pass (only applies for
         least squares method), by default True. Set to false if this can be computed as
@@ -150,6 +161,8 @@ class PhysicsInformer:
         ],  # only applies for FD and Meshless FD. Ignored for the rest
         compute_connectivity: bool = True,  # only applies for least squares. Ignored for the rest
         device: Optional[str] = None,
+        fd_accuracy_order: int = 2,  # only applies for fused FD. Ignored for the rest
+        fd_padding: str = "replicate",  # only applies for fused FD. Ignored for the rest
     ):
         self.required_outputs = required_outputs
         self.equations = equations
@@ -158,6 +171,8 @@ class PhysicsInformer:
         self.fd_dx = fd_dx
         self.bounds = bounds
         self.compute_connectivity = compute_connectivity
+        self.fd_accuracy_order = fd_accuracy_order
+        self.fd_padding = fd_padding
         self.device = device if device is not None else torch.device("cpu")
         self.grad_calc = GradientCalculator(device=self.device)
         self.nodes = self.equations.make_nodes()
@@ -227,8 +242,13 @@ class PhysicsInformer:
         input_keys_sym = [Key(k) for k in self.required_inputs]
         output_keys_sym = [Key(k) for k in self.required_outputs]
 
-        diff_nodes = self._create_diff_nodes(first_deriv, dim=self.dim, order=1)
-        diff_nodes += self._create_diff_nodes(second_deriv, dim=self.dim, order=2)
+        if self.grad_method == "fused_finite_difference":
+            diff_nodes = self._create_fused_fd_nodes(
+                first_deriv, second_deriv, dim=self.dim
+            )
+        else:
+            diff_nodes = self._create_diff_nodes(first_deriv, dim=self.dim, order=1)
+            diff_nodes += self._create_diff_nodes(second_deriv, dim=self.dim, order=2)
 
         return Graph(
             self.nodes, input_keys_sym, output_keys_sym, diff_nodes=diff_nodes
@@ -286,6 +306,40 @@ class PhysicsInformer:
                 diff_nodes.append(node)
         return diff_nodes
 
+    def _create_fused_fd_nodes(self, first_deriv, second_deriv, dim):
+        """Create a single derivative node computing all the derivatives at once"""
+        derr_vars = sorted(first_deriv | second_deriv)
+        if not derr_vars:
+            return []
+
+        orders = []
+        if first_deriv:
+            orders.append(1)
+        if second_deriv:
+            orders.append(2)
+
+        output_keys = []
+        for derr_var in derr_vars:
+            for order in orders:
+                output_keys += self._derivative_keys(
+                    derr_var,
+                    dim,
+                    order,
+                    return_mixed_derivs=self.require_mixed_derivs,
+                )
+
+        module = self.grad_calc.get_gradient_module(
+            self.grad_method,
+            derr_vars,
+            dx=self.fd_dx,
+            dim=dim,
+            order=orders,
+            return_mixed_derivs=self.require_mixed_derivs,
+            accuracy_order=self.fd_accuracy_order,
+            padding=self.fd_padding,
+        )
+        return [Node(derr_vars, output_keys, module)]
+
     def _create_diff_node(self, derr_var, dim, order):
         """Select appropriate derivative node based on grad_method"""
         methods = {
@@ -387,6 +441,116 @@ class PhysicsInformer:
             return_mixed_derivs=return_mixed_derivs,
         )
 
+    def pack(
+        self, samples: List[Dict[str, torch.Tensor]]
+    ) -> Tuple[Dict[str, torch.Tensor], torch.Tensor]:
+        """Pack a list of samples (e.g. different meshes or point clouds) into a
+        single ragged batch that can be passed to `forward_batched`.
+
+        All the point-wise entries are concatenated along the first dimension. For
+        the least squares method, the "nodes" and "edges" of every sample are
+        offset by the number of nodes of the preceding samples so that the packed
+        graph is the disjoint union of the sample graphs.
+
+        Parameters
+        ----------
+        samples : List[Dict[str, torch.Tensor]]
+            List of input dictionaries, one per sample, in the same format as the
+            `forward` call.
+
+        Returns
+        -------
+        Tuple[Dict[str, torch.Tensor], torch.Tensor]
+            The packed input dictionary and the batch index of every point in
+            `[N]` format.
+
+        Note
+        ----
+        For the autodiff method, the model outputs must be computed from the packed
+        "coordinates", otherwise they will not be connected in the computational
+        graph.
+        """
+        self._check_packable()
+
+        sizes = [
+            next(
+                v
+                for k, v in sample.items()
+                if k not in ["edges", "connectivity_tensor"]
+            ).shape[0]
+            for sample in samples
+        ]
+        packed = {}
+        for key in samples[0].keys():
+            if key == "connectivity_tensor":
+                # connectivity is recomputed for the packed graph
+                continue
+            values = [sample[key] for sample in samples]
+            if key in ["nodes", "edges"]:
+                offset = 0
+                shifted = []
+                for value, size in zip(values, sizes):
+                    shifted.append(value + offset)
+                    offset += size
+                values = shifted
+            packed[key] = torch.cat(values, dim=0)
+
+        if (
+            self.grad_method == "least_squares"
+            and not self.compute_connectivity
+            and "nodes" in packed
+        ):
+            packed["connectivity_tensor"] = compute_connectivity_tensor(
+                packed["nodes"], packed["edges"]
+            )
+
+        device = packed[next(iter(packed))].device
+        batch = torch.repeat_interleave(
+            torch.arange(len(samples), device=device),
+            torch.tensor(sizes, device=device),
+        )
+        return packed, batch
+
+    def forward_batched(
+        self, inputs: Dict[str, torch.Tensor], batch: torch.Tensor
+    ) -> List[Dict[str, torch.Tensor]]:
+        """Compute the residuals of a packed batch of samples in a single pass and
+        return the residuals of every sample.
+
+        Parameters
+        ----------
+        inputs : Dict[str, torch.Tensor]
+            Packed input dictionary (see `pack`). All the point-wise entries are
+            concatenated along the first dimension.
+        batch : torch.Tensor
+            Batch index of every point in `[N]` format. Points of the same sample
+            must be contiguous and samples must be ordered by their index.
+
+        Returns
+        -------
+        List[Dict[str, torch.Tensor]]
+            Residuals of every sample.
+        """
+        self._check_packable()
+
+        outputs = self.forward(inputs)
+        sizes = torch.bincount(batch).tolist()
+        split_outputs = {k: torch.split(v, sizes, dim=0) for k, v in outputs.items()}
+        return [{k: v[i] for k, v in split_outputs.items()} for i in range(len(sizes))]
+
+    def _check_packable(self):
+        """Ragged batches are only supported by the point-wise methods"""
+        if self.grad_method not in [
+            "autodiff",
+            "meshless_finite_difference",
+            "least_squares",
+        ]:
+            raise ValueError(
+                f"Packed batches are not supported for {self.grad_method}. "
+                + "Grid based methods already support batching along the first "
+                + "dimension of the inputs."
+            )
+
     def forward(self, inputs):
         """Forward pass"""
         if self.grad_method == "least_squares":
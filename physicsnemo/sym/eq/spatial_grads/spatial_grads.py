@@ -225,14 +225,14 @@ def compute_connectivity_tensor(nodes, edges, max_neighbors=None):
         (num_nodes, max_neighbors), -1, dtype=torch.long, device=nodes.device
     )
 
-    for i in range(num_nodes):
-        start_idx = offsets[i]
-        end_idx = offsets[i + 1]
-        num_neighbors = end_idx - start_idx
-        if num_neighbors > 0:
-            neighbor_matrix[i, :num_neighbors] = torch.tensor(
-                indices[start_idx:end_idx], dtype=torch.long, device=nodes.device
-            )
+    # scatter the adjacency list into the padded matrix in one go
+    neighbor_counts = offsets[1:] - offsets[:-1]
+    rows = np.repeat(np.arange(num_nodes), neighbor_counts)
+    cols = np.arange(len(indices)) - offsets[rows]
+    neighbor_matrix[
+        torch.as_tensor(rows, dtype=torch.long, device=nodes.device),
+        torch.as_tensor(cols, dtype=torch.long, device=nodes.device),
+    ] = indices_tensor
 
     return offsets_tensor, indices_tensor, neighbor_matrix
 
@@ -556,6 +556,95 @@ class GradientsFiniteDifference(torch.nn.Module):
         return result
 
 
+class GradientsFusedFiniteDifference(torch.nn.Module):
+    """
+    Compute spatial derivatives of several variables using Finite Differentiation.
+    All the variables are stacked as channels and all the derivative stencils are
+    applied using a single grouped convolution, instead of one convolution per axis
+    per variable as in `GradientsFiniteDifference`.
+
+    Parameters
+    ----------
+    invar : Union[str, List[str]]
+        Variables whose gradients are computed.
+    dx : Union[Union[float, int], List[float]]
+        dx for the finite difference calculation.
+    dim : int, optional
+        Dimensionality of the input (1D, 2D, or 3D), by default 3
+    order : Union[int, List[int]], optional
+        Order of the derivatives, by default 1 which returns the first order
+        derivatives (e.g. `u__x`, `u__y`, `u__z`). A list such as `[1, 2]` returns
+        both first and second order derivatives. Max order 2 is supported.
+    return_mixed_derivs : bool, optional
+        Whether to include mixed derivatives such as `u__x__y`, by default False
+    accuracy_order : int, optional
+        Accuracy order of the finite difference stencils (2, 4 or 6), by default 2
+    padding : str, optional
+        Boundary handling, one of `"replicate"`, `"periodic"` or `"one_sided"`,
+        by default "replicate"
+    """
+
+    def __init__(
+        self,
+        invar: Union[str, List[str]],
+        dx: Union[Union[float, int], List[float]],
+        dim: int = 3,
+        order: Union[int, List[int]] = 1,
+        return_mixed_derivs: bool = False,
+        accuracy_order: int = 2,
+        padding: str = "replicate",
+    ):
+        super().__init__()
+
+        self.invar = [invar] if isinstance(invar, str) else list(invar)
+        self.dx = dx
+        self.dim = dim
+        self.order = [order] if isinstance(order, int) else list(order)
+        self.return_mixed_derivs = return_mixed_derivs
+
+        if isinstance(self.dx, (float, int)):
+            self.dx = [self.dx for _ in range(self.dim)]
+
+        assert max(self.order) < 3, "Derivatives only upto 2nd order are supported"
+        assert len(self.dx) == self.dim, f"Mismatch in {self.dim} and {self.dx}"
+
+        if self.return_mixed_derivs:
+            assert self.dim > 1, "Mixed Derivatives only supported for 2D and 3D inputs"
+            assert 2 in self.order, (
+                "Mixed Derivatives not possible for first order derivatives"
+            )
+
+        self.deriv_module = fd_grads.FusedDerivs(
+            self.dim,
+            self.dx,
+            nr_vars=len(self.invar),
+            orders=self.order,
+            return_mixed_derivs=self.return_mixed_derivs,
+            accuracy_order=accuracy_order,
+            padding=padding,
+        )
+
+    def forward(self, input_dict):
+        u = torch.cat([input_dict[var] for var in self.invar], dim=1)
+
+        assert (u.dim() - 2) == self.dim, (
+            f"Expected a {self.dim + 2} dimensional tensor, but got {u.dim()} dimensional tensor"
+        )
+
+        # [N, nr_vars, nr_stencils, ...]
+        derivatives = self.deriv_module(u)
+
+        result = {}
+        for i, var in enumerate(self.invar):
+            for j, name in enumerate(self.deriv_module.stencil_names):
+                result[f"{var}__{name}"] = derivatives[:, i, j : j + 1]
+                if name.count("__") == 1 and name.split("__")[0] != name.split("__")[1]:
+                    axis_i, axis_j = name.split("__")
+                    result[f"{var}__{axis_j}__{axis_i}"] = derivatives[:, i, j : j + 1]
+
+        return result
+
+
 class GradientsSpectral(torch.nn.Module):
     """
     Compute spatial derivatives using Spectral Differentiation using FFTs.
@@ -872,6 +961,7 @@ class GradientCalculator:
         self.methods["autodiff"] = GradientsAutoDiff
         self.methods["meshless_finite_difference"] = GradientsMeshlessFiniteDifference
         self.methods["finite_difference"] = GradientsFiniteDifference
+        self.methods["fused_finite_difference"] = GradientsFusedFiniteDifference
         self.methods["spectral"] = GradientsSpectral
         self.methods["least_squares"] = GradientsLeastSquares
 
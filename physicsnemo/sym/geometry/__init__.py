@@ -16,3 +16,9 @@
 
 from .geometry import Geometry
 from .parameterization import Bounds, Parameterization, Parameter
+from .parallel import sample_parallel
+from .quasirandom import (
+    QuasiRandomStream,
+    get_quasirandom_stream,
+    set_quasirandom_stream,
+)
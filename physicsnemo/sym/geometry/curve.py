@@ -23,7 +23,7 @@ import sympy
 import symengine
 
 from .parameterization import Parameterization, Parameter
-from .helper import _sympy_func_to_func
+from .helper import _sympy_func_to_func, _array_namespace, _empty_samples, _in_range
 
 
 class Curve:
@@ -31,32 +31,43 @@ class Curve:
     The curve object also contains normals and area/length of curve.
     """
 
-    def __init__(self, sample, dims, parameterization=Parameterization()):
+    def __init__(
+        self, sample, dims, parameterization=Parameterization(), restrict=None
+    ):
         # store attributes
         self._sample = sample
         self._dims = dims
         self.parameterization = parameterization
+        self._restrict = restrict
 
     def sample(
-        self, nr_points, criteria=None, parameterization=None, quasirandom=False
+        self,
+        nr_points,
+        criteria=None,
+        parameterization=None,
+        quasirandom=False,
+        device=None,
     ):
         # use internal parameterization if not given
         if parameterization is None:
             parameterization = self.parameterization
 
+        # only curves sampled on a device need to support it
+        sample_kwargs = {} if device is None else {"device": device}
+
         # continually sample points throwing out points that don't satisfy criteria
         invar = {
-            key: np.empty((0, 1))
+            key: _empty_samples(device)
             for key in self.dims + ["normal_" + x for x in self.dims] + ["area"]
         }
-        params = {key: np.empty((0, 1)) for key in parameterization.parameters}
+        params = {key: _empty_samples(device) for key in parameterization.parameters}
         total_sampled = 0
         total_tried = 0
         nr_try = 0
         while True:
             # sample curve
             local_invar, local_params = self._sample(
-                nr_points, parameterization, quasirandom
+                nr_points, parameterization, quasirandom, **sample_kwargs
             )
 
             # compute given criteria and remove points
@@ -72,12 +83,13 @@ class Curve:
                 }
 
             # store invar
+            xp = _array_namespace(*local_invar.values())
             for key in local_invar.keys():
-                invar[key] = np.concatenate([invar[key], local_invar[key]], axis=0)
+                invar[key] = xp.concatenate([invar[key], local_invar[key]], axis=0)
 
             # store params
             for key in local_params.keys():
-                params[key] = np.concatenate([params[key], local_params[key]], axis=0)
+                params[key] = xp.concatenate([params[key], local_params[key]], axis=0)
 
             # keep track of sampling
             total_sampled = next(iter(invar.values())).shape[0]
@@ -108,6 +120,48 @@ class Curve:
         """
         return ["x", "y", "z"][: self._dims]
 
+    def restrict(self, box, parameters=()):
+        """
+        Restrict the curve to an axis aligned box.
+
+        Parameters
+        ----------
+        box : dict of strings and tuples
+          Ranges `(low, high)` of the coordinates, for example
+          `{'x': (0, 0), 'y': (-np.inf, 1)}`. Coordinates not in the box
+          are not restricted.
+        parameters : iterable of Parameters
+          Parameters of the geometry and of the sampling parameterization.
+          Their ranges are given when sampling, so only the other
+          parameters of the curve are restricted.
+
+        Returns
+        -------
+        curve : Curve or None
+          Curve that samples a part of this curve containing all points in
+          the box, with areas of that part. None if no points of the curve
+          are in the box. Curves that can not be restricted return themself.
+        """
+        if self._restrict is None:
+            return self
+        return self._restrict(self, box, parameters)
+
+    def _transformed_restrict(self, box_fn, transform):
+        # restrict function of a transformed curve, `box_fn` maps the box to
+        # the coordinates of this curve or returns None if it can not
+        def restrict(curve, box, parameters):
+            inner_box = box_fn(box)
+            if inner_box is None:
+                return curve
+            inner = self.restrict(inner_box, parameters)
+            if inner is None:
+                return None
+            if inner is self:
+                return curve
+            return transform(inner)
+
+        return restrict
+
     def approx_area(
         self,
         parameterization=Parameterization(),
@@ -164,11 +218,14 @@ class Curve:
                 raise TypeError("Scaling by type " + str(type(x)) + "is not supported")
 
             def sample(
-                nr_points, parameterization=Parameterization(), quasirandom=False
+                nr_points,
+                parameterization=Parameterization(),
+                quasirandom=False,
+                **kwargs,
             ):
                 # sample points
                 invar, params = internal_sample(
-                    nr_points, parameterization, quasirandom
+                    nr_points, parameterization, quasirandom, **kwargs
                 )
 
                 # scale invar
@@ -180,10 +237,18 @@ class Curve:
 
             return sample
 
+        def _scale_box(box):
+            if not isinstance(x, (float, int)) or x == 0:
+                return None
+            return {d: tuple(sorted((lo / x, hi / x))) for d, (lo, hi) in box.items()}
+
         return Curve(
             _sample(self._sample, self.dims, x),
             len(self.dims),
             self.parameterization.union(parameterization),
+            restrict=self._transformed_restrict(
+                _scale_box, lambda c: c.scale(x, parameterization)
+            ),
         )
 
     def translate(self, xyz, parameterization=Parameterization()):
@@ -209,11 +274,14 @@ class Curve:
                     )
 
             def sample(
-                nr_points, parameterization=Parameterization(), quasirandom=False
+                nr_points,
+                parameterization=Parameterization(),
+                quasirandom=False,
+                **kwargs,
             ):
                 # sample points
                 invar, params = internal_sample(
-                    nr_points, parameterization, quasirandom
+                    nr_points, parameterization, quasirandom, **kwargs
                 )
 
                 # compute translation if needed
@@ -231,10 +299,19 @@ class Curve:
 
             return sample
 
+        def _translate_box(box):
+            if not all(isinstance(x, (float, int)) for x in xyz):
+                return None
+            shift = dict(zip(self.dims, xyz))
+            return {d: (lo - shift[d], hi - shift[d]) for d, (lo, hi) in box.items()}
+
         return Curve(
             _sample(self._sample, self.dims, xyz),
             len(self.dims),
             self.parameterization.union(parameterization),
+            restrict=self._transformed_restrict(
+                _translate_box, lambda c: c.translate(xyz, parameterization)
+            ),
         )
 
     def rotate(self, angle, axis, parameterization=Parameterization()):
@@ -258,11 +335,14 @@ class Curve:
                 )
 
             def sample(
-                nr_points, parameterization=Parameterization(), quasirandom=False
+                nr_points,
+                parameterization=Parameterization(),
+                quasirandom=False,
+                **kwargs,
             ):
                 # sample points
                 invar, params = internal_sample(
-                    nr_points, parameterization, quasirandom
+                    nr_points, parameterization, quasirandom, **kwargs
                 )
 
                 # compute translation if needed
@@ -272,41 +352,56 @@ class Curve:
                     computed_angle = angle(params)
 
                 # angle invar
+                xp = _array_namespace(computed_angle)
                 rotated_invar = {**invar}
                 rotated_dims = [key for key in self.dims if key != axis]
                 rotated_invar[rotated_dims[0]] = (
-                    np.cos(computed_angle) * invar[rotated_dims[0]]
-                    - np.sin(computed_angle) * invar[rotated_dims[1]]
+                    xp.cos(computed_angle) * invar[rotated_dims[0]]
+                    - xp.sin(computed_angle) * invar[rotated_dims[1]]
                 )
                 rotated_invar["normal_" + rotated_dims[0]] = (
-                    np.cos(computed_angle) * invar["normal_" + rotated_dims[0]]
-                    - np.sin(computed_angle) * invar["normal_" + rotated_dims[1]]
+                    xp.cos(computed_angle) * invar["normal_" + rotated_dims[0]]
+                    - xp.sin(computed_angle) * invar["normal_" + rotated_dims[1]]
                 )
                 rotated_invar[rotated_dims[1]] = (
-                    np.sin(computed_angle) * invar[rotated_dims[0]]
-                    + np.cos(computed_angle) * invar[rotated_dims[1]]
+                    xp.sin(computed_angle) * invar[rotated_dims[0]]
+                    + xp.cos(computed_angle) * invar[rotated_dims[1]]
                 )
                 rotated_invar["normal_" + rotated_dims[1]] = (
-                    np.sin(computed_angle) * invar["normal_" + rotated_dims[0]]
-                    + np.cos(computed_angle) * invar["normal_" + rotated_dims[1]]
+                    xp.sin(computed_angle) * invar["normal_" + rotated_dims[0]]
+                    + xp.cos(computed_angle) * invar["normal_" + rotated_dims[1]]
                 )
 
                 return rotated_invar, params
 
             return sample
 
+        def _rotate_box(box):
+            # only boxes along the rotation axis are unchanged
+            if any(d != axis for d in box.keys()):
+                return None
+            return box
+
         return Curve(
             _sample(self._sample, self.dims, angle, axis),
             len(self.dims),
             self.parameterization.union(parameterization),
+            restrict=self._transformed_restrict(
+                _rotate_box, lambda c: c.rotate(angle, axis, parameterization)
+            ),
         )
 
     def invert_normal(self):
         def _sample(internal_sample, dims):
             def sample(
-                nr_points, parameterization=Parameterization(), quasirandom=False
+                nr_points,
+                parameterization=Parameterization(),
+                quasirandom=False,
+                **kwargs,
             ):
-                s, p = internal_sample(nr_points, parameterization, quasirandom)
+                s, p = internal_sample(
+                    nr_points, parameterization, quasirandom, **kwargs
+                )
                 for d in dims:
                     s["normal_" + d] = -s["normal_" + d]
                 return s, p
@@ -314,7 +409,10 @@ class Curve:
             return sample
 
         return Curve(
-            _sample(self._sample, self.dims), len(self.dims), self.parameterization
+            _sample(self._sample, self.dims),
+            len(self.dims),
+            self.parameterization,
+            restrict=self._transformed_restrict(lambda box: box, Curve.invert_normal),
         )
 
 
@@ -345,6 +443,11 @@ class SympyCurve(Curve):
     """
 
     def __init__(self, functions, parameterization, area, criteria=None):
+        # keep the expressions to restrict the curve
+        self._functions = functions
+        self._area = area
+        self._criteria = criteria
+
         # lambdify functions
         lambdify_functions = {}
         for key, func in functions.items():
@@ -379,7 +482,10 @@ class SympyCurve(Curve):
         # create closure for sample function
         def _sample(lambdify_functions, criteria, internal_parameterization):
             def sample(
-                nr_points, parameterization=Parameterization(), quasirandom=False
+                nr_points,
+                parameterization=Parameterization(),
+                quasirandom=False,
+                device=None,
             ):
                 # use internal parameterization if not given
                 i_parameterization = internal_parameterization.copy()
@@ -388,10 +494,11 @@ class SympyCurve(Curve):
 
                 # continually sample points throwing out points that don't satisfy criteria
                 invar = {
-                    str(key): np.empty((0, 1)) for key in lambdify_functions.keys()
+                    str(key): _empty_samples(device)
+                    for key in lambdify_functions.keys()
                 }
                 params = {
-                    str(key): np.empty((0, 1))
+                    str(key): _empty_samples(device)
                     for key in parameterization.param_ranges.keys()
                 }
                 total_sampled = 0
@@ -399,13 +506,16 @@ class SympyCurve(Curve):
                 nr_try = 0
                 while True:
                     # sample parameter ranges
-                    local_params = i_parameterization.sample(nr_points, quasirandom)
+                    local_params = i_parameterization.sample(
+                        nr_points, quasirandom, device=device
+                    )
+                    xp = _array_namespace(*local_params.values())
 
                     # compute curve points from functions
                     local_invar = {}
                     for key, func in lambdify_functions.items():
                         if isinstance(func, (float, int)):
-                            local_invar[key] = np.full_like(
+                            local_invar[key] = xp.full_like(
                                 next(iter(local_params.values())), func
                             )
                         else:
@@ -434,13 +544,13 @@ class SympyCurve(Curve):
 
                     # store invar
                     for key in local_invar.keys():
-                        invar[key] = np.concatenate(
+                        invar[key] = xp.concatenate(
                             [invar[key], local_invar[key]], axis=0
                         )
 
                     # store params
                     for key in local_params.keys():
-                        params[key] = np.concatenate(
+                        params[key] = xp.concatenate(
                             [params[key], local_params[key]], axis=0
                         )
 
@@ -472,3 +582,58 @@ class SympyCurve(Curve):
             len(functions) // 2,
             parameterization=parameterization,
         )
+
+    def restrict(self, box, parameters=()):
+        # the sampled parameters are uniform so the curve can be restricted
+        # exactly if every coordinate is affine in at most one parameter.
+        # Parameters of the geometry or the sampling parameterization are
+        # replaced by their given ranges when sampling, so they are not
+        # restricted
+        fixed = {str(key) for key in parameters}
+        ranges = {
+            str(key): key
+            for key in self.parameterization.param_ranges.keys()
+            if str(key) not in fixed
+        }
+        restricted = {}
+        for d in self.dims:
+            func = sympy.sympify(self._functions[d])
+            low, high = box.get(d, (-np.inf, np.inf))
+            if not func.free_symbols:
+                if not _in_range(float(func), low, high):
+                    return None
+                continue
+            if len(func.free_symbols) > 1:
+                return self
+            (t,) = func.free_symbols
+            key = ranges.get(str(t))
+            slope = sympy.diff(func, t)
+            if (
+                key is None
+                or not isinstance(self.parameterization.param_ranges[key], tuple)
+                or not slope.is_number
+            ):
+                return self
+            t_range = restricted.get(
+                key, tuple(float(v) for v in self.parameterization.param_ranges[key])
+            )
+            offset = float(func.subs(t, 0))
+            t_low, t_high = sorted(
+                ((low - offset) / float(slope), (high - offset) / float(slope))
+            )
+            restricted[key] = (max(t_range[0], t_low), min(t_range[1], t_high))
+
+        # keep the fraction of the area in the restricted parameter ranges
+        parameterization = self.parameterization.copy()
+        fraction = 1.0
+        for key, (t_low, t_high) in restricted.items():
+            full_low, full_high = parameterization.param_ranges[key]
+            if t_high <= t_low:
+                return None
+            fraction *= (t_high - t_low) / (float(full_high) - float(full_low))
+            parameterization.param_ranges[key] = (t_low, t_high)
+        if fraction == 1.0:
+            return self
+        return SympyCurve(
+            self._functions, parameterization, self._area * fraction, self._criteria
+        )
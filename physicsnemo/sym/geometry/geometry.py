@@ -22,12 +22,21 @@ import copy
 import numpy as np
 import itertools
 import sympy
-from typing import Callable, Union, List
+import torch
+from typing import Callable, Dict, Union, List
 
 from physicsnemo.sym.constants import diff_str
-from .parameterization import Parameterization, Bounds
+from physicsnemo.sym.utils.sympy import np_lambdify
+from .parameterization import Parameterization, Parameter, Bounds, _sample_ranges
+from .sdf_grid import SDFGrid
 from .helper import (
+    _array_namespace,
     _concat_numpy_dict_list,
+    _criteria_box,
+    _group_rank,
+    _numpy_sdf,
+    _parameterization_key,
+    _sample_cdf,
     _sympy_criteria_to_criteria,
     _sympy_func_to_func,
 )
@@ -59,6 +68,12 @@ class Geometry:
         self.parameterization = parameterization
         self.interior_epsilon = interior_epsilon  # to check if in domain or outside
 
+        # curve areas of sample_boundary keyed on parameterization and criteria
+        self._curve_area_cache = {}
+        # curves restricted to the box of a criteria keyed on the box and
+        # parameterization
+        self._restricted_curve_cache = {}
+
     @property
     def dims(self):
         """
@@ -251,6 +266,7 @@ class Geometry:
                     computed_angle = angle
                 else:
                     computed_angle = angle(params)
+                xp = _array_namespace(computed_angle)
 
                 # rotate input to sdf function
                 rotated_invar = {**invar}
@@ -260,12 +276,12 @@ class Geometry:
                 _rotated_invar = {**rotated_invar}
                 rotated_dims = [key for key in dims if key != axis]
                 _rotated_invar[rotated_dims[0]] = (
-                    np.cos(computed_angle) * rotated_invar[rotated_dims[0]]
-                    + np.sin(computed_angle) * rotated_invar[rotated_dims[1]]
+                    xp.cos(computed_angle) * rotated_invar[rotated_dims[0]]
+                    + xp.sin(computed_angle) * rotated_invar[rotated_dims[1]]
                 )
                 _rotated_invar[rotated_dims[1]] = (
-                    -np.sin(computed_angle) * rotated_invar[rotated_dims[0]]
-                    + np.cos(computed_angle) * rotated_invar[rotated_dims[1]]
+                    -xp.sin(computed_angle) * rotated_invar[rotated_dims[0]]
+                    + xp.cos(computed_angle) * rotated_invar[rotated_dims[1]]
                 )
                 if center is not None:
                     for i, key in enumerate(dims):
@@ -344,8 +360,9 @@ class Geometry:
                     for i, key in enumerate(dims):
                         clamped_invar[key] = clamped_invar[key] - center[i]
                 for d, rl, rh in zip(dims, repeat_lower, repeat_higher):
-                    clamped_invar[d] = clamped_invar[d] - spacing * np.minimum(
-                        np.maximum(np.around(clamped_invar[d] / spacing), rl), rh
+                    xp = _array_namespace(clamped_invar[d])
+                    clamped_invar[d] = clamped_invar[d] - spacing * xp.clip(
+                        xp.around(clamped_invar[d] / spacing), rl, rh
                     )
                 if center is not None:
                     for i, key in enumerate(dims):
@@ -382,6 +399,49 @@ class Geometry:
             interior_epsilon=self.interior_epsilon,
         )
 
+    def cache_sdf(self, resolution: int = 128, band: float = 1.0):
+        """
+        Precomputes the sdf of the geometry on a regular grid covering its
+        bounds, see `SDFGrid`. The sdf is then interpolated from the grid
+        except close to the surface where the exact sdf is evaluated, which
+        speeds up interior sampling of geometries with expensive sdfs.
+
+        Parameters
+        ----------
+        resolution : int
+            Number of grid points along the longest side of the bounds.
+            Default is 128.
+        band : float
+            Width of the band around the surface in which the exact sdf is
+            evaluated, in cell diagonals. Default is 1.0.
+
+        Returns
+        -------
+        geometry : Geometry
+            Geometry with the same curves and bounds and the cached sdf.
+        """
+
+        if len(self.parameterization.parameters) > 0:
+            raise ValueError("Only geometries without parameterization can be cached")
+
+        # tensors are looked up on host copies of the grid
+        computed_bounds = self.bounds._compute_bounds()
+        sdf_grid = SDFGrid(
+            self.sdf,
+            self.dims,
+            {str(key): value for key, value in computed_bounds.items()},
+            resolution=resolution,
+            band=band,
+        )
+        return Geometry(
+            self.curves,
+            _numpy_sdf(sdf_grid),
+            len(self.dims),
+            self.bounds.copy(),
+            self.parameterization.copy(),
+            interior_epsilon=self.interior_epsilon,
+        )
+
     def copy(self):
         return copy.deepcopy(self)
 
@@ -404,7 +464,8 @@ class Geometry:
         sdf_normal_minus = self.sdf(
             invar_normal_minus, params, compute_sdf_derivatives=False
         )["sdf"]
-        on_boundary = np.greater_equal(0, sdf_normal_plus * sdf_normal_minus)
+        xp = _array_namespace(sdf_normal_plus)
+        on_boundary = xp.less_equal(sdf_normal_plus * sdf_normal_minus, 0)
 
         # check if points satisfy the criteria function
         if criteria is not None:
@@ -412,16 +473,66 @@ class Geometry:
             satify_criteria = criteria(invar, params)
 
             # update on_boundary
-            on_boundary = np.logical_and(on_boundary, satify_criteria)
+            on_boundary = xp.logical_and(on_boundary, satify_criteria)
 
         return on_boundary
 
+    def clear_area_cache(self):
+        """
+        Clears the curve areas cached by `sample_boundary`. Changes of the
+        parameterization ranges are detected automatically, this is only needed
+        if the curves are modified in place.
+        """
+        self._curve_area_cache = {}
+        self._restricted_curve_cache = {}
+
+    def _restricted_curves(self, criteria, parameterization):
+        # only sample the parts of the curves in the axis aligned box of the
+        # criteria, e.g. the `x = 0` faces for `Eq(x, 0)`. The ranges of the
+        # geometry and sampling parameters are not restricted
+        box = _criteria_box(criteria, self.dims)
+        if box is None:
+            return self.curves
+        key = (tuple(sorted(box.items())), _parameterization_key(parameterization))
+        if key not in self._restricted_curve_cache:
+            parameters = set(self.parameterization.parameters) | set(
+                parameterization.parameters
+            )
+            curves = [curve.restrict(box, parameters) for curve in self.curves]
+            self._restricted_curve_cache[key] = [c for c in curves if c is not None]
+        return self._restricted_curve_cache[key]
+
+    def _curve_areas(
+        self, curves, parameterization, criteria, closed_criteria, area_nr_points
+    ):
+        # criteria are keyed on the sympy expression or the callable itself
+        key = (
+            _parameterization_key(parameterization),
+            criteria,
+            area_nr_points,
+        )
+        if key not in self._curve_area_cache:
+            curve_areas = np.array(
+                [
+                    curve.approx_area(
+                        parameterization,
+                        criteria=closed_criteria,
+                        approx_nr=area_nr_points,
+                    )
+                    for curve in curves
+                ]
+            )
+            self._curve_area_cache[key] = (curve_areas, np.cumsum(curve_areas))
+        return self._curve_area_cache[key]
+
     def sample_boundary(
         self,
         nr_points: int,
         criteria: Union[sympy.Basic, None] = None,
         parameterization: Union[Parameterization, None] = None,
         quasirandom: bool = False,
+        area_nr_points: int = 10000,
+        device: Union[str, torch.device, None] = None,
     ):
         """
         Samples the surface or perimeter of the geometry.
@@ -439,6 +550,14 @@ class Geometry:
         quasirandom : bool
             If true then sample the points using the Halton sequences.
             Default is False.
+        area_nr_points : int
+            Number of points used to estimate the area of each curve. The
+            areas are computed once for every parameterization and criteria
+            and reused by later calls, see `clear_area_cache`.
+            Default is 10000.
+        device : Union[str, torch.device, None]
+            If given the points are sampled and returned as float64 tensors
+            on this device instead of NumPy arrays. Default is None.
 
         Returns
         -------
@@ -458,6 +577,7 @@ class Geometry:
         """
 
         # compile criteria from sympy if needed
+        uncompiled_criteria = criteria
         if criteria is not None:
             if isinstance(criteria, sympy.Basic):
                 criteria = _sympy_criteria_to_criteria(criteria)
@@ -484,33 +604,31 @@ class Geometry:
         closed_boundary_criteria = _boundary_criteria(criteria)
 
         # compute required points on each curve
-        curve_areas = np.array(
-            [
-                curve.approx_area(parameterization, criteria=closed_boundary_criteria)
-                for curve in self.curves
-            ]
-        )
-        assert np.sum(curve_areas) > 0, "Geometry has no surface"
-        curve_probabilities = curve_areas / np.linalg.norm(curve_areas, ord=1)
-        curve_index = np.arange(len(self.curves))
-        points_per_curve = np.random.choice(
-            curve_index, nr_points, p=curve_probabilities
+        curves = self._restricted_curves(uncompiled_criteria, parameterization)
+        curve_areas, curve_cdf = self._curve_areas(
+            curves,
+            parameterization,
+            uncompiled_criteria,
+            closed_boundary_criteria,
+            area_nr_points,
         )
-        points_per_curve, _ = np.histogram(
-            points_per_curve, np.arange(len(self.curves) + 1) - 0.5
+        assert len(curves) > 0 and curve_cdf[-1] > 0, "Geometry has no surface"
+        points_per_curve = np.bincount(
+            _sample_cdf(curve_cdf, nr_points), minlength=len(curves)
         )
 
         # continually sample each curve until reached desired number of points
         list_invar = []
         list_params = []
-        for n, a, curve in zip(points_per_curve, curve_areas, self.curves):
+        for n, a, curve in zip(points_per_curve, curve_areas, curves):
             if n > 0:
                 i, p = curve.sample(
                     n,
                     criteria=closed_boundary_criteria,
                     parameterization=parameterization,
+                    device=device,
                 )
-                i["area"] = np.full_like(i["area"], a / n)
+                i["area"] = _array_namespace(i["area"]).full_like(i["area"], a / n)
                 list_invar.append(i)
                 list_params.append(p)
         invar = _concat_numpy_dict_list(list_invar)
@@ -527,6 +645,7 @@ class Geometry:
         compute_sdf_derivatives: bool = False,
         quasirandom: bool = False,
         flip_interior: bool = False,
+        device: Union[str, torch.device, None] = None,
     ):
         """
         Samples the interior of the geometry.
@@ -552,6 +671,9 @@ class Geometry:
         flip_interior : bool
             If true, then instead of sampling inside the geometry, the
             points are sampled in the region defined between bounds and geometry.
+        device : Union[str, torch.device, None]
+            If given the points are sampled and returned as float64 tensors
+            on this device instead of NumPy arrays. Default is None.
 
         Returns
         -------
@@ -599,8 +721,13 @@ class Geometry:
         nr_try = 0
         while True:
             # sample invar and params
-            local_invar = bounds.sample(nr_points, parameterization, quasirandom)
-            local_params = parameterization.sample(nr_points, quasirandom)
+            local_invar = bounds.sample(
+                nr_points, parameterization, quasirandom, device=device
+            )
+            local_params = parameterization.sample(
+                nr_points, quasirandom, device=device
+            )
+            xp = _array_namespace(*local_invar.values())
 
             # evaluate SDF function on points
             local_invar.update(
@@ -613,11 +740,11 @@ class Geometry:
 
             # remove points inside/outside of domain
             if flip_interior:
-                criteria_index = np.less(local_invar["sdf"], 0)
+                criteria_index = xp.less(local_invar["sdf"], 0)
             else:
-                criteria_index = np.greater(local_invar["sdf"], 0)
+                criteria_index = xp.greater(local_invar["sdf"], 0)
             if criteria is not None:
-                criteria_index = np.logical_and(
+                criteria_index = xp.logical_and(
                     criteria_index, criteria(local_invar, local_params)
                 )
             for key in local_invar.keys():
@@ -630,12 +757,12 @@ class Geometry:
                 if key not in invar.keys():  # TODO this can be condensed
                     invar[key] = local_invar[key]
                 else:
-                    invar[key] = np.concatenate([invar[key], local_invar[key]], axis=0)
+                    invar[key] = xp.concatenate([invar[key], local_invar[key]], axis=0)
             for key in local_params.keys():
                 if key not in params.keys():  # TODO this can be condensed
                     params[key] = local_params[key]
                 else:
-                    params[key] = np.concatenate(
+                    params[key] = xp.concatenate(
                         [params[key], local_params[key]], axis=0
                     )
 
@@ -658,12 +785,282 @@ class Geometry:
 
         # compute area value for monte carlo integration
         volume = (total_sampled / total_tried) * bounds.volume(parameterization)
-        invar["area"] = np.full_like(next(iter(invar.values())), volume / nr_points)
+        invar["area"] = xp.full_like(
+            next(iter(invar.values())), float(volume / nr_points)
+        )
 
         # add params to invar
         invar.update(params)
         return invar
 
+    def _design_parameterization(self, designs, design_index):
+        # parameter ranges returning the values of the designs of the sampled
+        # points, the design index is passed along as a parameter
+        table = {}
+        for key, value in designs.items():
+            key = key if isinstance(key, Parameter) else Parameter(str(key))
+            table[key] = np.reshape(np.asarray(value, dtype=np.float64), (-1, 1))
+        nr_designs = {value.shape[0] for value in table.values()}
+        if len(nr_designs) != 1:
+            raise ValueError("All parameters of the designs need the same length")
+
+        def _column(values):
+            def column(nr_points):
+                assert nr_points == design_index[0].shape[0]
+                return values[design_index[0]]
+
+            return column
+
+        param_ranges = self.parameterization.copy().param_ranges
+        for key, value in table.items():
+            param_ranges[key] = _column(value)
+        param_ranges[Parameter("design_index")] = _column(
+            np.arange(nr_designs.pop())[:, None]
+        )
+        return Parameterization(param_ranges), table
+
+    def sample_boundary_designs(
+        self,
+        nr_points: int,
+        designs: Dict[Union[Parameter, str], np.ndarray],
+        criteria: Union[sympy.Basic, None] = None,
+        quasirandom: bool = False,
+        area_nr_points: int = 10000,
+    ):
+        """
+        Samples the surface or perimeter of the geometry for a table of
+        parameter values (designs) in one vectorized pass. The curves,
+        transformations and criteria are evaluated for all designs at once.
+
+        Parameters
+        ----------
+        nr_points : int
+            number of points to sample on the boundary of every design.
+        designs : Dict[Union[Parameter, str], np.ndarray]
+            Values of the parameters for every design, arrays of shape (K,)
+            or (K, 1). Parameters not in the designs are sampled from the
+            parameterization of the geometry.
+        criteria : Union[sympy.Basic, None]
+            Only sample points that satisfy this criteria.
+        quasirandom : bool
+            If true then sample the points using low-discrepancy sequences.
+            Default is False.
+        area_nr_points : int
+            Number of points used to estimate the area of each curve, for
+            every design. Default is 10000.
+
+        Returns
+        -------
+        points : Dict[str, np.ndarray]
+            Dictionary of `nr_points * K` points grouped by design, with the
+            parameters of the designs and an integer `design_index` column.
+            The `area` values of every design sum to its boundary area.
+        """
+
+        # compile criteria from sympy if needed
+        uncompiled_criteria = criteria
+        if isinstance(criteria, sympy.Basic):
+            criteria = _sympy_criteria_to_criteria(criteria)
+        design_index = [None]
+        parameterization, table = self._design_parameterization(designs, design_index)
+        nr_designs = next(iter(table.values())).shape[0]
+
+        def closed_boundary_criteria(invar, params):
+            return self.boundary_criteria(invar, criteria=criteria, params=params)
+
+        def sample_curve(curve, index):
+            # sample the curve for the given designs and remove points that
+            # don't satisfy the criteria. Curves with internal criteria resample
+            # and truncate, so the design of every point is read back from its
+            # parameters and the designs of all sampled points are returned
+            design_index[0] = index
+            invar, params = curve._sample(index.shape[0], parameterization, quasirandom)
+            if "design_index" in params:
+                index = params["design_index"][:, 0].astype(np.int64)
+            params.pop("design_index", None)
+            keep = closed_boundary_criteria(invar, params)[:, 0]
+            invar = {key: value[keep] for key, value in invar.items()}
+            params = {key: value[keep] for key, value in params.items()}
+            return invar, params, index[keep], index
+
+        # area of every curve for every design, shape (K, curves)
+        curves = self._restricted_curves(uncompiled_criteria, parameterization)
+        index = np.repeat(np.arange(nr_designs), area_nr_points)
+        curve_areas = np.zeros((nr_designs, len(curves)))
+        for c, curve in enumerate(curves):
+            # every point carries the area of its design divided by the number
+            # of requested points, the designs can have different numbers of
+            # sampled points
+            invar, _, i, sampled = sample_curve(curve, index)
+            nr_sampled = np.bincount(sampled, minlength=nr_designs)
+            curve_areas[:, c] = (
+                index.shape[0]
+                * np.bincount(i, weights=invar["area"][:, 0], minlength=nr_designs)
+                / np.maximum(nr_sampled, 1)
+            )
+        assert np.all(np.sum(curve_areas, axis=1) > 0), "Design has no surface"
+
+        # points of every design on every curve, shape (K, curves)
+        points_per_curve = np.stack(
+            [
+                np.bincount(
+                    _sample_cdf(np.cumsum(areas), nr_points), minlength=len(curves)
+                )
+                for areas in curve_areas
+            ]
+        )
+
+        # sample the missing points of all designs together
+        list_invar = []
+        for c, curve in enumerate(curves):
+            need = points_per_curve[:, c].copy()
+            nr_try = 0
+            while np.any(need > 0):
+                invar, params, i, _ = sample_curve(
+                    curve, np.repeat(np.arange(nr_designs), (2**nr_try) * need)
+                )
+                keep = _group_rank(i) < need[i]
+                invar = {key: value[keep] for key, value in invar.items()}
+                invar.update({key: value[keep] for key, value in params.items()})
+                i = i[keep]
+                invar["area"] = (curve_areas[i, c] / points_per_curve[i, c])[:, None]
+                invar["design_index"] = i[:, None]
+                list_invar.append(invar)
+                need -= np.bincount(i, minlength=nr_designs)
+                nr_try = min(nr_try + 1, 10)
+
+        # group the points by design
+        invar = _concat_numpy_dict_list(list_invar)
+        order = np.argsort(invar["design_index"][:, 0], kind="stable")
+        return {key: value[order] for key, value in invar.items()}
+
+    def sample_interior_designs(
+        self,
+        nr_points: int,
+        designs: Dict[Union[Parameter, str], np.ndarray],
+        criteria: Union[sympy.Basic, None] = None,
+        compute_sdf_derivatives: bool = False,
+        quasirandom: bool = False,
+    ):
+        """
+        Samples the interior of the geometry for a table of parameter values
+        (designs) in one vectorized pass. The bounds of every design are
+        computed once and the sdf is evaluated for all designs at once.
+
+        Parameters
+        ----------
+        nr_points : int
+            number of points to sample in the interior of every design.
+        designs : Dict[Union[Parameter, str], np.ndarray]
+            Values of the parameters for every design, arrays of shape (K,)
+            or (K, 1). Parameters not in the designs are sampled from the
+            parameterization of the geometry.
+        criteria : Union[sympy.Basic, None]
+            Only sample points that satisfy this criteria.
+        compute_sdf_derivatives : bool
+            Compute sdf derivatives if true.
+        quasirandom : bool
+            If true then sample the points using low-discrepancy sequences.
+            Default is False.
+
+        Returns
+        -------
+        points : Dict[str, np.ndarray]
+            Dictionary of `nr_points * K` points grouped by design, with the
+            parameters of the designs and an integer `design_index` column.
+            The `area` values of every design sum to its volume.
+        """
+
+        # compile criteria from sympy if needed
+        if isinstance(criteria, sympy.Basic):
+            criteria = _sympy_criteria_to_criteria(criteria)
+        design_index = [None]
+        parameterization, table = self._design_parameterization(designs, design_index)
+        nr_designs = next(iter(table.values())).shape[0]
+
+        # bounds of every design, shape (K, dims)
+        design_values = {str(key): value for key, value in table.items()}
+        global_bounds = self.bounds._compute_bounds(self.parameterization)
+        low = np.zeros((nr_designs, len(self.dims)))
+        high = np.zeros((nr_designs, len(self.dims)))
+        for i, key in enumerate(self.bounds.bound_ranges.keys()):
+            for j, (bound, array) in enumerate(
+                zip(self.bounds.bound_ranges[key], [low, high])
+            ):
+                if isinstance(bound, sympy.Basic) and {
+                    str(s) for s in bound.free_symbols
+                } <= set(design_values):
+                    array[:, i] = np_lambdify(bound, design_values)(**design_values)[
+                        :, 0
+                    ]
+                else:
+                    array[:, i] = float(global_bounds[key][j])
+        volume = np.prod(high - low, axis=1)
+
+        # continually sample the designs that are missing points
+        need = np.full(nr_designs, nr_points)
+        tried = np.zeros(nr_designs)
+        sampled = np.zeros(nr_designs)
+        list_invar = []
+        nr_try = 0
+        while np.any(need > 0):
+            # more points for designs with a low acceptance rate
+            rate = np.where(tried > 0, sampled / np.maximum(tried, 1), 1.0)
+            batch = np.ceil(need / np.maximum(rate, 0.01)).astype(np.int64)
+            index = np.repeat(np.arange(nr_designs), np.where(need > 0, batch, 0))
+            design_index[0] = index
+
+            # sample points in the bounds of their design
+            unit = _sample_ranges(
+                index.shape[0], {d: (0.0, 1.0) for d in self.dims}, quasirandom
+            )
+            invar = {
+                d: low[index, i : i + 1] + unit[d] * (high - low)[index, i : i + 1]
+                for i, d in enumerate(self.dims)
+            }
+            params = {
+                str(key): value
+                for key, value in parameterization.sample(
+                    index.shape[0], quasirandom
+                ).items()
+            }
+            params.pop("design_index")
+            invar.update(self.sdf(invar, params, compute_sdf_derivatives))
+
+            # remove points outside of the domain
+            inside = np.greater(invar["sdf"], 0)
+            if criteria is not None:
+                inside = np.logical_and(inside, criteria(invar, params))
+            inside = inside[:, 0]
+            tried += np.bincount(index, minlength=nr_designs)
+            sampled += np.bincount(index[inside], minlength=nr_designs)
+
+            # keep the missing number of points of every design
+            keep = inside.copy()
+            keep[inside] = _group_rank(index[inside]) < need[index[inside]]
+            invar = {key: value[keep] for key, value in invar.items()}
+            invar.update({key: value[keep] for key, value in params.items()})
+            invar["design_index"] = index[keep][:, None]
+            list_invar.append(invar)
+            need -= np.bincount(index[keep], minlength=nr_designs)
+
+            # report error if could not sample
+            nr_try += 1
+            if nr_try > 100 and np.any(sampled < 1):
+                raise RuntimeError(
+                    "Could not sample interior of designs "
+                    + str(np.flatnonzero(sampled < 1))
+                    + ". Check to make sure non-zero volume"
+                )
+
+        # group the points by design, areas for monte carlo integration
+        invar = _concat_numpy_dict_list(list_invar)
+        order = np.argsort(invar["design_index"][:, 0], kind="stable")
+        invar = {key: value[order] for key, value in invar.items()}
+        design_volume = volume * sampled / tried
+        invar["area"] = design_volume[invar["design_index"]] / nr_points
+        return invar
+
     @staticmethod
     def _convert_criteria(criteria):
         return criteria
@@ -674,12 +1071,13 @@ class Geometry:
                 computed_sdf_1 = sdf_1(invar, params, compute_sdf_derivatives)
                 computed_sdf_2 = sdf_2(invar, params, compute_sdf_derivatives)
                 computed_sdf = {}
-                computed_sdf["sdf"] = np.maximum(
+                xp = _array_namespace(computed_sdf_1["sdf"])
+                computed_sdf["sdf"] = xp.maximum(
                     computed_sdf_1["sdf"], computed_sdf_2["sdf"]
                 )
                 if compute_sdf_derivatives:
                     for d in dims:
-                        computed_sdf["sdf" + diff_str + d] = np.where(
+                        computed_sdf["sdf" + diff_str + d] = xp.where(
                             computed_sdf_1["sdf"] > computed_sdf_2["sdf"],
                             computed_sdf_1["sdf" + diff_str + d],
                             computed_sdf_2["sdf" + diff_str + d],
@@ -707,12 +1105,13 @@ class Geometry:
                 computed_sdf_1 = sdf_1(invar, params, compute_sdf_derivatives)
                 computed_sdf_2 = sdf_2(invar, params, compute_sdf_derivatives)
                 computed_sdf = {}
-                computed_sdf["sdf"] = np.minimum(
+                xp = _array_namespace(computed_sdf_1["sdf"])
+                computed_sdf["sdf"] = xp.minimum(
                     computed_sdf_1["sdf"], -computed_sdf_2["sdf"]
                 )
                 if compute_sdf_derivatives:
                     for d in dims:
-                        computed_sdf["sdf" + diff_str + d] = np.where(
+                        computed_sdf["sdf" + diff_str + d] = xp.where(
                             computed_sdf_1["sdf"] < -computed_sdf_2["sdf"],
                             computed_sdf_1["sdf" + diff_str + d],
                             -computed_sdf_2["sdf" + diff_str + d],
@@ -769,12 +1168,13 @@ class Geometry:
                 computed_sdf_1 = sdf_1(invar, params, compute_sdf_derivatives)
                 computed_sdf_2 = sdf_2(invar, params, compute_sdf_derivatives)
                 computed_sdf = {}
-                computed_sdf["sdf"] = np.minimum(
+                xp = _array_namespace(computed_sdf_1["sdf"])
+                computed_sdf["sdf"] = xp.minimum(
                     computed_sdf_1["sdf"], computed_sdf_2["sdf"]
                 )
                 if compute_sdf_derivatives:
                     for d in dims:
-                        computed_sdf["sdf" + diff_str + d] = np.where(
+                        computed_sdf["sdf" + diff_str + d] = xp.where(
                             computed_sdf_1["sdf"] < computed_sdf_2["sdf"],
                             computed_sdf_1["sdf" + diff_str + d],
                             computed_sdf_2["sdf" + diff_str + d],
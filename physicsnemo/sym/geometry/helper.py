@@ -16,21 +16,262 @@
 
 import numpy as np
 import itertools
+import types
+import sympy
+import torch
 
 from physicsnemo.sym.utils.sympy import np_lambdify
 from physicsnemo.sym.constants import diff_str
 
 
+class _TorchNamespace:
+    # NumPy named functions for torch tensors, everything else is torch
+    def __getattr__(self, name):
+        return getattr(torch, name)
+
+    @staticmethod
+    def concatenate(tensors, axis=0):
+        return torch.cat(tensors, dim=axis)
+
+    @staticmethod
+    def around(x):
+        return torch.round(x)
+
+
+_torch_namespace = _TorchNamespace()
+
+
+def _array_namespace(*arrays):
+    # torch if any of the arrays is a tensor, numpy otherwise
+    for array in arrays:
+        if isinstance(array, torch.Tensor):
+            return _torch_namespace
+    return np
+
+
+def _empty_samples(device=None):
+    # empty (0, 1) array to concatenate samples to
+    if device is None:
+        return np.empty((0, 1))
+    return torch.empty((0, 1), dtype=torch.float64, device=device)
+
+
+def _maximum_torch(x, y):
+    if not isinstance(x, torch.Tensor):
+        x, y = y, x
+    if not isinstance(x, torch.Tensor):
+        return max(x, y)
+    if not isinstance(y, torch.Tensor):
+        return torch.clamp(x, min=y)
+    return torch.maximum(x, y)
+
+
+def _minimum_torch(x, y):
+    if not isinstance(x, torch.Tensor):
+        x, y = y, x
+    if not isinstance(x, torch.Tensor):
+        return min(x, y)
+    if not isinstance(y, torch.Tensor):
+        return torch.clamp(x, max=y)
+    return torch.minimum(x, y)
+
+
+def _heaviside_torch(x, values=0):
+    # same as the numpy printer, 0 at x = 0
+    return (x > 0).to(x.dtype)
+
+
+def _equal_torch(x, y):
+    return torch.isclose(x, torch.as_tensor(y, dtype=x.dtype, device=x.device))
+
+
+# exact (not smoothed) functions, geometry is not differentiated through
+_TORCH_GEOMETRY_PRINTER = {
+    "max": _maximum_torch,
+    "min": _minimum_torch,
+    "heaviside": _heaviside_torch,
+    "eq": _equal_torch,
+}
+_TORCH_LAMBDA_STORE = {}
+
+
+def _evalf(f):
+    # evaluate constant sub expressions, torch functions need tensor inputs.
+    # Boolean expressions (And, Or, ...) have no evalf, their arguments are
+    # evaluated instead
+    if isinstance(f, sympy.Expr):
+        return f.evalf()
+    if isinstance(f, sympy.Basic) and f.args:
+        return f.func(*[_evalf(arg) for arg in f.args])
+    return f
+
+
+def _torch_lambdify(f, r):
+    # torch function of keyword arguments `r` from a sympy expression
+    key = (f, tuple(r))
+    if key not in _TORCH_LAMBDA_STORE:
+        symbols = [sympy.Symbol(k) for k in r]
+        expr = _evalf(f)
+        fn = sympy.lambdify(symbols, expr, [_TORCH_GEOMETRY_PRINTER, "torch"])
+
+        def torch_f(**x):
+            value = fn(*[x[k] for k in r])
+            if not isinstance(value, torch.Tensor):
+                # constant expression
+                like = next(iter(x.values()))
+                value = torch.full_like(
+                    like, value, dtype=torch.bool if isinstance(value, bool) else None
+                )
+            return value
+
+        _TORCH_LAMBDA_STORE[key] = torch_f
+    return _TORCH_LAMBDA_STORE[key]
+
+
+def _lambdify(f, r):
+    # numpy function that evaluates with torch if the inputs are tensors
+    np_f = np_lambdify(f, r)
+
+    def _f(**x):
+        if _array_namespace(*x.values()) is np:
+            return np_f(**x)
+        if isinstance(f, types.FunctionType):
+            # user given NumPy function, evaluated on host copies
+            like = next(iter(x.values()))
+            return torch.as_tensor(
+                np_f(**_to_numpy(x)), dtype=like.dtype, device=like.device
+            )
+        return _torch_lambdify(f, r)(**x)
+
+    return _f
+
+
+def _to_numpy(array_dict):
+    return {
+        key: value.cpu().numpy() if isinstance(value, torch.Tensor) else value
+        for key, value in array_dict.items()
+    }
+
+
+def _numpy_sdf(sdf):
+    # evaluates a NumPy only sdf function on tensors by converting them
+    def torch_sdf(invar, params, compute_sdf_derivatives=False):
+        value = next(iter(invar.values()))
+        if not isinstance(value, torch.Tensor):
+            return sdf(invar, params, compute_sdf_derivatives)
+        outputs = sdf(_to_numpy(invar), _to_numpy(params), compute_sdf_derivatives)
+        return {
+            key: torch.as_tensor(output, dtype=value.dtype, device=value.device)
+            for key, output in outputs.items()
+        }
+
+    return torch_sdf
+
+
+def _numpy_sample(sample):
+    # samples a NumPy only curve and moves the points to the requested device
+    def torch_sample(nr_points, parameterization, quasirandom=False, device=None):
+        invar, params = sample(nr_points, parameterization, quasirandom)
+        if device is None:
+            return invar, params
+        return (
+            {
+                key: torch.as_tensor(value, dtype=torch.float64, device=device)
+                for key, value in invar.items()
+            },
+            {
+                key: torch.as_tensor(value, dtype=torch.float64, device=device)
+                for key, value in params.items()
+            },
+        )
+
+    return torch_sample
+
+
 def _concat_numpy_dict_list(numpy_dict_list):
     concat_variable = {}
     for key in numpy_dict_list[0].keys():
-        concat_variable[key] = np.concatenate([x[key] for x in numpy_dict_list], axis=0)
+        arrays = [x[key] for x in numpy_dict_list]
+        concat_variable[key] = _array_namespace(*arrays).concatenate(arrays, axis=0)
     return concat_variable
 
 
+def _sample_cdf(cdf, nr_points):
+    # sorted indices drawn with probabilities given by a cumulative area table
+    u = np.sort(np.random.uniform(0, cdf[-1], size=nr_points))
+    index = np.searchsorted(cdf, u, side="right")
+    return np.minimum(index, cdf.shape[0] - 1)
+
+
+def _parameterization_key(parameterization):
+    # hashable key of the parameter ranges, the repr of large arrays is
+    # abbreviated by NumPy so discrete ranges are keyed on their bytes
+    def range_key(value):
+        if isinstance(value, np.ndarray):
+            return (value.shape, value.dtype.str, value.tobytes())
+        return repr(value)
+
+    return tuple(
+        sorted(
+            (str(param), range_key(value))
+            for param, value in parameterization.param_ranges.items()
+        )
+    )
+
+
+def _criteria_box(criteria, dims):
+    # axis aligned box {dim: (low, high)} implied by the top level conjuncts
+    # of a sympy criteria, e.g. `And(Eq(x, 0), y > 1)`. Other conjuncts are
+    # ignored so points in the box still need to be checked with the criteria.
+    if not isinstance(criteria, sympy.Basic):
+        return None
+    conjuncts = criteria.args if isinstance(criteria, sympy.And) else (criteria,)
+    box = {}
+    for conjunct in conjuncts:
+        if not isinstance(conjunct, sympy.core.relational.Relational) or isinstance(
+            conjunct, sympy.Unequality
+        ):
+            continue
+        lhs, rhs = conjunct.lhs, conjunct.rhs
+        if isinstance(conjunct, sympy.Equality):
+            op = "=="
+        else:
+            op = ">" if isinstance(conjunct, (sympy.Gt, sympy.Ge)) else "<"
+        if rhs.is_Symbol and lhs.is_number:
+            lhs, rhs = rhs, lhs
+            op = {"==": "==", ">": "<", "<": ">"}[op]
+        if not (lhs.is_Symbol and str(lhs) in dims and rhs.is_number):
+            continue
+        value = float(rhs)
+        low, high = box.get(str(lhs), (-np.inf, np.inf))
+        if op in ("==", ">"):
+            low = max(low, value)
+        if op in ("==", "<"):
+            high = min(high, value)
+        box[str(lhs)] = (low, high)
+    return box if box else None
+
+
+def _in_range(value, low, high):
+    # inclusive range check with the tolerance of `np.isclose`
+    tol = 1e-8 + 1e-5 * np.abs(value)
+    return np.logical_and(value >= low - tol, value <= high + tol)
+
+
+def _group_rank(group):
+    # position of every element among the elements of the same group
+    order = np.argsort(group, kind="stable")
+    sorted_group = group[order]
+    rank = np.empty_like(order)
+    rank[order] = np.arange(group.shape[0]) - np.searchsorted(
+        sorted_group, sorted_group, side="left"
+    )
+    return rank
+
+
 def _sympy_sdf_to_sdf(sdf, dx=0.0001):
     sdf_inputs = list(set([str(x) for x in sdf.free_symbols]))
-    fn_sdf = np_lambdify(sdf, sdf_inputs)
+    fn_sdf = _lambdify(sdf, sdf_inputs)
 
     def _sdf(fn_sdf, sdf_inputs, dx):
         def sdf(invar, params, compute_sdf_derivatives=False):
@@ -65,7 +306,9 @@ def _sympy_sdf_to_sdf(sdf, dx=0.0001):
                         ) / dx
                     else:
                         # Fill deriv with zeros for compatibility
-                        outputs["sdf" + diff_str + d] = np.zeros_like(computed_sdf)
+                        outputs["sdf" + diff_str + d] = _array_namespace(
+                            computed_sdf
+                        ).zeros_like(computed_sdf)
 
             return outputs
 
@@ -76,7 +319,7 @@ def _sympy_sdf_to_sdf(sdf, dx=0.0001):
 
 def _sympy_criteria_to_criteria(criteria):
     criteria_inputs = list(set([str(x) for x in criteria.free_symbols]))
-    fn_criteria = np_lambdify(criteria, criteria_inputs)
+    fn_criteria = _lambdify(criteria, criteria_inputs)
 
     def _criteria(fn_criteria, criteria_inputs):
         def criteria(invar, params):
@@ -98,7 +341,7 @@ def _sympy_func_to_func(func):
     func_inputs = list(
         set([str(x) for x in func.free_symbols])
     )  # TODO set conversion is hacky fix
-    fn_func = np_lambdify(func, func_inputs)
+    fn_func = _lambdify(func, func_inputs)
 
     def _func(fn_func, func_inputs):
         def func(params):
@@ -0,0 +1,142 @@
+# SPDX-FileCopyrightText: Copyright (c) 2023 - 2024 NVIDIA CORPORATION & AFFILIATES.
+# SPDX-FileCopyrightText: All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Parallel sampling of geometries across CPU cores
+"""
+
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, Union
+
+import numpy as np
+
+from .helper import _concat_numpy_dict_list
+from .quasirandom import (
+    QuasiRandomStream,
+    get_quasirandom_stream,
+    set_quasirandom_stream,
+)
+
+logger = logging.getLogger(__name__)
+
+# sample function of the worker processes, inherited by fork
+_worker_sample_fn = None
+
+
+def _init_worker(sample_fn):
+    global _worker_sample_fn
+    _worker_sample_fn = sample_fn
+
+
+def _sample_chunk(nr_points, seed_sequence, method, scramble, sample_fn=None):
+    # independent random and quasirandom streams for every chunk
+    np.random.seed(seed_sequence.generate_state(4))
+    set_quasirandom_stream(
+        QuasiRandomStream(
+            method, scramble=scramble, seed=int(seed_sequence.generate_state(1)[0])
+        )
+    )
+    if sample_fn is None:
+        sample_fn = _worker_sample_fn
+    return sample_fn(nr_points)
+
+
+def sample_parallel(
+    sample_fn: Callable[[int], Dict[str, np.ndarray]],
+    nr_points: int,
+    num_workers: int,
+    chunk_size: int = 2**18,
+    seed: Union[int, None] = None,
+) -> Dict[str, np.ndarray]:
+    """
+    Samples points in chunks on a pool of worker processes.
+
+    Every chunk is sampled with its own random and quasirandom streams
+    spawned from `seed` and the chunks are concatenated in order, so the
+    result only depends on `seed` and `chunk_size` and not on the number of
+    workers. The `area` of every chunk is rescaled to the total number of
+    points.
+
+    The workers are forked and inherit the sample function, so closures and
+    geometries do not need to be picklable. If fork is not available the
+    chunks are sampled in the calling process.
+
+    Parameters
+    ----------
+    sample_fn : Callable[[int], Dict[str, np.ndarray]]
+        Function sampling the given number of points, for example
+        `functools.partial(geometry.sample_interior, criteria=criteria)`.
+    nr_points : int
+        Total number of points.
+    num_workers : int
+        Number of worker processes, if less than 2 the chunks are sampled in
+        the calling process.
+    chunk_size : int
+        Number of points sampled per chunk. Default is 2**18.
+    seed : Union[int, None]
+        Seed of the chunk streams. By default it is drawn from `np.random`.
+
+    Returns
+    -------
+    points : Dict[str, np.ndarray]
+        Concatenated points of all chunks.
+    """
+    assert chunk_size > 0, "chunk_size must be positive"
+    if seed is None:
+        seed = int(np.random.randint(2**31))
+    chunk_sizes = [
+        min(chunk_size, nr_points - start) for start in range(0, nr_points, chunk_size)
+    ]
+    seed_sequences = np.random.SeedSequence(seed).spawn(len(chunk_sizes))
+    stream = get_quasirandom_stream()
+    args = (
+        chunk_sizes,
+        seed_sequences,
+        [stream.method] * len(chunk_sizes),
+        [stream.scramble] * len(chunk_sizes),
+    )
+
+    if num_workers > 1 and "fork" not in multiprocessing.get_all_start_methods():
+        logger.warning("fork is not available, sampling in the calling process")
+        num_workers = 0
+
+    if num_workers > 1:
+        with ProcessPoolExecutor(
+            max_workers=min(num_workers, len(chunk_sizes)),
+            mp_context=multiprocessing.get_context("fork"),
+            initializer=_init_worker,
+            initargs=(sample_fn,),
+        ) as executor:
+            chunks = list(executor.map(_sample_chunk, *args))
+    else:
+        # keep the global random state of the calling process
+        random_state = np.random.get_state()
+        try:
+            chunks = [
+                _sample_chunk(*chunk_args, sample_fn=sample_fn)
+                for chunk_args in zip(*args)
+            ]
+        finally:
+            np.random.set_state(random_state)
+            set_quasirandom_stream(stream)
+
+    # area of the chunks is relative to the chunk size
+    for chunk, chunk_points in zip(chunks, chunk_sizes):
+        if "area" in chunk:
+            chunk["area"] = chunk["area"] * (chunk_points / nr_points)
+    return _concat_numpy_dict_list(chunks)
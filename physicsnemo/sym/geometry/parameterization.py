@@ -18,12 +18,10 @@ import itertools
 import numpy as np
 from typing import Dict, Union, Tuple, Callable, Optional
 import sympy
-from chaospy.distributions.sampler.sequences.primes import create_primes
-from chaospy.distributions.sampler.sequences.van_der_corput import (
-    create_van_der_corput_samples as create_samples,
-)
+import torch
 
 from physicsnemo.sym.utils.sympy import np_lambdify
+from .quasirandom import QuasiRandomStream, get_quasirandom_stream
 
 
 class Parameter(sympy.Symbol):
@@ -70,22 +68,31 @@ class Parameterization:
     def parameters(self):
         return [str(x) for x in self.param_ranges.keys()]
 
-    def sample(self, nr_points: int, quasirandom: bool = False):
+    def sample(
+        self,
+        nr_points: int,
+        quasirandom: bool = False,
+        device: Union[str, torch.device, None] = None,
+    ):
         """Sample parameterization values.
 
         Parameters
         ----------
         nr_points : int
             Number of points sampled from parameterization.
-        quasirandom : bool
-            If true then sample the points using Halton sequences.
-            Default is False.
+        quasirandom : bool or QuasiRandomStream
+            If true then sample the points using low-discrepancy sequences
+            that continue across calls, see `set_quasirandom_stream`. A
+            `QuasiRandomStream` can also be given. Default is False.
+        device : Union[str, torch.device, None]
+            If given the values are sampled as float64 tensors on this device
+            instead of NumPy arrays. Default is None.
         """
 
         return {
             str(key): value
             for key, value in _sample_ranges(
-                nr_points, self.param_ranges, quasirandom
+                nr_points, self.param_ranges, quasirandom, device
             ).items()
         }
 
@@ -133,7 +140,11 @@ class OrderedParameterization(Parameterization):
         self.key = key
 
     def sample(
-        self, nr_points: int, quasirandom: bool = False, sort: Optional = "ascending"
+        self,
+        nr_points: int,
+        quasirandom: bool = False,
+        sort: Optional = "ascending",
+        device: Union[str, torch.device, None] = None,
     ):
         """Sample ordered parameterization values.
 
@@ -141,25 +152,29 @@ class OrderedParameterization(Parameterization):
         ----------
         nr_points : int
             Number of points sampled from parameterization.
-        quasirandom : bool
-            If true then sample the points using Halton sequences.
-            Default is False.
+        quasirandom : bool or QuasiRandomStream
+            If true then sample the points using low-discrepancy sequences
+            that continue across calls, see `set_quasirandom_stream`. A
+            `QuasiRandomStream` can also be given. Default is False.
         sort : None or {'ascending','descending'}
             If 'ascending' then sample the sorted points in ascending order.
             If 'descending' then sample the sorted points in descending order.
             Default is 'ascending'.
+        device : Union[str, torch.device, None]
+            If given the values are sampled as float64 tensors on this device
+            instead of NumPy arrays. Default is None.
         """
 
         sample_dict = {}
         for key, value in _sample_ranges(
-            nr_points, self.param_ranges, quasirandom
+            nr_points, self.param_ranges, quasirandom, device
         ).items():
             # sort the samples for the given key
             if key == self.key:
                 if sort == "ascending":
-                    value = np.sort(value, axis=0)
+                    value = _sort(value)
                 elif sort == "descending":
-                    value = np.sort(value, axis=0)[::-1]
+                    value = _sort(value, descending=True)
                 else:
                     raise ValueError(
                         "Sort must be one of None, 'ascending', or 'descending' (got {})".format(
@@ -212,6 +227,7 @@ class Bounds:
         nr_points: int,
         parameterization: Union[None, Parameterization] = None,
         quasirandom: bool = False,
+        device: Union[str, torch.device, None] = None,
     ):
         """Sample points in Bounds.
 
@@ -221,9 +237,13 @@ class Bounds:
             Number of points sampled from parameterization.
         parameterization : Parameterization
             Given if sampling bounds with different parameterization then the internal one stored in Bounds. Default is to not use this.
-        quasirandom : bool
-            If true then sample the points using Halton sequences.
-            Default is False.
+        quasirandom : bool or QuasiRandomStream
+            If true then sample the points using low-discrepancy sequences
+            that continue across calls, see `set_quasirandom_stream`. A
+            `QuasiRandomStream` can also be given. Default is False.
+        device : Union[str, torch.device, None]
+            If given the points are sampled as float64 tensors on this device
+            instead of NumPy arrays. Default is None.
         """
 
         if parameterization is not None:
@@ -232,7 +252,7 @@ class Bounds:
         return {
             str(key): value
             for key, value in _sample_ranges(
-                nr_points, computed_bound_ranges, quasirandom
+                nr_points, computed_bound_ranges, quasirandom, device
             ).items()
         }
 
@@ -397,33 +417,59 @@ class Bounds:
         )
 
 
-def _sample_ranges(batch_size, ranges, quasirandom=False):
+def _sort(value, descending=False):
+    if isinstance(value, torch.Tensor):
+        return torch.sort(value, dim=0, descending=descending)[0]
+    value = np.sort(value, axis=0)
+    return value[::-1] if descending else value
+
+
+def _sample_ranges(batch_size, ranges, quasirandom=False, device=None):
     parameterization = {}
     if quasirandom:
-        prime_index = 0
-        primes = create_primes(1000)
+        # one point of the sequence per batch element, one dimension per range
+        stream = (
+            quasirandom
+            if isinstance(quasirandom, QuasiRandomStream)
+            else get_quasirandom_stream()
+        )
+        dims = sum(isinstance(value, tuple) for value in ranges.values())
+        quasirandom_samples = stream.sample(batch_size, dims)
+        if device is not None:
+            quasirandom_samples = torch.as_tensor(quasirandom_samples, device=device)
+        dim = 0
     for key, value in ranges.items():
         # sample parameter
         if isinstance(value, tuple):
             if quasirandom:
-                indices = [idx for idx in range(batch_size)]
-                rand_param = (
-                    value[0]
-                    + (value[1] - value[0])
-                    * create_samples(indices, number_base=primes[prime_index]).reshape(
-                        -1, 1
-                    )
-                ).astype(float)
-                prime_index += 1
+                low, high = float(value[0]), float(value[1])
+                rand_param = low + (high - low) * quasirandom_samples[:, dim : dim + 1]
+                dim += 1
+            elif device is not None:
+                low, high = float(value[0]), float(value[1])
+                rand_param = low + (high - low) * torch.rand(
+                    (batch_size, 1), dtype=torch.float64, device=device
+                )
             else:
                 rand_param = np.random.uniform(value[0], value[1], size=(batch_size, 1))
         elif isinstance(value, (float, int)):
-            rand_param = np.zeros((batch_size, 1)) + value
+            if device is not None:
+                rand_param = torch.full(
+                    (batch_size, 1), float(value), dtype=torch.float64, device=device
+                )
+            else:
+                rand_param = np.zeros((batch_size, 1)) + value
         elif isinstance(value, np.ndarray):
-            np_index = np.random.choice(value.shape[0], batch_size)
-            rand_param = value[np_index, :]
+            if device is not None:
+                index = torch.randint(value.shape[0], (batch_size,), device=device)
+                rand_param = torch.as_tensor(value, device=device)[index, :]
+            else:
+                np_index = np.random.choice(value.shape[0], batch_size)
+                rand_param = value[np_index, :]
         elif isinstance(value, Callable):
             rand_param = value(batch_size)
+            if device is not None:
+                rand_param = torch.as_tensor(rand_param, device=device)
         else:
             raise ValueError(
                 "range type: "
@@ -37,7 +37,13 @@ from sympy import (
 from sympy.vector import CoordSys3D
 import numpy as np
 from .geometry import Geometry, csg_curve_naming
-from .helper import _sympy_sdf_to_sdf
+from .helper import (
+    _in_range,
+    _numpy_sample,
+    _numpy_sdf,
+    _sample_cdf,
+    _sympy_sdf_to_sdf,
+)
 from .curve import SympyCurve, Curve
 from .parameterization import Parameterization, Parameter, Bounds
 from ..constants import diff_str
@@ -384,261 +390,85 @@ class VectorizedBoxes(Geometry):
         )
         side = box_bounds[:, :, 1] - box_bounds[:, :, 0]
 
-        # create curves
-        def _sample(box_bounds, box_centers, side):
-            def sample(nr_points, parameterization, quasirandom):
-                # area of all faces
-                face_area = np.concatenate(
-                    2
-                    * [
-                        side[:, 0] * side[:, 1],
-                        side[:, 0] * side[:, 2],
-                        side[:, 1] * side[:, 2],
-                    ]
-                )  # [6 * nr_boxes]
-
-                # calculate number or points per face
-                face_probabilities = face_area / np.linalg.norm(face_area, ord=1)
-                face_index = np.arange(face_area.shape[0])
-                points_per_face = np.random.choice(
-                    face_index, nr_points, p=face_probabilities
-                )
-                points_per_face, _ = np.histogram(
-                    points_per_face, np.arange(face_area.shape[0] + 1) - 0.5
-                )
-
-                # generate random values to use when sampling faces
-                s_1 = 2.0 * (np.random.rand(nr_points) - 0.5)
-                s_2 = 2.0 * (np.random.rand(nr_points) - 0.5)
+        # faces as flat boxes, face types are +z, +y, +x, -z, -y, -x
+        nr_boxes = box_bounds.shape[0]
+        faces = np.arange(6 * nr_boxes)
+        normal_axis = np.repeat([2, 1, 0, 2, 1, 0], nr_boxes)
+        normal_sign = np.repeat([1.0, 1.0, 1.0, -1.0, -1.0, -1.0], nr_boxes)
+        face_low = np.tile(box_bounds[:, :, 0], (6, 1))
+        face_high = np.tile(box_bounds[:, :, 1], (6, 1))
+        face_plane = np.where(
+            normal_sign > 0, face_high[faces, normal_axis], face_low[faces, normal_axis]
+        )
+        face_low[faces, normal_axis] = face_plane
+        face_high[faces, normal_axis] = face_plane
 
-                # repeat side and center for each point
-                repeat_side = np.repeat(
-                    np.concatenate(6 * [side], axis=0), points_per_face, axis=0
-                )
-                repeat_centers = np.repeat(
-                    np.concatenate(6 * [box_centers], axis=0), points_per_face, axis=0
-                )
-                repeat_face_area = np.repeat(
-                    face_area / points_per_face, points_per_face, axis=0
-                )
+        # create curves
+        def _face_curve(face_low, face_high, normal_axis, normal_sign):
+            # area of all faces and their cumulative sum to select faces
+            rows = np.arange(face_low.shape[0])
+            extent = face_high - face_low
+            extent[rows, normal_axis] = 1.0
+            face_area = np.prod(extent, axis=1)
+            face_cdf = np.cumsum(face_area)
 
-                # sample face 1
-                nr_face_1 = np.sum(points_per_face[0 : box_bounds.shape[0]])
-                face_1_x = (
-                    repeat_centers[:nr_face_1, 0]
-                    + 0.5 * s_1[:nr_face_1] * repeat_side[:nr_face_1, 0]
-                )
-                face_1_y = (
-                    repeat_centers[:nr_face_1, 1]
-                    + 0.5 * s_2[:nr_face_1] * repeat_side[:nr_face_1, 1]
-                )
-                face_1_z = (
-                    repeat_centers[:nr_face_1, 2] + 0.5 * repeat_side[:nr_face_1, 2]
-                )
-                face_1_normal_x = np.zeros_like(face_1_x)
-                face_1_normal_y = np.zeros_like(face_1_x)
-                face_1_normal_z = np.ones_like(face_1_x)
-                area_1 = repeat_face_area[:nr_face_1]
-
-                # sample face 2
-                nr_face_2 = (
-                    np.sum(
-                        points_per_face[box_bounds.shape[0] : 2 * box_bounds.shape[0]]
-                    )
-                    + nr_face_1
-                )
-                face_2_x = (
-                    repeat_centers[nr_face_1:nr_face_2, 0]
-                    + 0.5
-                    * s_1[nr_face_1:nr_face_2]
-                    * repeat_side[nr_face_1:nr_face_2, 0]
-                )
-                face_2_y = (
-                    repeat_centers[nr_face_1:nr_face_2, 1]
-                    + 0.5 * repeat_side[nr_face_1:nr_face_2, 1]
-                )
-                face_2_z = (
-                    repeat_centers[nr_face_1:nr_face_2, 2]
-                    + 0.5
-                    * s_2[nr_face_1:nr_face_2]
-                    * repeat_side[nr_face_1:nr_face_2, 2]
-                )
-                face_2_normal_x = np.zeros_like(face_2_x)
-                face_2_normal_y = np.ones_like(face_2_x)
-                face_2_normal_z = np.zeros_like(face_2_x)
-                area_2 = repeat_face_area[nr_face_1:nr_face_2]
-
-                # sample face 3
-                nr_face_3 = (
-                    np.sum(
-                        points_per_face[
-                            2 * box_bounds.shape[0] : 3 * box_bounds.shape[0]
-                        ]
-                    )
-                    + nr_face_2
-                )
-                face_3_x = (
-                    repeat_centers[nr_face_2:nr_face_3, 0]
-                    + 0.5 * repeat_side[nr_face_2:nr_face_3, 0]
-                )
-                face_3_y = (
-                    repeat_centers[nr_face_2:nr_face_3, 1]
-                    + 0.5
-                    * s_1[nr_face_2:nr_face_3]
-                    * repeat_side[nr_face_2:nr_face_3, 1]
-                )
-                face_3_z = (
-                    repeat_centers[nr_face_2:nr_face_3, 2]
-                    + 0.5
-                    * s_2[nr_face_2:nr_face_3]
-                    * repeat_side[nr_face_2:nr_face_3, 2]
-                )
-                face_3_normal_x = np.ones_like(face_3_x)
-                face_3_normal_y = np.zeros_like(face_3_x)
-                face_3_normal_z = np.zeros_like(face_3_x)
-                area_3 = repeat_face_area[nr_face_2:nr_face_3]
-
-                # sample face 4
-                nr_face_4 = (
-                    np.sum(
-                        points_per_face[
-                            3 * box_bounds.shape[0] : 4 * box_bounds.shape[0]
-                        ]
-                    )
-                    + nr_face_3
-                )
-                face_4_x = (
-                    repeat_centers[nr_face_3:nr_face_4, 0]
-                    + 0.5
-                    * s_1[nr_face_3:nr_face_4]
-                    * repeat_side[nr_face_3:nr_face_4, 0]
-                )
-                face_4_y = (
-                    repeat_centers[nr_face_3:nr_face_4, 1]
-                    + 0.5
-                    * s_2[nr_face_3:nr_face_4]
-                    * repeat_side[nr_face_3:nr_face_4, 1]
-                )
-                face_4_z = (
-                    repeat_centers[nr_face_3:nr_face_4, 2]
-                    - 0.5 * repeat_side[nr_face_3:nr_face_4, 2]
-                )
-                face_4_normal_x = np.zeros_like(face_4_x)
-                face_4_normal_y = np.zeros_like(face_4_x)
-                face_4_normal_z = -np.ones_like(face_4_x)
-                area_4 = repeat_face_area[nr_face_3:nr_face_4]
-
-                # sample face 5
-                nr_face_5 = (
-                    np.sum(
-                        points_per_face[
-                            4 * box_bounds.shape[0] : 5 * box_bounds.shape[0]
-                        ]
-                    )
-                    + nr_face_4
-                )
-                face_5_x = (
-                    repeat_centers[nr_face_4:nr_face_5, 0]
-                    + 0.5
-                    * s_1[nr_face_4:nr_face_5]
-                    * repeat_side[nr_face_4:nr_face_5, 0]
-                )
-                face_5_y = (
-                    repeat_centers[nr_face_4:nr_face_5, 1]
-                    - 0.5 * repeat_side[nr_face_4:nr_face_5, 1]
-                )
-                face_5_z = (
-                    repeat_centers[nr_face_4:nr_face_5, 2]
-                    + 0.5
-                    * s_2[nr_face_4:nr_face_5]
-                    * repeat_side[nr_face_4:nr_face_5, 2]
-                )
-                face_5_normal_x = np.zeros_like(face_5_x)
-                face_5_normal_y = -np.ones_like(face_5_x)
-                face_5_normal_z = np.zeros_like(face_5_x)
-                area_5 = repeat_face_area[nr_face_4:nr_face_5]
-
-                # sample face 6
-                nr_face_6 = (
-                    np.sum(points_per_face[5 * box_bounds.shape[0] :]) + nr_face_5
-                )
-                face_6_x = (
-                    repeat_centers[nr_face_5:nr_face_6, 0]
-                    - 0.5 * repeat_side[nr_face_5:nr_face_6, 0]
-                )
-                face_6_y = (
-                    repeat_centers[nr_face_5:nr_face_6, 1]
-                    + 0.5
-                    * s_1[nr_face_5:nr_face_6]
-                    * repeat_side[nr_face_5:nr_face_6, 1]
-                )
-                face_6_z = (
-                    repeat_centers[nr_face_5:nr_face_6, 2]
-                    + 0.5
-                    * s_2[nr_face_5:nr_face_6]
-                    * repeat_side[nr_face_5:nr_face_6, 2]
-                )
-                face_6_normal_x = -np.ones_like(face_6_x)
-                face_6_normal_y = np.zeros_like(face_6_x)
-                face_6_normal_z = np.zeros_like(face_6_x)
-                area_6 = repeat_face_area[nr_face_5:nr_face_6]
+            def sample(nr_points, parameterization, quasirandom):
+                # select faces with probability proportional to their area,
+                # points are grouped by face as the indices are sorted
+                face_index = _sample_cdf(face_cdf, nr_points)
+                points_per_face = np.bincount(face_index, minlength=face_area.shape[0])
+
+                # the in plane coordinates are sampled uniformly
+                low = face_low[face_index]
+                xyz = low + np.random.rand(nr_points, 3) * (face_high[face_index] - low)
+                normal = np.zeros((nr_points, 3))
+                normal[np.arange(nr_points), normal_axis[face_index]] = normal_sign[
+                    face_index
+                ]
+                area = face_area[face_index] / points_per_face[face_index]
 
                 # gather for invar
                 invar = {
-                    "x": np.concatenate(
-                        [face_1_x, face_2_x, face_3_x, face_4_x, face_5_x, face_6_x],
-                        axis=0,
-                    )[:, None],
-                    "y": np.concatenate(
-                        [face_1_y, face_2_y, face_3_y, face_4_y, face_5_y, face_6_y],
-                        axis=0,
-                    )[:, None],
-                    "z": np.concatenate(
-                        [face_1_z, face_2_z, face_3_z, face_4_z, face_5_z, face_6_z],
-                        axis=0,
-                    )[:, None],
-                    "normal_x": np.concatenate(
-                        [
-                            face_1_normal_x,
-                            face_2_normal_x,
-                            face_3_normal_x,
-                            face_4_normal_x,
-                            face_5_normal_x,
-                            face_6_normal_x,
-                        ],
-                        axis=0,
-                    )[:, None],
-                    "normal_y": np.concatenate(
-                        [
-                            face_1_normal_y,
-                            face_2_normal_y,
-                            face_3_normal_y,
-                            face_4_normal_y,
-                            face_5_normal_y,
-                            face_6_normal_y,
-                        ],
-                        axis=0,
-                    )[:, None],
-                    "normal_z": np.concatenate(
-                        [
-                            face_1_normal_z,
-                            face_2_normal_z,
-                            face_3_normal_z,
-                            face_4_normal_z,
-                            face_5_normal_z,
-                            face_6_normal_z,
-                        ],
-                        axis=0,
-                    )[:, None],
-                    "area": np.concatenate(
-                        [area_1, area_2, area_3, area_4, area_5, area_6], axis=0
-                    )[:, None],
+                    "x": xyz[:, 0:1],
+                    "y": xyz[:, 1:2],
+                    "z": xyz[:, 2:3],
+                    "normal_x": normal[:, 0:1],
+                    "normal_y": normal[:, 1:2],
+                    "normal_z": normal[:, 2:3],
+                    "area": area[:, None],
                 }
                 return invar, {}
 
-            return sample
+            def restrict(curve, box, parameters):
+                # clip the faces to the box, the areas stay exact
+                low, high = face_low.copy(), face_high.copy()
+                keep = np.ones(low.shape[0], dtype=bool)
+                for i, d in enumerate(["x", "y", "z"]):
+                    if d not in box:
+                        continue
+                    on_plane = normal_axis == i
+                    keep &= np.where(
+                        on_plane,
+                        _in_range(low[:, i], *box[d]),
+                        np.logical_and(high[:, i] > box[d][0], low[:, i] < box[d][1]),
+                    )
+                    low[~on_plane, i] = np.maximum(low[~on_plane, i], box[d][0])
+                    high[~on_plane, i] = np.minimum(high[~on_plane, i], box[d][1])
+                if not np.any(keep):
+                    return None
+                if (
+                    np.all(keep)
+                    and np.all(low == face_low)
+                    and np.all(high == face_high)
+                ):
+                    return curve
+                return _face_curve(
+                    low[keep], high[keep], normal_axis[keep], normal_sign[keep]
+                )
+
+            return Curve(_numpy_sample(sample), dims=3, restrict=restrict)
 
-        curves = [Curve(_sample(box_bounds, box_centers, side), dims=3)]
+        curves = [_face_curve(face_low, face_high, normal_axis, normal_sign)]
 
         # create closure for SDF function
         def _sdf(box_bounds, box_centers, side, dx):
@@ -686,7 +516,11 @@ class VectorizedBoxes(Geometry):
 
         # initialize geometry
         Geometry.__init__(
-            self, curves, _sdf(box_bounds, box_centers, side, dx), bounds=bounds, dims=3
+            self,
+            curves,
+            _numpy_sdf(_sdf(box_bounds, box_centers, side, dx)),
+            bounds=bounds,
+            dims=3,
         )
 
     @staticmethod
@@ -0,0 +1,141 @@
+# SPDX-FileCopyrightText: Copyright (c) 2023 - 2024 NVIDIA CORPORATION & AFFILIATES.
+# SPDX-FileCopyrightText: All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Stateful low-discrepancy sequences used for quasirandom sampling
+"""
+
+import warnings
+from typing import Dict, Union
+
+import numpy as np
+from scipy.stats import qmc
+
+
+class QuasiRandomStream:
+    """
+    Stateful low-discrepancy sequence. Every call continues the sequence where
+    the previous call stopped, so repeated batches cover the unit cube instead
+    of returning the same points.
+
+    A separate sequence is kept for every number of dimensions, they are
+    created on first use. The state can be saved with `state_dict` and
+    restored with `load_state_dict`.
+
+    Parameters
+    ----------
+    method : str
+        Sequence to use, one of "halton" or "sobol". Default is "halton".
+    scramble : bool
+        If true the sequences are scrambled (randomized). Default is True.
+    seed : int, optional
+        Seed of the scrambling. If not given a seed is drawn from
+        `np.random`, so `np.random.seed` makes the stream reproducible.
+    """
+
+    def __init__(self, method: str = "halton", scramble: bool = True, seed: int = None):
+        if method not in ("halton", "sobol"):
+            raise ValueError(
+                "method must be one of 'halton' or 'sobol' (got {})".format(method)
+            )
+        if seed is None:
+            seed = int(np.random.randint(2**31))
+        self.method = method
+        self.scramble = scramble
+        self.seed = seed
+        self._engines = {}
+
+    def _engine(self, dims: int):
+        if dims not in self._engines:
+            engine = qmc.Halton if self.method == "halton" else qmc.Sobol
+            self._engines[dims] = engine(
+                dims,
+                scramble=self.scramble,
+                seed=np.random.default_rng([self.seed, dims]),
+            )
+        return self._engines[dims]
+
+    def sample(self, nr_points: int, dims: int) -> np.ndarray:
+        """
+        Next points of the sequence.
+
+        Parameters
+        ----------
+        nr_points : int
+            Number of points.
+        dims : int
+            Number of dimensions.
+
+        Returns
+        -------
+        samples : np.ndarray
+            Points in the unit cube, shape (nr_points, dims).
+        """
+        if dims == 0:
+            return np.empty((nr_points, 0))
+        with warnings.catch_warnings():
+            # sobol warns if nr_points is not a power of 2
+            warnings.simplefilter("ignore", UserWarning)
+            return self._engine(dims).random(nr_points)
+
+    def reset(self):
+        "Restart all sequences from the beginning"
+        self._engines = {}
+
+    def state_dict(self) -> Dict[str, Union[str, bool, int, Dict[int, int]]]:
+        "Returns the state of the stream"
+        return {
+            "method": self.method,
+            "scramble": self.scramble,
+            "seed": self.seed,
+            "num_generated": {
+                dims: int(engine.num_generated)
+                for dims, engine in self._engines.items()
+            },
+        }
+
+    def load_state_dict(self, state_dict: Dict):
+        "Restores a state returned by `state_dict`"
+        self.method = state_dict["method"]
+        self.scramble = state_dict["scramble"]
+        self.seed = state_dict["seed"]
+        self.reset()
+        for dims, num_generated in state_dict["num_generated"].items():
+            self._engine(int(dims)).fast_forward(num_generated)
+
+
+_default_stream = None
+
+
+def get_quasirandom_stream() -> QuasiRandomStream:
+    "Returns the stream used when sampling with `quasirandom=True`"
+    global _default_stream
+    if _default_stream is None:
+        _default_stream = QuasiRandomStream()
+    return _default_stream
+
+
+def set_quasirandom_stream(stream: QuasiRandomStream):
+    """
+    Sets the stream used when sampling with `quasirandom=True`.
+
+    Parameters
+    ----------
+    stream : QuasiRandomStream
+        New default stream.
+    """
+    global _default_stream
+    _default_stream = stream
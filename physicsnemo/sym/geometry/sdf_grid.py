@@ -0,0 +1,147 @@
+# SPDX-FileCopyrightText: Copyright (c) 2023 - 2024 NVIDIA CORPORATION & AFFILIATES.
+# SPDX-FileCopyrightText: All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Signed distance field of a static geometry precomputed on a regular grid
+"""
+
+import itertools
+from typing import Callable, Dict, List, Tuple
+
+import numpy as np
+
+from physicsnemo.sym.constants import diff_str
+
+
+class SDFGrid:
+    """
+    Signed distance field of a static geometry precomputed on a regular grid.
+
+    Points are looked up by multilinear (bilinear in 2D, trilinear in 3D)
+    interpolation of the grid values, the sdf derivatives are the gradient of
+    the interpolant. For a signed distance function the interpolation error is
+    at most one cell diagonal, so points within `band` cell diagonals of the
+    surface and points outside of the grid are evaluated with the exact sdf
+    function. This keeps the sign of the sdf exact, also close to features
+    thinner than a cell.
+
+    Parameters
+    ----------
+    sdf : Callable
+        Exact sdf function, `sdf(invar, params, compute_sdf_derivatives)`.
+    dims : List[str]
+        Coordinates of the sdf, e.g. `["x", "y", "z"]`.
+    bounds : Dict[str, Tuple[float, float]]
+        Region covered by the grid, it is padded by two cells on every side.
+    resolution : int
+        Number of grid points along the longest side of the bounds.
+        Default is 128.
+    band : float
+        Width of the band around the surface in which the exact sdf is
+        evaluated, in cell diagonals. Increase it for sdfs that are not exact
+        distances, e.g. of scaled or intersected geometries. Default is 1.0.
+    chunk_size : int
+        Number of grid points the exact sdf is evaluated on at once when
+        building the grid. Default is 2**18.
+    """
+
+    def __init__(
+        self,
+        sdf: Callable,
+        dims: List[str],
+        bounds: Dict[str, Tuple[float, float]],
+        resolution: int = 128,
+        band: float = 1.0,
+        chunk_size: int = 2**18,
+    ):
+        if resolution < 2:
+            raise ValueError("resolution must be at least 2")
+        self.sdf = sdf
+        self.dims = dims
+
+        # regular grid covering the padded bounds
+        low = np.array([float(bounds[d][0]) for d in dims])
+        high = np.array([float(bounds[d][1]) for d in dims])
+        self.cell_size = np.max(high - low) / (resolution - 1)
+        self.origin = low - 2 * self.cell_size
+        self.shape = (
+            np.ceil((high - low) / self.cell_size).astype(np.int64) + 5
+        )  # 2 cells of padding on both sides
+        self.band_width = band * self.cell_size * np.sqrt(len(dims))
+
+        # evaluate the exact sdf on the grid points in chunks
+        nr_grid_points = int(np.prod(self.shape))
+        values = np.empty(nr_grid_points)
+        for start in range(0, nr_grid_points, chunk_size):
+            index = np.arange(start, min(start + chunk_size, nr_grid_points))
+            grid_index = np.stack(np.unravel_index(index, self.shape), axis=1)
+            points = self.origin + grid_index * self.cell_size
+            invar = {d: points[:, i : i + 1] for i, d in enumerate(dims)}
+            values[index] = sdf(invar, {}, compute_sdf_derivatives=False)["sdf"][:, 0]
+        self.values = values.reshape(self.shape)
+
+    def __call__(self, invar, params, compute_sdf_derivatives=False):
+        points = np.concatenate([invar[d] for d in self.dims], axis=1)
+        nr_points, nr_dims = points.shape
+
+        # cell of every point and the position in the cell
+        position = (points - self.origin) / self.cell_size
+        in_grid = np.all(
+            np.logical_and(position >= 0, position <= self.shape - 1), axis=1
+        )
+        cell = np.clip(np.floor(position).astype(np.int64), 0, self.shape - 2)
+        t = np.clip(position - cell, 0.0, 1.0)
+
+        # values at the 2**dims corners of the cells, shape (N, 2, ..., 2)
+        strides = np.array(self.values.strides) // self.values.itemsize
+        corners = np.array(list(itertools.product([0, 1], repeat=nr_dims)))
+        corner_values = self.values.ravel()[
+            (cell @ strides)[:, None] + corners @ strides
+        ].reshape((nr_points,) + nr_dims * (2,))
+
+        # multilinear interpolation, the derivatives interpolate the
+        # differences along their axis
+        outputs = {"sdf": _interpolate(corner_values, t)}
+        if compute_sdf_derivatives:
+            for i, d in enumerate(self.dims):
+                difference = np.take(corner_values, 1, axis=1 + i) - np.take(
+                    corner_values, 0, axis=1 + i
+                )
+                outputs["sdf" + diff_str + d] = (
+                    _interpolate(difference, np.delete(t, i, axis=1)) / self.cell_size
+                )
+
+        # exact sdf close to the surface and outside of the grid
+        exact = np.logical_or(~in_grid, np.abs(outputs["sdf"][:, 0]) < self.band_width)
+        if np.any(exact):
+            exact_outputs = self.sdf(
+                {key: value[exact] for key, value in invar.items()},
+                {key: value[exact] for key, value in params.items()},
+                compute_sdf_derivatives,
+            )
+            for key, value in exact_outputs.items():
+                outputs[key][exact] = value
+        return outputs
+
+
+def _interpolate(corner_values, t):
+    # reduce the corner axes (N, 2, ..., 2) one by one with linear interpolation
+    for i in range(t.shape[1]):
+        weight = t[:, i].reshape((-1,) + (corner_values.ndim - 2) * (1,))
+        corner_values = corner_values[:, 0] + weight * (
+            corner_values[:, 1] - corner_values[:, 0]
+        )
+    return corner_values[:, None]
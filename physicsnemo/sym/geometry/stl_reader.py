@@ -0,0 +1,179 @@
+# SPDX-FileCopyrightText: Copyright (c) 2023 - 2024 NVIDIA CORPORATION & AFFILIATES.
+# SPDX-FileCopyrightText: All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Streaming reader for ASCII and binary STL files
+"""
+
+import os
+import re
+
+import numpy as np
+
+# record of a triangle in a binary STL file
+_BINARY_TRIANGLE = np.dtype(
+    [("normal", "<f4", (3,)), ("vertices", "<f4", (3, 3)), ("attribute", "<u2")]
+)
+_ASCII_VERTEX = re.compile(rb"vertex\s+(\S+)\s+(\S+)\s+(\S+)")
+_ASCII_NORMAL = re.compile(rb"facet\s+normal\s+(\S+)\s+(\S+)\s+(\S+)")
+
+
+def read_stl(filename, chunk_size=2**18):
+    """
+    Reads an ASCII or binary STL file to an indexed triangle mesh.
+
+    The file is read in chunks of triangles, binary files are memory mapped.
+    Duplicated vertices are merged so every vertex is stored once, the
+    normals stored in the file are kept per triangle.
+
+    Parameters
+    ----------
+    filename : str
+        Filename of the STL file.
+    chunk_size : int
+        Number of triangles read at once, by default 2**18.
+
+    Returns
+    -------
+    vertices : np.ndarray
+        Unique vertices of the mesh, float32 array of shape (V, 3).
+    faces : np.ndarray
+        Vertex indices of the triangles, int32 array of shape (F, 3).
+    normals : np.ndarray
+        Normals of the triangles stored in the file, float32 array of shape
+        (F, 3). They are not normalized and can be zero.
+    """
+    assert chunk_size > 0, "chunk_size must be positive"
+    file_size = os.path.getsize(filename)
+    with open(filename, "rb") as f:
+        header = f.read(84)
+    if (
+        len(header) == 84
+        and 84 + _BINARY_TRIANGLE.itemsize * int(np.frombuffer(header[80:], "<u4")[0])
+        == file_size
+    ):
+        chunks = _binary_triangles(filename, chunk_size)
+    else:
+        chunks = _ascii_triangles(filename, chunk_size)
+
+    # the normals are collected while the vertices of the chunks are indexed
+    normals = [np.zeros((0, 3), dtype=np.float32)]
+
+    def triangles():
+        for chunk_triangles, chunk_normals in chunks:
+            normals.append(chunk_normals)
+            yield chunk_triangles
+
+    vertices, faces = index_triangles(triangles())
+    if faces.shape[0] == 0:
+        raise ValueError("No triangles found in STL file " + str(filename))
+    return vertices, faces, np.concatenate(normals)
+
+
+def index_triangles(chunks):
+    """
+    Merges the duplicated vertices of triangles to an indexed triangle mesh.
+
+    Parameters
+    ----------
+    chunks : Iterable[np.ndarray]
+        Chunks of triangle vertices, arrays of shape (N, 3, 3).
+
+    Returns
+    -------
+    vertices : np.ndarray
+        Unique vertices of the triangles, float32 array of shape (V, 3).
+    faces : np.ndarray
+        Vertex indices of the triangles, int32 array of shape (F, 3).
+    """
+    # merge the vertices of every chunk, then the vertices shared between chunks
+    chunk_vertices, chunk_faces = [], []
+    for triangles in chunks:
+        vertices, inverse = _unique_vertices(np.reshape(triangles, (-1, 3)))
+        chunk_vertices.append(vertices)
+        chunk_faces.append(inverse.reshape(-1, 3))
+    if len(chunk_vertices) == 0:
+        return np.zeros((0, 3), dtype=np.float32), np.zeros((0, 3), dtype=np.int32)
+    vertices = np.concatenate(chunk_vertices)
+    assert vertices.shape[0] < 2**31, "Too many vertices for int32 faces"
+    vertices, inverse = _unique_vertices(vertices)
+    offset = 0
+    for i, faces in enumerate(chunk_faces):
+        chunk_faces[i] = inverse[faces + offset]
+        offset += chunk_vertices[i].shape[0]
+    return vertices, np.concatenate(chunk_faces)
+
+
+def _unique_vertices(points):
+    # unique rows of a float32 (N, 3) array by sorting the bytes of the rows,
+    # adding zero turns -0.0 into 0.0 so both are merged
+    points = np.ascontiguousarray(points, dtype=np.float32) + np.float32(0)
+    rows = points.view(np.dtype((np.void, points.dtype.itemsize * 3)))[:, 0]
+    order = np.argsort(rows, kind="stable")
+    rows = rows[order]
+    first = np.empty(rows.shape[0], dtype=bool)
+    first[:1] = True
+    first[1:] = rows[1:] != rows[:-1]
+    inverse = np.empty(rows.shape[0], dtype=np.int32)
+    inverse[order] = np.cumsum(first, dtype=np.int32) - 1
+    return points[order[first]], inverse
+
+
+def _binary_triangles(filename, chunk_size):
+    triangles = np.memmap(filename, dtype=_BINARY_TRIANGLE, mode="r", offset=84)
+    try:
+        for start in range(0, triangles.shape[0], chunk_size):
+            chunk = np.array(triangles[start : start + chunk_size])
+            yield chunk["vertices"], chunk["normal"]
+    finally:
+        del triangles
+
+
+def _ascii_triangles(filename, chunk_size, block_size=2**22):
+    # parse blocks of complete lines, vertices of an unfinished triangle are
+    # kept for the next chunk
+    remainder = b""
+    vertices = np.zeros((0, 3), dtype=np.float32)
+    normals = np.zeros((0, 3), dtype=np.float32)
+    with open(filename, "rb") as f:
+        end_of_file = False
+        while not end_of_file:
+            block = remainder + f.read(block_size)
+            end_of_file = len(block) == len(remainder)
+            if not end_of_file:
+                end = block.rfind(b"\n") + 1
+                block, remainder = block[:end], block[end:]
+            values = _ASCII_VERTEX.findall(block)
+            if len(values) > 0:
+                vertices = np.concatenate(
+                    [vertices, np.array(values, dtype=np.float32)]
+                )
+            values = _ASCII_NORMAL.findall(block)
+            if len(values) > 0:
+                normals = np.concatenate([normals, np.array(values, dtype=np.float32)])
+            nr_triangles = vertices.shape[0] // 3
+            if nr_triangles >= chunk_size or (end_of_file and nr_triangles > 0):
+                # facets without a normal get a zero normal
+                if normals.shape[0] < nr_triangles:
+                    normals = np.pad(
+                        normals, ((0, nr_triangles - normals.shape[0]), (0, 0))
+                    )
+                yield (
+                    vertices[: 3 * nr_triangles].reshape(-1, 3, 3),
+                    normals[:nr_triangles],
+                )
+                vertices = vertices[3 * nr_triangles :]
+                normals = normals[nr_triangles:]
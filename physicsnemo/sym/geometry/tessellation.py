@@ -18,15 +18,17 @@
 Defines base class for all mesh type geometries
 """
 
+import os
+
 import numpy as np
 import warp as wp
-from stl import mesh as np_mesh
 
 from .geometry import Geometry
 from .parameterization import Parameterization, Bounds, Parameter
 from .curve import Curve
+from .helper import _in_range, _numpy_sample, _numpy_sdf, _sample_cdf
+from .stl_reader import index_triangles, read_stl
 from physicsnemo.sym.constants import diff_str
-from physicsnemo.utils.sdf import signed_distance_field
 
 
 class Tessellation(Geometry):
@@ -36,132 +38,136 @@ class Tessellation(Geometry):
 
     Parameters
     ----------
-    mesh : Mesh (numpy-stl)
-        A mesh that defines the surface of the geometry.
+    mesh : Union[Mesh (numpy-stl), Tuple[np.ndarray, ...]]
+        A mesh that defines the surface of the geometry. Either a numpy-stl
+        mesh or an indexed mesh given by its vertices, shape (V, 3), the
+        vertex indices of its triangles, shape (F, 3), and optionally the
+        normals of its triangles, shape (F, 3). The mesh is stored with
+        unique float32 vertices. Triangles without a (non-zero) normal use
+        the normal given by their winding.
     airtight : bool
         If the geometry is airtight or not. If false sample everywhere for interior.
     parameterization : Parameterization
         Parameterization of geometry.
+    sdf_device : str, optional
+        Warp device used for the signed distance queries, e.g. "cpu" or
+        "cuda:0". By default a CUDA device is used if available, and the CPU
+        in forked processes.
+    sdf_chunk_size : int
+        Maximum number of points queried at once, bounds the memory of the
+        signed distance queries. Default is 2**20.
     """
 
-    def __init__(self, mesh, airtight=True, parameterization=Parameterization()):
+    def __init__(
+        self,
+        mesh,
+        airtight=True,
+        parameterization=Parameterization(),
+        sdf_device=None,
+        sdf_chunk_size=2**20,
+    ):
+        # indexed mesh with unique vertices
+        if isinstance(mesh, tuple):
+            vertices, faces, *normals = mesh
+            vertices = np.asarray(vertices, dtype=np.float32)
+            faces = np.asarray(faces, dtype=np.int32)
+            normals = normals[0] if normals else None
+        else:
+            vertices, faces = index_triangles([mesh.vectors])
+            normals = mesh.normals
+        normals = _face_normals(vertices, faces, normals)
+
         # make curves
-        def _sample(mesh):
+        def _triangle_curve(faces, normals):
+            triangle_cdf = np.cumsum(
+                _area_of_triangles(*(vertices[faces[:, i]] for i in range(3))),
+                dtype=np.float64,
+            )
+
             def sample(
                 nr_points, parameterization=Parameterization(), quasirandom=False
             ):
-                # compute required points on per triangle
-                triangle_areas = _area_of_triangles(mesh.v0, mesh.v1, mesh.v2)
-                triangle_probabilities = triangle_areas / np.linalg.norm(
-                    triangle_areas, ord=1
-                )
-                triangle_index = np.arange(triangle_probabilities.shape[0])
-                points_per_triangle = np.random.choice(
-                    triangle_index, nr_points, p=triangle_probabilities
-                )
-                points_per_triangle, _ = np.histogram(
-                    points_per_triangle,
-                    np.arange(triangle_probabilities.shape[0] + 1) - 0.5,
-                )
-
-                # go through every triangle and sample it
+                # sample triangles with probability proportional to their area
+                index = _sample_cdf(triangle_cdf, nr_points)
+                triangles = vertices[faces[index]]
+                v0, v1, v2 = (triangles[:, i].astype(np.float64) for i in range(3))
+                points = _sample_triangles(v0, v1, v2)
+
                 invar = {
-                    "x": [],
-                    "y": [],
-                    "z": [],
-                    "normal_x": [],
-                    "normal_y": [],
-                    "normal_z": [],
-                    "area": [],
+                    "x": points[:, 0:1],
+                    "y": points[:, 1:2],
+                    "z": points[:, 2:3],
+                    "normal_x": normals[index, 0:1],
+                    "normal_y": normals[index, 1:2],
+                    "normal_z": normals[index, 2:3],
                 }
-                for index, nr_p in enumerate(
-                    points_per_triangle
-                ):  # TODO can be more efficent
-                    x, y, z = _sample_triangle(
-                        mesh.v0[index], mesh.v1[index], mesh.v2[index], nr_p
-                    )
-                    invar["x"].append(x)
-                    invar["y"].append(y)
-                    invar["z"].append(z)
-                    normal_scale = np.linalg.norm(mesh.normals[index])
-                    invar["normal_x"].append(
-                        np.full(x.shape, mesh.normals[index, 0]) / normal_scale
-                    )
-                    invar["normal_y"].append(
-                        np.full(x.shape, mesh.normals[index, 1]) / normal_scale
-                    )
-                    invar["normal_z"].append(
-                        np.full(x.shape, mesh.normals[index, 2]) / normal_scale
-                    )
-
-                invar["x"] = np.concatenate(invar["x"], axis=0)
-                invar["y"] = np.concatenate(invar["y"], axis=0)
-                invar["z"] = np.concatenate(invar["z"], axis=0)
-                invar["normal_x"] = np.concatenate(invar["normal_x"], axis=0)
-                invar["normal_y"] = np.concatenate(invar["normal_y"], axis=0)
-                invar["normal_z"] = np.concatenate(invar["normal_z"], axis=0)
                 # Compute area from the original mesh
-                invar["area"] = np.ones_like(invar["x"]) * (
-                    np.sum(triangle_areas) / nr_points
-                )
+                invar["area"] = np.full((nr_points, 1), triangle_cdf[-1] / nr_points)
 
                 # sample from the param ranges
                 params = parameterization.sample(nr_points, quasirandom=quasirandom)
                 return invar, params
 
-            return sample
+            def restrict(curve, box, parameters):
+                # only sample triangles with a bounding box intersecting the box,
+                # for flat boxes (`Eq` criteria) only triangles in the plane
+                keep = np.ones(faces.shape[0], dtype=bool)
+                for i, d in enumerate(["x", "y", "z"]):
+                    if d not in box:
+                        continue
+                    low, high = box[d]
+                    coordinates = vertices[faces, i]
+                    triangle_low = np.min(coordinates, axis=1)
+                    triangle_high = np.max(coordinates, axis=1)
+                    if low == high:
+                        keep &= _in_range(triangle_low, low, high)
+                        keep &= _in_range(triangle_high, low, high)
+                    else:
+                        keep &= _in_range(triangle_high, low, np.inf)
+                        keep &= _in_range(triangle_low, -np.inf, high)
+                if not np.any(keep):
+                    return None
+                if np.all(keep):
+                    return curve
+                return _triangle_curve(faces[keep], normals[keep])
+
+            return Curve(
+                _numpy_sample(sample),
+                dims=3,
+                parameterization=parameterization,
+                restrict=restrict,
+            )
 
-        curves = [Curve(_sample(mesh), dims=3, parameterization=parameterization)]
+        curves = [_triangle_curve(faces, normals)]
 
         # make sdf function
-        def _sdf(triangles, airtight):
+        def _sdf(vertices, faces, airtight):
+            mesh_sdf = _MeshSDF(
+                vertices, faces, device=sdf_device, chunk_size=sdf_chunk_size
+            )
+
             def sdf(invar, params, compute_sdf_derivatives=False):
                 # gather points
-                points = np.stack([invar["x"], invar["y"], invar["z"]], axis=1)
-
-                # normalize triangles and points
-                minx, maxx, miny, maxy, minz, maxz = _find_mins_maxs(points)
-                max_dis = max(max((maxx - minx), (maxy - miny)), (maxz - minz))
-                store_triangles = np.array(triangles, dtype=np.float64)
-                store_triangles[:, :, 0] -= minx
-                store_triangles[:, :, 1] -= miny
-                store_triangles[:, :, 2] -= minz
-                store_triangles *= 1 / max_dis
-                store_triangles = store_triangles.reshape(-1, 3)
-                points[:, 0] -= minx
-                points[:, 1] -= miny
-                points[:, 2] -= minz
-                points *= 1 / max_dis
-                points = points.astype(np.float64).flatten()
+                points = np.concatenate([invar["x"], invar["y"], invar["z"]], axis=1)
 
                 # compute sdf values
                 outputs = {}
                 if airtight:
-                    sdf_field, sdf_derivative = signed_distance_field(
-                        store_triangles,
-                        np.arange((store_triangles.shape[0])),
-                        points,
-                        include_hit_points=True,
-                    )
-                    if isinstance(sdf_field, wp.types.array):
-                        sdf_field = sdf_field.numpy()
-                    if isinstance(sdf_derivative, wp.types.array):
-                        sdf_derivative = sdf_derivative.numpy()
-                    sdf_field = -np.expand_dims(max_dis * sdf_field, axis=1)
-                    sdf_derivative = sdf_derivative.reshape(-1)
+                    sdf_field, hit_points = mesh_sdf.query(points)
+                    sdf_field = -sdf_field
                 else:
                     sdf_field = np.zeros_like(invar["x"])
                 outputs["sdf"] = sdf_field
 
                 # get sdf derivatives
                 if compute_sdf_derivatives:
-                    sdf_derivative = -(sdf_derivative - points)
-                    sdf_derivative = np.reshape(
-                        sdf_derivative, (sdf_derivative.shape[0] // 3, 3)
-                    )
-                    sdf_derivative = sdf_derivative / np.linalg.norm(
-                        sdf_derivative, axis=1, keepdims=True
-                    )
+                    if airtight:
+                        sdf_derivative = np.sign(sdf_field) * (points - hit_points)
+                        sdf_derivative = sdf_derivative / np.linalg.norm(
+                            sdf_derivative, axis=1, keepdims=True
+                        )
+                    else:
+                        sdf_derivative = np.zeros_like(points)
                     outputs["sdf" + diff_str + "x"] = sdf_derivative[:, 0:1]
                     outputs["sdf" + diff_str + "y"] = sdf_derivative[:, 1:2]
                     outputs["sdf" + diff_str + "z"] = sdf_derivative[:, 2:3]
@@ -171,20 +177,11 @@ class Tessellation(Geometry):
             return sdf
 
         # compute bounds
+        low, high = np.min(vertices, axis=0), np.max(vertices, axis=0)
         bounds = Bounds(
             {
-                Parameter("x"): (
-                    float(np.min(mesh.vectors[:, :, 0])),
-                    float(np.max(mesh.vectors[:, :, 0])),
-                ),
-                Parameter("y"): (
-                    float(np.min(mesh.vectors[:, :, 1])),
-                    float(np.max(mesh.vectors[:, :, 1])),
-                ),
-                Parameter("z"): (
-                    float(np.min(mesh.vectors[:, :, 2])),
-                    float(np.max(mesh.vectors[:, :, 2])),
-                ),
+                Parameter(d): (float(low[i]), float(high[i]))
+                for i, d in enumerate(["x", "y", "z"])
             },
             parameterization=parameterization,
         )
@@ -192,7 +189,7 @@ class Tessellation(Geometry):
         # initialize geometry
         super(Tessellation, self).__init__(
             curves,
-            _sdf(mesh.vectors, airtight),
+            _numpy_sdf(_sdf(vertices, faces, airtight)),
             dims=3,
             bounds=bounds,
             parameterization=parameterization,
@@ -204,9 +201,11 @@ class Tessellation(Geometry):
         filename,
         airtight=True,
         parameterization=Parameterization(),
+        **kwargs,
     ):
         """
-        makes mesh from STL file
+        makes mesh from an ASCII or binary STL file. The file is read in
+        chunks (binary files are memory mapped) to an indexed mesh.
 
         Parameters
         ----------
@@ -216,23 +215,129 @@ class Tessellation(Geometry):
           If the geometry is airtight or not. If false sample everywhere for interior.
         parameterization : Parameterization
             Parameterization of geometry.
+        **kwargs
+            Passed to the constructor, e.g. `sdf_device` and `sdf_chunk_size`.
         """
         # read in mesh
-        mesh = np_mesh.Mesh.from_file(filename)
-        return cls(mesh, airtight, parameterization)
+        mesh = read_stl(filename)
+        return cls(mesh, airtight, parameterization, **kwargs)
+
+
+@wp.kernel
+def _mesh_query_sdf(
+    mesh: wp.uint64,
+    points: wp.array(dtype=wp.vec3),
+    max_dist: float,
+    sdf: wp.array(dtype=float),
+    hit_points: wp.array(dtype=wp.vec3),
+):
+    tid = wp.tid()
+    res = wp.mesh_query_point_sign_normal(mesh, points[tid], max_dist)
+    hit_point = wp.mesh_eval_position(mesh, res.face, res.u, res.v)
+    sdf[tid] = res.sign * wp.length(points[tid] - hit_point)
+    hit_points[tid] = hit_point
+
+
+class _MeshSDF:
+    """
+    Signed distance queries against a triangle mesh. The triangles are
+    normalized to the unit cube once and the warp mesh (BVH) is built once per
+    device and reused by every query.
+
+    Parameters
+    ----------
+    vertices : np.ndarray
+        Vertices of the mesh, shape (V, 3).
+    faces : np.ndarray
+        Vertex indices of the triangles, shape (F, 3).
+    device : str, optional
+        Warp device of the queries, by default CUDA if available else CPU.
+    chunk_size : int
+        Maximum number of points queried at once.
+    """
+
+    def __init__(self, vertices, faces, device=None, chunk_size=2**20):
+        assert chunk_size > 0, "chunk_size must be positive"
+        self.device = device
+        self.chunk_size = chunk_size
+
+        # normalize with the bounding box of the mesh
+        vertices = np.asarray(vertices, dtype=np.float64)
+        minx, maxx, miny, maxy, minz, maxz = _find_mins_maxs(vertices)
+        self.offset = np.array([minx, miny, minz])
+        self.scale = max(maxx - minx, maxy - miny, maxz - minz)
+        self.vertices = ((vertices - self.offset) / self.scale).astype(np.float32)
+        self.faces = np.asarray(faces, dtype=np.int32).reshape(-1)
+        self._meshes = {}
+        self._pid = os.getpid()
+
+    def mesh(self, device):
+        "Returns the warp mesh on the device, building it on first use"
+        if device.alias not in self._meshes:
+            self._meshes[device.alias] = wp.Mesh(
+                points=wp.array(self.vertices, dtype=wp.vec3, device=device),
+                indices=wp.array(self.faces, dtype=wp.int32, device=device),
+            )
+        return self._meshes[device.alias]
+
+    def query(self, points):
+        """
+        Signed distance (positive outside) and closest point on the mesh.
+
+        Parameters
+        ----------
+        points : np.ndarray
+            Query points, shape (M, 3).
+
+        Returns
+        -------
+        sdf : np.ndarray
+            Signed distances, shape (M, 1).
+        hit_points : np.ndarray
+            Closest points on the mesh, shape (M, 3).
+        """
+        wp.init()
+        device = wp.get_device(self.device)
+        if self.device is None and (
+            not wp.is_cuda_available() or os.getpid() != self._pid
+        ):
+            # forked processes (e.g. `sample_parallel`) can not use CUDA
+            device = wp.get_device("cpu")
+        mesh = self.mesh(device)
 
+        points = (np.asarray(points, dtype=np.float64) - self.offset) / self.scale
+        sdf = np.empty((points.shape[0], 1), dtype=np.float64)
+        hit_points = np.empty((points.shape[0], 3), dtype=np.float64)
+        for start in range(0, points.shape[0], self.chunk_size):
+            chunk = slice(start, start + self.chunk_size)
+            wp_points = wp.array(
+                points[chunk].astype(np.float32), dtype=wp.vec3, device=device
+            )
+            wp_sdf = wp.empty(wp_points.shape[0], dtype=float, device=device)
+            wp_hit_points = wp.empty(wp_points.shape[0], dtype=wp.vec3, device=device)
+            wp.launch(
+                _mesh_query_sdf,
+                dim=wp_points.shape[0],
+                inputs=[mesh.id, wp_points, 1e8, wp_sdf, wp_hit_points],
+                device=device,
+            )
+            sdf[chunk, 0] = wp_sdf.numpy()
+            hit_points[chunk] = wp_hit_points.numpy()
 
-# helper for sampling triangle
-def _sample_triangle(
-    v0, v1, v2, nr_points
+        # back to the original scale
+        sdf *= self.scale
+        hit_points = hit_points * self.scale + self.offset
+        return sdf, hit_points
+
+
+# helper for sampling triangles, one point in every triangle
+def _sample_triangles(
+    v0, v1, v2
 ):  # ref https://math.stackexchange.com/questions/18686/uniform-random-point-in-triangle
-    r1 = np.random.uniform(0, 1, size=(nr_points, 1))
-    r2 = np.random.uniform(0, 1, size=(nr_points, 1))
+    r1 = np.random.uniform(0, 1, size=(v0.shape[0], 1))
+    r2 = np.random.uniform(0, 1, size=(v0.shape[0], 1))
     s1 = np.sqrt(r1)
-    x = v0[0] * (1.0 - s1) + v1[0] * (1.0 - r2) * s1 + v2[0] * r2 * s1
-    y = v0[1] * (1.0 - s1) + v1[1] * (1.0 - r2) * s1 + v2[1] * r2 * s1
-    z = v0[2] * (1.0 - s1) + v1[2] * (1.0 - r2) * s1 + v2[2] * r2 * s1
-    return x, y, z
+    return v0 * (1.0 - s1) + v1 * (1.0 - r2) * s1 + v2 * r2 * s1
 
 
 # area of array of triangles
@@ -247,6 +352,20 @@ def _area_of_triangles(v0, v1, v2):
     return area
 
 
+# unit normals of the triangles, the normals of the file if given and
+# non-zero, otherwise the normals given by the winding of the triangles
+def _face_normals(vertices, faces, normals=None):
+    v0, v1, v2 = (vertices[faces[:, i]].astype(np.float64) for i in range(3))
+    winding = np.cross(v1 - v0, v2 - v0)
+    if normals is not None:
+        normals = np.asarray(normals, dtype=np.float64)
+        given = np.linalg.norm(normals, axis=1) > 0
+        winding[given] = normals[given]
+    # degenerate triangles have no normal, they have no area to be sampled
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return winding / np.linalg.norm(winding, axis=1, keepdims=True)
+
+
 # helper for min max
 def _find_mins_maxs(points):
     minx = float(np.min(points[:, 0]))
@@ -40,6 +40,7 @@ class PhysicsNeMoCallback(Callback):
         manager.broadcast_buffers = config.broadcast_buffers
         manager.find_unused_parameters = config.find_unused_parameters
         manager.cuda_graphs = config.cuda_graphs
+        manager.ddp_mode = config.ddp_mode
 
         # jit manager
         jit_manager = JitManager()
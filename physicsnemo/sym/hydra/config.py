@@ -54,6 +54,7 @@ class PhysicsNeMoConfig:
     cuda_graph_warmup: int = 20
     find_unused_parameters: bool = False
     broadcast_buffers: bool = False
+    ddp_mode: str = "constraint"
 
     device: str = ""
     debug: bool = False
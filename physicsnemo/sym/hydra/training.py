@@ -37,9 +37,13 @@ class TrainingConf:
     rec_constraint_freq: int = MISSING
     save_network_freq: int = MISSING
     print_stats_freq: int = MISSING
+    metrics_flush_freq: int = MISSING
     summary_freq: int = MISSING
     grad_clip_max_norm: float = MISSING
     monitor_grad_clip: bool = MISSING
+    async_checkpoint: bool = MISSING
+    keep_checkpoints: int = MISSING
+    background_eval: bool = MISSING
 
 
 @dataclass
@@ -53,9 +57,13 @@ class DefaultTraining(TrainingConf):
     rec_constraint_freq: int = II("training.rec_results_freq")
     save_network_freq: int = 1000
     print_stats_freq: int = 100
+    metrics_flush_freq: int = II("training.print_stats_freq")
     summary_freq: int = 1000
     grad_clip_max_norm: float = 0.5
     monitor_grad_clip: bool = True
+    async_checkpoint: bool = True
+    keep_checkpoints: int = 1
+    background_eval: bool = False
 
     ntk: NTKConf = field(default_factory=NTKConf)
 
@@ -159,6 +159,34 @@ class IntegralLossNorm(Loss):
             losses[key] = l.sum()
         return losses
 
+    @staticmethod
+    def _segment_loss(
+        invar: Dict[str, Tensor],
+        pred_outvar: Dict[str, Tensor],
+        true_outvar: Dict[str, Tensor],
+        lambda_weighting: Dict[str, Tensor],
+        segment_ids: Tensor,
+        step: int,
+        ord: float,
+    ) -> Dict[str, Tensor]:
+        # integrate every segment at once with a segment-sum over the flat points
+        nr_segments = next(iter(true_outvar.values())).shape[0]
+        losses = {}
+        for key, value in pred_outvar.items():
+            integrand = (invar["area"] * value).reshape(value.shape[0], -1)
+            integral = torch.zeros(
+                (nr_segments, integrand.shape[1]),
+                dtype=integrand.dtype,
+                device=integrand.device,
+            ).index_add_(0, segment_ids, integrand)
+            losses[key] = (
+                lambda_weighting[key].reshape(nr_segments, -1)
+                * torch.abs(true_outvar[key].reshape(nr_segments, -1) - integral).pow(
+                    ord
+                )
+            ).sum()
+        return losses
+
     def forward(
         self,
         list_invar: List[Dict[str, Tensor]],
@@ -176,6 +204,31 @@ class IntegralLossNorm(Loss):
             self.ord,
         )
 
+    def forward_segmented(
+        self,
+        invar: Dict[str, Tensor],
+        pred_outvar: Dict[str, Tensor],
+        true_outvar: Dict[str, Tensor],
+        lambda_weighting: Dict[str, Tensor],
+        segment_ids: Tensor,
+        step: int,
+    ) -> Dict[str, Tensor]:
+        """
+        Integral loss on packed integrals. `invar` and `pred_outvar` hold the
+        points of every integral in one flat tensor, `segment_ids` gives the
+        integral each point belongs to and `true_outvar`/`lambda_weighting`
+        hold one row per integral.
+        """
+        return IntegralLossNorm._segment_loss(
+            invar,
+            pred_outvar,
+            true_outvar,
+            lambda_weighting,
+            segment_ids,
+            step,
+            self.ord,
+        )
+
 
 class DecayedLossNorm(Loss):
     """
@@ -267,6 +320,25 @@ class DecayedIntegralLossNorm(DecayedLossNorm):
             self.ord(step),
         )
 
+    def forward_segmented(
+        self,
+        invar: Dict[str, Tensor],
+        pred_outvar: Dict[str, Tensor],
+        true_outvar: Dict[str, Tensor],
+        lambda_weighting: Dict[str, Tensor],
+        segment_ids: Tensor,
+        step: int,
+    ) -> Dict[str, Tensor]:
+        return IntegralLossNorm._segment_loss(
+            invar,
+            pred_outvar,
+            true_outvar,
+            lambda_weighting,
+            segment_ids,
+            step,
+            self.ord(step),
+        )
+
 
 class CausalLossNorm(Loss):
     """
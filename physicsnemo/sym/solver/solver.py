@@ -16,6 +16,8 @@
 
 """PhysicsNeMo Neural Differential Equation Solver"""
 
+import copy
+
 from omegaconf import DictConfig
 
 from physicsnemo.sym.amp import DerivScalers
@@ -124,6 +126,7 @@ class Solver(Trainer):
             self.scaler,
             self.deriv_scalers,
             step,
+            self.checkpoint_writer,
         )
 
     def record_constraints(self):
@@ -168,6 +171,11 @@ class Solver(Trainer):
     def get_num_losses(self):
         return self.domain.get_num_losses()
 
+    def evaluation_copy(self, memo: dict):
+        solver = copy.copy(self)
+        solver.domain = self.domain.evaluation_copy(memo)
+        return solver
+
     def setup_deriv_scaler(self, deriv_scalers: DerivScalers):
         self.domain.setup_deriv_scaler(deriv_scalers)
 
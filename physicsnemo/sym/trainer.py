@@ -16,6 +16,7 @@
 
 """PhysicsNeMo Solver"""
 
+import functools
 import os
 import time
 import numpy as np
@@ -36,6 +37,9 @@ from contextlib import ExitStack
 
 from .amp import DerivScalers, GradScaler, AmpManager
 from .utils.training.stop_criterion import StopCriterion
+from .utils.training.checkpoint import CheckpointWriter
+from .utils.training.metrics import MetricsBuffer
+from .utils.training.evaluation import BackgroundEvaluator
 from .constants import TF_SUMMARY, JIT_PYTORCH_VERSION
 from .hydra import (
     instantiate_optim,
@@ -44,6 +48,24 @@ from .hydra import (
     add_hydra_run_path,
 )
 from .distributed.manager import DistributedManager
+from .distributed.helpers import (
+    all_reduce_gradients,
+    all_reduce_mean,
+    broadcast_parameters,
+)
+
+
+class _EventTimer:
+    "Elapsed time between two cuda events in milliseconds, read lazily"
+
+    def __init__(self, start_event, end_event, scale: float = 1.0):
+        self.start_event = start_event
+        self.end_event = end_event
+        self.scale = scale
+
+    def __call__(self) -> float:
+        self.end_event.synchronize()
+        return self.start_event.elapsed_time(self.end_event) * self.scale
 
 
 class AdamMixin:
@@ -84,6 +106,7 @@ class AdamMixin:
             self.scaler.scale(loss_minibatch).backward()
             torch.cuda.nvtx.range_pop()
             losses.update(losses_minibatch)
+        self.synchronize_gradients(global_optimizer_model)
 
         return loss, dict(losses)
 
@@ -148,12 +171,28 @@ class AdaHessianMixin:
         # Set gradients of models manually
         for grad, param in zip(grads, global_optimizer_model.parameters()):
             param.grad = grad
+        # the Hessian-vector product needs the local gradient graph, only the
+        # gradient values are averaged here
+        self.synchronize_gradients(global_optimizer_model, keep_graph=True)
 
         return loss, dict(losses)
 
     def adahess_apply_gradients(self):
         self.adam_apply_gradients()
 
+    def adahess_synchronize_trace(self, optimizer):
+        """Average the Hutchinson estimate of the Hessian diagonal across ranks,
+        every rank differentiates only its local gradient graph"""
+        get_trace = optimizer.get_trace
+        group = self.manager.group("data_parallel")
+
+        def synchronized_get_trace(params, grads):
+            hutchinson_trace = get_trace(params, grads)
+            all_reduce_mean(hutchinson_trace, group=group)
+            return hutchinson_trace
+
+        optimizer.get_trace = synchronized_get_trace
+
 
 class BFGSMixin:
     """Special functions for training using BFGS optimizer"""
@@ -189,6 +228,7 @@ class BFGSMixin:
         loss = self.bfgs_aggregator(losses, self.bfgs_step)
 
         loss.backward()
+        self.synchronize_gradients(self.global_optimizer_model)
         self.bfgs_optim_steps += 1
         return loss
 
@@ -221,7 +261,11 @@ class Trainer(AdamMixin, AdaHessianMixin, BFGSMixin):
         self.max_steps = self.cfg.training.max_steps
         self.grad_agg_freq = self.cfg.training.grad_agg_freq
         self.save_network_freq = self.cfg.training.save_network_freq
+        self.async_checkpoint = self.cfg.training.async_checkpoint
+        self.keep_checkpoints = self.cfg.training.keep_checkpoints
+        self.background_eval = self.cfg.training.background_eval
         self.print_stats_freq = self.cfg.training.print_stats_freq
+        self.metrics_flush_freq = self.cfg.training.metrics_flush_freq
         self.summary_freq = self.cfg.training.summary_freq
         self.grad_clip_max_norm = self.cfg.training.grad_clip_max_norm
         self.monitor_grad_clip = self.cfg.training.monitor_grad_clip
@@ -237,6 +281,8 @@ class Trainer(AdamMixin, AdaHessianMixin, BFGSMixin):
 
         self.apply_gradients = self._apply_gradients
         self.compute_gradients = self._compute_gradients
+        self.checkpoint_writer = None
+        self.evaluator = None
 
         # make logger
         self.log = logging.getLogger(__name__)
@@ -271,6 +317,18 @@ class Trainer(AdamMixin, AdaHessianMixin, BFGSMixin):
     def get_saveable_models(self):
         raise NotImplementedError("Subclass of Constraint needs to implement this")
 
+    def synchronize_gradients(
+        self, global_optimizer_model: nn.Module, keep_graph: bool = False
+    ):
+        # in "domain" ddp mode all gradients are averaged with a bucketed all-reduce,
+        # otherwise every constraint's DDP wrapper has already synchronized them
+        if self.manager.distributed and self.manager.ddp_mode == "domain":
+            all_reduce_gradients(
+                global_optimizer_model.parameters(),
+                group=self.manager.group("data_parallel"),
+                keep_graph=keep_graph,
+            )
+
     def create_global_optimizer_model(self):
         raise NotImplementedError("Subclass of Constraint needs to implement this")
 
@@ -310,6 +368,9 @@ class Trainer(AdamMixin, AdaHessianMixin, BFGSMixin):
     def get_num_losses(self):
         raise NotImplementedError("Subclass of Constraint needs to implement this")
 
+    def evaluation_copy(self, memo: dict):
+        raise NotImplementedError("Subclass of Constraint needs to implement this")
+
     def _record_constraints(self):
         data_parallel_rank = (
             self.manager.group_rank("data_parallel") if self.manager.distributed else 0
@@ -324,46 +385,56 @@ class Trainer(AdamMixin, AdaHessianMixin, BFGSMixin):
                 f"{self.step_str} record constraint batch time: {time.time() - rec_inferencer_start:10.3e}s"
             )
 
-    def _record_validators(self, step):
+    def _record_validators(self, step, trainer=None):
+        # trainer is the evaluation copy when running in the background evaluator
+        trainer = self if trainer is None else trainer
+        step_str = f"[step: {step:10d}]"
         data_parallel_rank = (
             self.manager.group_rank("data_parallel") if self.manager.distributed else 0
         )
         if data_parallel_rank == 0:
             rec_validation_start = time.time()
-            self.validator_outvar = self.record_validators(step)
-            self.log.debug(
-                f"{self.step_str} saved validator results to {self.network_dir}"
-            )
+            self.validator_outvar = trainer.record_validators(step)
+            self.log.debug(f"{step_str} saved validator results to {self.network_dir}")
             self.log.info(
-                f"{self.step_str} record validators time: {time.time() - rec_validation_start:10.3e}s"
+                f"{step_str} record validators time: {time.time() - rec_validation_start:10.3e}s"
             )
 
-    def _record_inferencers(self, step):
+    def _record_inferencers(self, step, trainer=None):
+        trainer = self if trainer is None else trainer
+        step_str = f"[step: {step:10d}]"
         data_parallel_rank = (
             self.manager.group_rank("data_parallel") if self.manager.distributed else 0
         )
         if data_parallel_rank == 0:
             rec_inferencer_start = time.time()
-            self.record_inferencers(step)
-            self.log.debug(
-                f"{self.step_str} saved inferencer results to {self.network_dir}"
+            trainer.record_inferencers(step)
+            self.log.debug(f"{step_str} saved inferencer results to {self.network_dir}")
+            self.log.info(
+                f"{step_str} record inferencers time: {time.time() - rec_inferencer_start:10.3e}s"
             )
+
+    def _record_monitor_outvar(self, step, trainer=None):
+        trainer = self if trainer is None else trainer
+        step_str = f"[step: {step:10d}]"
+        data_parallel_rank = (
+            self.manager.group_rank("data_parallel") if self.manager.distributed else 0
+        )
+        if data_parallel_rank == 0 and self.has_monitors:
+            rec_monitor_start = time.time()
+            self.monitor_outvar = trainer.record_monitors(step)
+            self.log.debug(f"{step_str} saved monitor results to {self.network_dir}")
             self.log.info(
-                f"{self.step_str} record inferencers time: {time.time() - rec_inferencer_start:10.3e}s"
+                f"{step_str} record monitor time: {time.time() - rec_monitor_start:10.3e}s"
             )
 
     def _record_monitors(self, step):
+        # parameter histograms and gradient norms, monitor outputs are recorded
+        # by _record_monitor_outvar
         data_parallel_rank = (
             self.manager.group_rank("data_parallel") if self.manager.distributed else 0
         )
         if data_parallel_rank == 0:
-            if self.has_monitors:
-                rec_monitor_start = time.time()
-                self.monitor_outvar = self.record_monitors(step)
-                self.log.debug(
-                    f"{self.step_str} saved monitor results to {self.network_dir}"
-                )
-
             # write parameter histograms to tensorboard
             if self.summary_histograms != "off":
                 for (
@@ -438,17 +509,15 @@ class Trainer(AdamMixin, AdaHessianMixin, BFGSMixin):
                     "Monitors/grad_norm", total_norm.item(), step, new_style=True
                 )
 
-            if self.has_monitors:
-                self.log.info(
-                    f"{self.step_str} record monitor time: {time.time() - rec_monitor_start:10.3e}s"
-                )
-
     # check if stopping criterion is met
     def _check_stopping_criterion(self, loss, losses, step):
         if self.manager.rank == 0:
             if self.stop_criterion_metric is None:
                 return False
             elif step % self.stop_criterion_freq == 0:
+                # validator and monitor results of this step may still be running
+                if self.evaluator is not None:
+                    self.evaluator.wait()
                 criterion_metric_dict = {"loss": {"loss": loss.cpu().detach().numpy()}}
                 criterion_metric_dict["loss"].update(
                     {key: val.cpu().detach().numpy() for key, val in losses.items()}
@@ -562,6 +631,16 @@ class Trainer(AdamMixin, AdaHessianMixin, BFGSMixin):
         # load network
         self.initial_step = self.load_network()
 
+        # start every rank from the same parameters, DDP does this per constraint
+        if self.manager.distributed and self.manager.ddp_mode == "domain":
+            broadcast_parameters(
+                self.global_optimizer_model,
+                src=0,
+                group=self.manager.group("data_parallel"),
+            )
+            if self.compute_gradients == self.adahess_compute_gradients:
+                self.adahess_synchronize_trace(self.optimizer)
+
         # # make summary writer
         self.writer = SummaryWriter(
             log_dir=self.network_dir, purge_step=self.summary_freq + 1
@@ -587,13 +666,18 @@ class Trainer(AdamMixin, AdaHessianMixin, BFGSMixin):
             self.profiler_end_step = -1
 
         # Distributed barrier before starting the train loop
-        if self.manager.distributed:
-            dist.barrier(device_ids=[self.manager.local_rank])
+        DistributedManager.barrier()
         barrier_flag = False
 
+        # in "domain" ddp mode the gradient all-reduce of the next step keeps the
+        # ranks in lock-step, the per-constraint DDP wrappers rely on the barriers
+        # after summaries, recording and checkpointing
+        record_barriers = (
+            self.manager.distributed and self.manager.ddp_mode == "constraint"
+        )
+
         if self.manager.cuda:
             start_event = torch.cuda.Event(enable_timing=True)
-            end_event = torch.cuda.Event(enable_timing=True)
             start_event.record()
         else:
             t = time.time()
@@ -604,8 +688,39 @@ class Trainer(AdamMixin, AdaHessianMixin, BFGSMixin):
         else:
             self.sigterm_handler = sigterm_handler
 
+        # checkpoints are snapshot to host memory and written in the background
+        self.checkpoint_writer = CheckpointWriter(
+            asynchronous=self.async_checkpoint, keep=self.keep_checkpoints
+        )
+
         # train loop
         with ExitStack() as stack:
+            # flush pending checkpoints on exit, including termination by sigterm_handler
+            stack.callback(self.checkpoint_writer.close)
+
+            # losses are buffered on device and emitted every metrics_flush_freq steps
+            self.metrics = MetricsBuffer(self.writer, self.log)
+            stack.callback(self.metrics.close)
+
+            # validators, inferencers and monitors run on a snapshot of the
+            # networks in a background thread
+            self.evaluator = None
+            self.validator_outvar = {}
+            self.monitor_outvar = {}
+            if self.background_eval:
+                try:
+                    evaluator = BackgroundEvaluator(
+                        self.global_optimizer_model, self.log
+                    )
+                    self.evaluation_trainer = self.evaluation_copy(evaluator.memo)
+                    self.evaluator = evaluator
+                    stack.callback(self.evaluator.close)
+                except Exception as e:
+                    self.log.warning(
+                        f"Background evaluation is not supported ({e}), "
+                        "recording validators, inferencers and monitors in the training loop"
+                    )
+
             if self.profile:
                 # Add NVTX context if in profile mode
                 self.log.warning("Running in profiling mode")
@@ -655,13 +770,8 @@ class Trainer(AdamMixin, AdaHessianMixin, BFGSMixin):
                     # take scheduler step
                     self.scheduler.step()
 
-                # check for infs/NaNs in loss
-                if not torch.isfinite(loss):
-                    if self.amp_manager.enabled:
-                        self.log.warning(f"{self.step_str} loss went to INFs/NaNs")
-                    else:
-                        self.log.error(f"{self.step_str} loss went to INFs/NaNs")
-                        break
+                # check for infs/NaNs in loss, evaluated when the metrics are flushed
+                self.metrics.check_finite(step, loss)
 
                 # write train loss / learning rate tensorboard summaries
                 if step % self.summary_freq == 0:
@@ -669,38 +779,30 @@ class Trainer(AdamMixin, AdaHessianMixin, BFGSMixin):
                         # add train loss scalars
                         for key, value in losses.items():
                             if TF_SUMMARY:
-                                self.writer.add_scalar(
+                                self.metrics.add_scalar(
                                     "Train_/loss_L2" + str(key),
                                     value,
                                     step,
-                                    new_style=True,
                                 )
                             else:
-                                self.writer.add_scalar(
+                                self.metrics.add_scalar(
                                     "Train/loss_" + str(key),
                                     value,
                                     step,
-                                    new_style=True,
                                 )
                         if TF_SUMMARY:
-                            self.writer.add_scalar(
-                                "Optimzer/loss", loss, step, new_style=True
-                            )
-                            self.writer.add_scalar(
+                            self.metrics.add_scalar("Optimzer/loss", loss, step)
+                            self.metrics.add_scalar(
                                 "learning_rate/lr",
                                 self.scheduler.get_last_lr()[0],  # TODO: handle list
                                 step,
-                                new_style=True,
                             )
                         else:
-                            self.writer.add_scalar(
-                                "Train/loss_aggregated", loss, step, new_style=True
-                            )
-                            self.writer.add_scalar(
+                            self.metrics.add_scalar("Train/loss_aggregated", loss, step)
+                            self.metrics.add_scalar(
                                 "Train/learning_rate",
                                 self.scheduler.get_last_lr()[0],  # TODO: handle list
                                 step,
-                                new_style=True,
                             )
 
                         # track scaler and deriv_scalers states
@@ -715,43 +817,61 @@ class Trainer(AdamMixin, AdaHessianMixin, BFGSMixin):
                                 self.deriv_scalers._get_growth_tracker(),
                                 self.deriv_scalers.get_max_scale(),
                             )
-                            self.writer.add_scalar(
+                            self.metrics.add_scalar(
                                 "AMP/grad_scaler_log2",
                                 np.log2(self.scaler.get_scale()),
                                 step,
-                                new_style=True,
                             )
                             for key, scale in self.deriv_scalers.get_scale().items():
-                                self.writer.add_scalar(
+                                self.metrics.add_scalar(
                                     f"AMP/deriv_scaler_{key}_log2",
                                     np.log2(scale),
                                     step,
-                                    new_style=True,
                                 )
 
-                    if self.manager.distributed:
-                        barrier_flag = True
+                    barrier_flag = True
+
+                # check the buffered losses before recording or checkpointing, so
+                # a diverged model is neither evaluated nor saved
+                if self._is_record_step(step) and self._flush_metrics():
+                    break
 
                 # write train / inference / validation datasets to tensorboard and file
                 if step % self.cfg.training.rec_constraint_freq == 0:
                     barrier_flag = True
                     self._record_constraints()
 
+                eval_jobs = []
                 if (step % self.cfg.training.rec_validation_freq == 0) and (
                     self.has_validators
                 ):
                     barrier_flag = True
-                    self._record_validators(step)
+                    eval_jobs.append(self._record_validators)
 
                 if (step % self.cfg.training.rec_inference_freq == 0) and (
                     self.has_inferencers
                 ):
                     barrier_flag = True
-                    self._record_inferencers(step)
+                    eval_jobs.append(self._record_inferencers)
 
                 if step % self.cfg.training.rec_monitor_freq == 0:
                     barrier_flag = True
                     self._record_monitors(step)
+                    if self.has_monitors:
+                        eval_jobs.append(self._record_monitor_outvar)
+
+                if self.evaluator is None:
+                    for job in eval_jobs:
+                        job(step)
+                elif eval_jobs:
+                    # evaluate a snapshot of the weights while training continues
+                    self.evaluator.submit(
+                        step,
+                        [
+                            functools.partial(job, trainer=self.evaluation_trainer)
+                            for job in eval_jobs
+                        ],
+                    )
 
                 # save checkpoint
                 if step % self.save_network_freq == 0:
@@ -768,47 +888,54 @@ class Trainer(AdamMixin, AdaHessianMixin, BFGSMixin):
                         self.log.info(
                             f"{self.step_str} saved checkpoint to {add_hydra_run_path(self.network_dir)}"
                         )
-                    if self.manager.distributed:
-                        barrier_flag = True
+                    barrier_flag = True
 
-                if self.manager.distributed and barrier_flag:
-                    dist.barrier(device_ids=[self.manager.local_rank])
-                    barrier_flag = False
+                if record_barriers and barrier_flag:
+                    DistributedManager.barrier()
+                barrier_flag = False
 
                 # print loss stats
                 if step % self.print_stats_freq == 0:
-                    # synchronize and get end time
+                    # get end time, cuda events are only read when the metrics are flushed
                     if self.manager.cuda:
+                        end_event = torch.cuda.Event(enable_timing=True)
                         end_event.record()
-                        end_event.synchronize()
-                        elapsed_time = start_event.elapsed_time(
-                            end_event
-                        )  # in milliseconds
+                        elapsed_time = _EventTimer(
+                            start_event, end_event, scale=1.0 / self.print_stats_freq
+                        )
                     else:
                         t_end = time.time()
-                        elapsed_time = (t_end - t) * 1.0e3  # in milliseconds
+                        elapsed_time = (
+                            (t_end - t) * 1.0e3 / self.print_stats_freq
+                        )  # in milliseconds
 
                     # Reduce loss across all GPUs
                     if self.manager.distributed:
                         dist.reduce(loss, 0, op=dist.ReduceOp.AVG)
-                        elapsed_time = torch.tensor(elapsed_time).to(self.device)
-                        dist.reduce(elapsed_time, 0, op=dist.ReduceOp.AVG)
-                        elapsed_time = elapsed_time.cpu().numpy()[()]
 
                     # print statement
-                    print_statement = (
-                        f"{self.step_str} loss: {loss.cpu().detach().numpy():10.3e}"
-                    )
+                    print_statement = "{step_str} loss: {loss:10.3e}"
                     if step >= self.initial_step + self.print_stats_freq:
-                        print_statement += f", time/iteration: {elapsed_time / self.print_stats_freq:10.3e} ms"
+                        print_statement += ", time/iteration: {time:10.3e} ms"
                     if self.manager.rank == 0:
-                        self.log.info(print_statement)
+                        self.metrics.add_message(
+                            print_statement,
+                            step_str=self.step_str,
+                            loss=loss,
+                            time=elapsed_time,
+                        )
 
                     if self.manager.cuda:
+                        start_event = torch.cuda.Event(enable_timing=True)
                         start_event.record()
                     else:
                         t = time.time()
 
+                # emit buffered metrics with a single device to host copy
+                if step % self.metrics_flush_freq == 0 or step >= self.max_steps:
+                    if self._flush_metrics():
+                        break
+
                 # check stopping criterion
                 stop_training = self._check_stopping_criterion(loss, losses, step)
                 if stop_training:
@@ -828,6 +955,34 @@ class Trainer(AdamMixin, AdaHessianMixin, BFGSMixin):
 
                 torch.cuda.nvtx.range_pop()
 
+    def _is_record_step(self, step: int) -> bool:
+        "True if the step records constraints, validators, inferencers, monitors or saves a checkpoint"
+        return (
+            step % self.cfg.training.rec_constraint_freq == 0
+            or (
+                step % self.cfg.training.rec_validation_freq == 0
+                and self.has_validators
+            )
+            or (
+                step % self.cfg.training.rec_inference_freq == 0
+                and self.has_inferencers
+            )
+            or step % self.cfg.training.rec_monitor_freq == 0
+            or step % self.save_network_freq == 0
+        )
+
+    def _flush_metrics(self) -> bool:
+        "Emit the buffered metrics, returns True if training has to stop on INFs/NaNs"
+        nonfinite_step = self.metrics.flush()
+        if nonfinite_step is None:
+            return False
+        step_str = f"[step: {nonfinite_step:10d}]"
+        if self.amp_manager.enabled:
+            self.log.warning(f"{step_str} loss went to INFs/NaNs")
+            return False
+        self.log.error(f"{step_str} loss went to INFs/NaNs")
+        return True
+
     def _cuda_graph_training_step(self, step: int):
         # Training step method for using cuda graphs
         # Warm up
@@ -855,8 +1010,7 @@ class Trainer(AdamMixin, AdaHessianMixin, BFGSMixin):
         # Record graph
         elif (step - self.initial_step) == self.cfg.cuda_graph_warmup:
             torch.cuda.synchronize()
-            if self.manager.distributed:
-                dist.barrier(device_ids=[self.manager.local_rank])
+            DistributedManager.barrier()
 
             if self.cfg.cuda_graph_warmup < 11:
                 self.log.warning(
@@ -927,6 +1081,7 @@ class Trainer(AdamMixin, AdaHessianMixin, BFGSMixin):
         if self.has_inferencers:
             self._record_inferencers(self.step)
         if self.has_monitors:
+            self._record_monitor_outvar(self.step)
             self._record_monitors(self.step)
 
     def _stream(
@@ -1138,6 +1293,7 @@ class Trainer(AdamMixin, AdaHessianMixin, BFGSMixin):
         scaler: GradScaler,
         deriv_scalers: DerivScalers,
         step: int,
+        checkpoint_writer: Optional[CheckpointWriter] = None,
     ):
         # Get model parallel rank so all processes in the first model parallel group
         # can save their checkpoint. In the case without model parallelism, model_parallel_rank
@@ -1147,19 +1303,34 @@ class Trainer(AdamMixin, AdaHessianMixin, BFGSMixin):
             manager.group_rank("model_parallel") if manager.distributed else 0
         )
 
+        # step, optimizer, aggregator, and scaler
+        optim_checkpoint = {
+            "step": step,
+            "optimizer_state_dict": optimizer.state_dict(),
+            "aggregator_state_dict": aggregator.state_dict(),
+            "scheduler_state_dict": scheduler.state_dict(),
+            "scaler_state_dict": scaler.state_dict(),
+            "deriv_scalers_state_dict": deriv_scalers.state_dict(),
+        }
+
+        # hand a snapshot of all state dicts to the checkpoint writer
+        if checkpoint_writer is not None:
+            files = {
+                network_dir + "/" + model.checkpoint_filename: model.state_dict()
+                for model in models
+            }
+            files[network_dir + f"/optim_checkpoint.{model_parallel_rank}.pth"] = (
+                optim_checkpoint
+            )
+            checkpoint_writer.save(files, step)
+            return
+
         # save models
         for model in models:
             model.save(network_dir)
 
         # save step, optimizer, aggregator, and scaler
         torch.save(
-            {
-                "step": step,
-                "optimizer_state_dict": optimizer.state_dict(),
-                "aggregator_state_dict": aggregator.state_dict(),
-                "scheduler_state_dict": scheduler.state_dict(),
-                "scaler_state_dict": scaler.state_dict(),
-                "deriv_scalers_state_dict": deriv_scalers.state_dict(),
-            },
+            optim_checkpoint,
             network_dir + f"/optim_checkpoint.{model_parallel_rank}.pth",
         )
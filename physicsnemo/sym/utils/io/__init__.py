@@ -31,3 +31,4 @@ from .plotter import (
     DeepONetValidatorPlotter,
 )
 from .csv_rw import csv_to_dict, dict_to_csv
+from .hdf5 import HDF5ResultsWriter, HDF5ResultsReader, var_to_hdf5
@@ -20,13 +20,30 @@ saving CSV files
 """
 
 import csv
+import hashlib
+import logging
+import os
+import warnings
+
 import numpy as np
 
+logger = logging.getLogger(__name__)
+
 
-def csv_to_dict(filename, mapping=None, delimiter=","):
+def csv_to_dict(
+    filename,
+    mapping=None,
+    delimiter=",",
+    dtype=np.float64,
+    cache=False,
+    chunk_rows=1048576,
+):
     """
     reads a csv file to a dictionary of columns
 
+    The file is parsed in chunks of rows with numpy's compiled text parser,
+    only the columns that are loaded are converted and kept in memory.
+
     Parameters
     ----------
     filename : str
@@ -38,6 +55,16 @@ def csv_to_dict(filename, mapping=None, delimiter=","):
       keys from CSV to keys in dict.
     delimiter: str
       The string used for separating values.
+    dtype: np.dtype
+      Data type of the arrays, by default np.float64.
+      Use np.float32 to halve the memory of large files.
+    cache: bool
+      If True the parsed columns are saved to a `.npy` file next to the
+      csv file, keyed by the file size and modification time, and loaded
+      memory mapped (copy on write) in later calls instead of parsing
+      the file again, by default False
+    chunk_rows: int
+      Number of rows parsed at once, by default 1048576
 
     Returns
     -------
@@ -45,25 +72,97 @@ def csv_to_dict(filename, mapping=None, delimiter=","):
       numpy arrays have shape [N, 1].
     """
 
-    # Load csv file
-    values = np.loadtxt(filename, skiprows=1, delimiter=delimiter, unpack=False)
-
     # get column keys
-    csvfile = open(filename)
-    reader = csv.reader(csvfile, delimiter=delimiter)
-    first_line = next(iter(reader))
+    with open(filename) as csvfile:
+        reader = csv.reader(csvfile, delimiter=delimiter)
+        first_line = [name.strip() for name in next(iter(reader))]
 
-    # set dictionary
-    csv_dict = {}
+    # columns to load
+    usecols = []
+    keys = []
     for i, name in enumerate(first_line):
         if mapping is not None:
-            if name.strip() in mapping.keys():
-                csv_dict[mapping[name.strip()]] = values[:, i : i + 1]
+            if name in mapping.keys():
+                usecols.append(i)
+                keys.append(mapping[name])
         else:
-            csv_dict[name.strip()] = values[:, i : i + 1]
+            usecols.append(i)
+            keys.append(name)
+    if not usecols:
+        return {}
+
+    cache_file = None
+    values = None
+    if cache:
+        cache_file = _csv_cache_file(filename, first_line, usecols, delimiter, dtype)
+        if os.path.exists(cache_file):
+            values = np.load(cache_file, mmap_mode="c")
+
+    if values is None:
+        values = _load_csv_columns(filename, delimiter, usecols, dtype, chunk_rows)
+        if cache_file is not None:
+            _save_csv_cache(filename, cache_file, values)
+
+    # set dictionary, columns are stored contiguously
+    csv_dict = {}
+    for i, key in enumerate(keys):
+        csv_dict[key] = values[i][:, None]
     return csv_dict
 
 
+def _load_csv_columns(filename, delimiter, usecols, dtype, chunk_rows):
+    "parse the columns of a csv file in chunks to an array of shape [ncols, N]"
+    chunks = []
+    with open(filename) as csvfile:
+        csvfile.readline()  # header
+        with warnings.catch_warnings():
+            # the last read of an exhausted file warns about empty input
+            warnings.simplefilter("ignore", UserWarning)
+            while True:
+                chunk = np.loadtxt(
+                    csvfile,
+                    delimiter=delimiter,
+                    usecols=usecols,
+                    dtype=dtype,
+                    ndmin=2,
+                    max_rows=chunk_rows,
+                )
+                if chunk.shape[0] == 0:
+                    break
+                chunks.append(chunk.T)
+    if not chunks:
+        return np.zeros((len(usecols), 0), dtype=dtype)
+    return np.ascontiguousarray(np.concatenate(chunks, axis=1))
+
+
+def _csv_cache_file(filename, header, usecols, delimiter, dtype):
+    "cache file name of the parsed columns, changes when the csv file changes"
+    stat = os.stat(filename)
+    key = repr(
+        (
+            stat.st_size,
+            stat.st_mtime_ns,
+            [header[i] for i in usecols],
+            delimiter,
+            np.dtype(dtype).str,
+        )
+    )
+    return f"{filename}.{hashlib.sha1(key.encode()).hexdigest()[:16]}.npy"
+
+
+def _save_csv_cache(filename, cache_file, values):
+    "write the cache atomically, caching is skipped if the directory is read only"
+    tmp_file = cache_file + f".{os.getpid()}.tmp"
+    try:
+        with open(tmp_file, "wb") as f:
+            np.save(f, values)
+        os.replace(tmp_file, cache_file)
+    except OSError as e:
+        logger.warning(f"could not cache {filename}: {e}")
+        if os.path.exists(tmp_file):
+            os.remove(tmp_file)
+
+
 def dict_to_csv(dictonary, filename):
     """
     saves a dict of numpy arrays to csv file
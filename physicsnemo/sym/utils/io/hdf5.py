@@ -0,0 +1,172 @@
+# SPDX-FileCopyrightText: Copyright (c) 2023 - 2024 NVIDIA CORPORATION & AFFILIATES.
+# SPDX-FileCopyrightText: All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Helper functions for reading and writing chunked HDF5 result files"""
+
+import h5py
+import numpy as np
+from typing import Dict, List, Union
+
+# target size of a chunk, chunks are the unit of compression and of partial reads
+CHUNK_BYTES = 2**20
+
+
+class HDF5ResultsWriter:
+    """Appendable, columnar HDF5 results file
+
+    Every variable is stored as its own chunked, resizable dataset in a group
+    per training step (`step_<step>`), so results of several steps accumulate
+    in one file and a step can be written batch by batch with `append`.
+    Writing a step that already exists replaces it.
+
+    Parameters
+    ----------
+    file_path : str
+        File directory/name of the results file, `.h5` is appended if missing
+    step : int, optional
+        Training step of the results, by default 0
+    compression : Union[str, None], optional
+        HDF5 compression filter of the datasets, e.g. "lzf" or "gzip", by default "lzf"
+    """
+
+    def __init__(
+        self,
+        file_path: str,
+        step: int = 0,
+        compression: Union[str, None] = "lzf",
+    ):
+        file_path = str(file_path)
+        if not file_path.endswith(".h5"):
+            file_path += ".h5"
+        self.file_path = file_path
+        self.compression = compression
+        self.file = h5py.File(file_path, "a")
+
+        name = f"step_{step:08d}"
+        if name in self.file:
+            del self.file[name]
+        self.group = self.file.create_group(name)
+        self.group.attrs["step"] = step
+
+    def append(self, var_dict: Dict[str, np.array]):
+        """Append rows to the variables of this step
+
+        Parameters
+        ----------
+        var_dict : Dict[str, np.array]
+            Dictionary of variables in the array format [nstates, ...]
+        """
+        for key, value in var_dict.items():
+            value = np.asarray(value)
+            if key not in self.group:
+                row_bytes = value.dtype.itemsize * int(np.prod(value.shape[1:]))
+                rows = max(1, CHUNK_BYTES // max(row_bytes, 1))
+                self.group.create_dataset(
+                    key,
+                    data=value,
+                    maxshape=(None,) + value.shape[1:],
+                    chunks=(rows,) + value.shape[1:],
+                    compression=self.compression,
+                )
+            else:
+                dataset = self.group[key]
+                start = dataset.shape[0]
+                dataset.resize(start + value.shape[0], axis=0)
+                dataset[start:] = value
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+class HDF5ResultsReader:
+    """Reader of results files written by `HDF5ResultsWriter`
+
+    Variables are returned as `h5py.Dataset` objects that only read the
+    chunks that are sliced, e.g. `reader.read()["u"][:1000]`, while the
+    reader is open.
+
+    Parameters
+    ----------
+    file_path : str
+        File directory/name of the results file, `.h5` is appended if missing
+    """
+
+    def __init__(self, file_path: str):
+        file_path = str(file_path)
+        if not file_path.endswith(".h5"):
+            file_path += ".h5"
+        self.file = h5py.File(file_path, "r")
+
+    @property
+    def steps(self) -> List[int]:
+        "Training steps in the file, in increasing order"
+        return sorted(int(group.attrs["step"]) for group in self.file.values())
+
+    def read(self, step: int = None) -> Dict[str, h5py.Dataset]:
+        """Variables of a step
+
+        Parameters
+        ----------
+        step : int, optional
+            Training step to read, by default the last step in the file
+
+        Returns
+        -------
+        Dict[str, h5py.Dataset]
+            Dictionary of lazily read variables, use `[:]` to load into memory
+        """
+        if step is None:
+            step = self.steps[-1]
+        return dict(self.file[f"step_{step:08d}"].items())
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+def var_to_hdf5(
+    var_dict: Dict[str, np.array],
+    file_path: str,
+    step: int = 0,
+    compression: Union[str, None] = "lzf",
+):
+    """Helper method to export variables to a chunked HDF5 results file.
+    Appends the step to the results of previous steps in the file.
+
+    Parameters
+    ----------
+    var_dict : Dict[str, np.array]
+        Dictionary of variables in the array format [nstates, ...]
+    file_path : str
+        File directory/name of output HDF5 file
+    step : int, optional
+        Training step of the results, by default 0
+    compression : Union[str, None], optional
+        HDF5 compression filter of the datasets, by default "lzf"
+    """
+    with HDF5ResultsWriter(file_path, step, compression) as writer:
+        writer.append(var_dict)
@@ -0,0 +1,144 @@
+# SPDX-FileCopyrightText: Copyright (c) 2023 - 2024 NVIDIA CORPORATION & AFFILIATES.
+# SPDX-FileCopyrightText: All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import shutil
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict
+
+import torch
+
+
+def _to_host(obj: Any) -> Any:
+    "Recursively copy the tensors of a state dict to host memory"
+    if isinstance(obj, torch.Tensor):
+        return obj.detach().to("cpu", copy=True)
+    elif isinstance(obj, dict):
+        return {key: _to_host(value) for key, value in obj.items()}
+    elif isinstance(obj, list):
+        return [_to_host(value) for value in obj]
+    elif isinstance(obj, tuple):
+        return tuple(_to_host(value) for value in obj)
+    return obj
+
+
+class CheckpointWriter:
+    """
+    Checkpoint writer that snapshots state dicts to host memory and writes
+    them on a background thread.
+
+    Every file is first written to a temporary file and then atomically
+    renamed, so an interrupted write never leaves a truncated checkpoint.
+    At most one checkpoint is in flight, a new save waits for the previous
+    one to finish.
+
+    Parameters
+    ----------
+    asynchronous : bool, optional
+        If False, checkpoints are written in the calling thread, by default True
+    keep : int, optional
+        Number of checkpoints to keep. The latest checkpoint is always written
+        to the given file names, if `keep > 1` the last `keep` checkpoints are
+        also kept in `<directory>/checkpoints/step_<step>/`, by default 1
+    """
+
+    def __init__(self, asynchronous: bool = True, keep: int = 1):
+        if keep < 1:
+            raise ValueError("keep must be at least 1")
+        self.asynchronous = asynchronous
+        self.keep = keep
+        self._executor = None
+        self._future = None
+        self._history = deque()
+
+    def save(self, files: Dict[str, Any], step: int):
+        """
+        Save a checkpoint
+
+        Parameters
+        ----------
+        files : Dict[str, Any]
+            Dictionary of file paths to objects (e.g. state dicts) to save
+        step : int
+            Training step of the checkpoint
+        """
+        # wait for the previous checkpoint, bounds the host memory to one snapshot
+        self.flush()
+
+        # snapshot now so training can continue to update the parameters
+        files = {path: _to_host(obj) for path, obj in files.items()}
+        if not self.asynchronous:
+            self._write(files, step)
+            return
+
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="checkpoint_writer"
+            )
+        self._future = self._executor.submit(self._write, files, step)
+
+    def flush(self):
+        "Block until the pending checkpoint is written, re-raises write errors"
+        if self._future is not None:
+            future, self._future = self._future, None
+            future.result()
+
+    def close(self):
+        "Flush the pending checkpoint and stop the background thread"
+        try:
+            self.flush()
+        finally:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
+
+    def _write(self, files: Dict[str, Any], step: int):
+        for path, obj in files.items():
+            tmp_path = path + ".tmp"
+            torch.save(obj, tmp_path)
+            os.replace(tmp_path, path)
+
+        if self.keep > 1:
+            self._keep_history(list(files.keys()), step)
+
+    def _keep_history(self, paths, step: int):
+        # hard link the latest files into a per step directory
+        history = []
+        for path in paths:
+            step_dir = os.path.join(
+                os.path.dirname(path), "checkpoints", f"step_{step:08d}"
+            )
+            os.makedirs(step_dir, exist_ok=True)
+            step_path = os.path.join(step_dir, os.path.basename(path))
+            if os.path.exists(step_path):
+                os.remove(step_path)
+            try:
+                os.link(path, step_path)
+            except OSError:
+                shutil.copy2(path, step_path)
+            history.append(step_path)
+        self._history.append(history)
+
+        # remove the files of checkpoints older than the last `keep`
+        while len(self._history) > self.keep:
+            for step_path in self._history.popleft():
+                if os.path.exists(step_path):
+                    os.remove(step_path)
+                try:
+                    os.rmdir(os.path.dirname(step_path))
+                except OSError:
+                    pass  # other ranks may still have files in this directory
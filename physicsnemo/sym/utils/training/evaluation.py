@@ -0,0 +1,141 @@
+# SPDX-FileCopyrightText: Copyright (c) 2023 - 2024 NVIDIA CORPORATION & AFFILIATES.
+# SPDX-FileCopyrightText: All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import copy
+import types
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List
+
+import torch
+import torch.nn as nn
+
+
+def evaluation_copy(obj, memo: dict):
+    """
+    Shallow copy of a validator, inferencer or monitor whose graph is deep
+    copied with `memo`, so networks already in `memo` are shared with the copy.
+    Methods bound to `obj` in its attributes (e.g. `forward`) are rebound.
+    """
+    obj_copy = copy.copy(obj)
+    if hasattr(obj, "model"):
+        obj_copy.model = copy.deepcopy(obj.model, memo)
+    for key, value in vars(obj).items():
+        if isinstance(value, types.MethodType) and value.__self__ is obj:
+            setattr(obj_copy, key, types.MethodType(value.__func__, obj_copy))
+    return obj_copy
+
+
+class BackgroundEvaluator:
+    """
+    Runs evaluation jobs (validators, inferencers, monitors) in a background
+    thread on a snapshot of the model weights.
+
+    The networks are copied once, every `submit` copies the current weights
+    into this copy and hands the jobs to a single worker thread. At most one
+    evaluation is in flight, if the previous one has not finished the new one
+    is dropped so training is never blocked.
+
+    Parameters
+    ----------
+    models : nn.Module
+        Module holding the networks being trained (e.g. the global optimizer model)
+    log : logging.Logger
+        Logger used to report dropped evaluations
+    """
+
+    def __init__(self, models: nn.Module, log):
+        self.models = models
+        self.log = log
+        # copies of the networks are registered in the memo so every
+        # evaluation copy made with it runs on the same snapshot
+        self.memo = {}
+        self.snapshot_models = copy.deepcopy(models, self.memo)
+        self.snapshot_models.requires_grad_(False)
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="background_evaluator"
+        )
+        self._future = None
+        self._stream = None
+        if next(models.parameters()).is_cuda:
+            self._stream = torch.cuda.Stream()
+
+    @property
+    def busy(self) -> bool:
+        return self._future is not None and not self._future.done()
+
+    def submit(self, step: int, jobs: List[Callable]) -> bool:
+        """
+        Snapshot the weights and run `jobs` in the background
+
+        Parameters
+        ----------
+        step : int
+            Training step of the snapshot
+        jobs : List[Callable]
+            Functions called with the step in the worker thread
+
+        Returns
+        -------
+        bool
+            False if the evaluation was dropped because the previous one is
+            still running.
+        """
+        if self.busy:
+            self.log.warning(
+                f"[step: {step:10d}] previous evaluation still running, skipping evaluation"
+            )
+            return False
+        self.wait()
+
+        # copy the current weights, on device this is queued on the current stream
+        with torch.no_grad():
+            for snapshot, value in zip(
+                self.snapshot_models.state_dict().values(),
+                self.models.state_dict().values(),
+            ):
+                snapshot.copy_(value)
+        event = None
+        if self._stream is not None:
+            event = torch.cuda.Event()
+            event.record()
+
+        self._future = self._executor.submit(self._run, step, jobs, event)
+        return True
+
+    def _run(self, step: int, jobs: List[Callable], event):
+        if self._stream is None:
+            for job in jobs:
+                job(step)
+            return
+        # evaluate on a side stream once the weight copy has finished
+        with torch.cuda.stream(self._stream):
+            self._stream.wait_event(event)
+            for job in jobs:
+                job(step)
+        self._stream.synchronize()
+
+    def wait(self):
+        "Block until the running evaluation finished, re-raises its errors"
+        if self._future is not None:
+            future, self._future = self._future, None
+            future.result()
+
+    def close(self):
+        "Wait for the running evaluation and stop the worker thread"
+        try:
+            self.wait()
+        finally:
+            self._executor.shutdown(wait=True)
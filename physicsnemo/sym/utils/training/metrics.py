@@ -0,0 +1,153 @@
+# SPDX-FileCopyrightText: Copyright (c) 2023 - 2024 NVIDIA CORPORATION & AFFILIATES.
+# SPDX-FileCopyrightText: All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import math
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional, Union
+
+import torch
+
+
+class MetricsBuffer:
+    """
+    Buffer for training metrics that defers the device to host transfer.
+
+    Scalars and log messages are accumulated as device tensors and copied to
+    the host in one batched transfer on `flush`. The summary writer and the
+    logger are then called from a background thread so the training loop is
+    not blocked by host synchronizations or file I/O.
+
+    Parameters
+    ----------
+    writer : SummaryWriter
+        Tensorboard summary writer the scalars are written to
+    log : logging.Logger
+        Logger the messages are written to
+    asynchronous : bool, optional
+        If False, scalars and messages are written in the calling thread,
+        by default True
+    """
+
+    def __init__(self, writer, log, asynchronous: bool = True):
+        self.writer = writer
+        self.log = log
+        self.asynchronous = asynchronous
+        self._scalars = []
+        self._messages = []
+        self._finite_checks = []
+        self._executor = None
+        self._future = None
+
+    @staticmethod
+    def _buffer_value(value: Union[torch.Tensor, float, Callable]):
+        # clone so static tensors (e.g. cuda graph outputs) can be overwritten
+        if isinstance(value, torch.Tensor):
+            return value.detach().reshape(()).clone()
+        return value
+
+    def add_scalar(self, tag: str, value: Union[torch.Tensor, float], step: int):
+        "Buffer a scalar for the summary writer"
+        self._scalars.append((tag, MetricsBuffer._buffer_value(value), step))
+
+    def add_message(self, msg: str, **values: Union[torch.Tensor, float, Callable]):
+        """
+        Buffer a log message, `msg` is formatted with `values` on flush.
+        Values can be tensors, numbers or callables evaluated after the
+        batched transfer (e.g. to read CUDA event timings).
+        """
+        values = {
+            key: MetricsBuffer._buffer_value(value) for key, value in values.items()
+        }
+        self._messages.append((msg, values))
+
+    def check_finite(self, step: int, value: torch.Tensor):
+        "Buffer a tensor that is checked for INFs/NaNs on flush"
+        self._finite_checks.append((step, MetricsBuffer._buffer_value(value)))
+
+    def flush(self) -> Optional[int]:
+        """
+        Transfer the buffered tensors to the host in one copy and emit them.
+
+        Returns
+        -------
+        Optional[int]
+            First step with a non-finite value passed to `check_finite`, None
+            if all values are finite.
+        """
+        scalars, self._scalars = self._scalars, []
+        messages, self._messages = self._messages, []
+        finite_checks, self._finite_checks = self._finite_checks, []
+
+        # gather every buffered tensor into a single device to host copy
+        tensors = [value for _, value, _ in scalars if isinstance(value, torch.Tensor)]
+        for _, values in messages:
+            tensors += [v for v in values.values() if isinstance(v, torch.Tensor)]
+        tensors += [value for _, value in finite_checks]
+        if tensors:
+            host = torch.stack([t.float().to(tensors[0].device) for t in tensors])
+            host = iter(host.cpu().tolist())
+
+            def to_host(value: Any):
+                return next(host) if isinstance(value, torch.Tensor) else value
+
+            scalars = [(tag, to_host(value), step) for tag, value, step in scalars]
+            messages = [
+                (msg, {key: to_host(value) for key, value in values.items()})
+                for msg, values in messages
+            ]
+            finite_checks = [(step, to_host(value)) for step, value in finite_checks]
+
+        # evaluate deferred values after the transfer synchronized the device
+        messages = [
+            (msg, {k: v() if callable(v) else v for k, v in values.items()})
+            for msg, values in messages
+        ]
+
+        # wait for the previous emission to keep the output ordered
+        if self._future is not None:
+            self._future.result()
+            self._future = None
+        if self.asynchronous:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=1, thread_name_prefix="metrics_writer"
+                )
+            self._future = self._executor.submit(self._emit, scalars, messages)
+        else:
+            self._emit(scalars, messages)
+
+        for step, value in finite_checks:
+            if not math.isfinite(value):
+                return step
+        return None
+
+    def close(self):
+        "Flush the buffer and stop the background thread"
+        try:
+            self.flush()
+            if self._future is not None:
+                self._future.result()
+                self._future = None
+        finally:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
+
+    def _emit(self, scalars, messages):
+        for tag, value, step in scalars:
+            self.writer.add_scalar(tag, value, step, new_style=True)
+        for msg, values in messages:
+            self.log.info(msg.format(**values))
@@ -25,7 +25,8 @@ from physicsnemo.sym.domain.constraint import (
     IntegralBoundaryConstraint,
     VariationalDomainConstraint,
 )
-from physicsnemo.sym.loss import Loss
+from physicsnemo.sym.domain.constraint.constraint import _BatchBufferPool
+from physicsnemo.sym.loss import Loss, IntegralLossNorm
 from physicsnemo.sym.geometry.parameterization import Parameterization, Bounds
 
 # TODO: Add some more complex geometery that is the union of multiple shapes to check boundary sampling
@@ -236,6 +237,52 @@ def test_IntegralBoundaryConstraint():
             assert torch.isclose(loss["u"], torch.tensor(0.0), rtol=1e-3, atol=1e-3)
 
 
+def test_IntegralBoundaryConstraint_segmented():
+    "check the packed segment-sum integral loss matches the per integral list loss"
+
+    class ListIntegralLoss(Loss):
+        def forward(
+            self,
+            list_invar,
+            list_pred_outvar,
+            list_true_outvar,
+            list_lambda_weighting,
+            step,
+        ):
+            return IntegralLossNorm._loss(
+                list_invar,
+                list_pred_outvar,
+                list_true_outvar,
+                list_lambda_weighting,
+                step,
+                2,
+            )
+
+    node = Node.from_sympy(Symbol("z") ** 2, "u")
+    plane = Plane((0, 0, 0), (0, 2, 1), 1)
+    for fixed_dataset in [True, False]:
+        constraint = IntegralBoundaryConstraint(
+            nodes=[node],
+            geometry=plane,
+            outvar={"u": 1.0 / 3.0},
+            batch_size=4,
+            integral_batch_size=1000,
+            batch_per_epoch=2,
+            fixed_dataset=fixed_dataset,
+        )
+        constraint.load_data()
+        constraint.forward()
+
+        # all integrals evaluated in a single flat forward
+        assert constraint._input_vars["z"].shape == (4000, 1)
+        assert constraint._output_vars["u"].shape == (4000, 1)
+        loss = constraint.loss(step=0)
+
+        constraint._loss = ListIntegralLoss()
+        list_loss = constraint.loss(step=0)
+        assert torch.isclose(loss["u"], list_loss["u"], rtol=1e-5, atol=1e-7)
+
+
 def test_VariationalDomainConstraint():
     "define a parabola node, create variational domain constraint over it and check its loss is zero"
 
@@ -279,6 +326,23 @@ def test_VariationalDomainConstraint():
         assert torch.isclose(loss["u"], torch.tensor(0.0), rtol=1e-5, atol=1e-5)
 
 
+def test_BatchBufferPool():
+    "check a batch is packed into one reused buffer and returned as views per key"
+
+    pool = _BatchBufferPool("cpu")
+    for step in range(2):
+        invar = {"x": torch.rand(8, 1), "y": torch.rand(8, 1)}
+        outvar = {"u": torch.rand(8, 2)}
+        input_vars, target_vars = pool.transfer([invar, outvar], [True, False])
+        assert torch.equal(input_vars["y"], invar["y"])
+        assert torch.equal(target_vars["u"], outvar["u"])
+        assert input_vars["x"].requires_grad and input_vars["x"].is_leaf
+        assert not target_vars["u"].requires_grad
+        # all keys are views of one buffer, reused by the next batch
+        assert input_vars["x"].untyped_storage().data_ptr() == pool._device.data_ptr()
+        assert target_vars["u"].data_ptr() == pool._device.data_ptr() + 16 * 4
+
+
 if __name__ == "__main__":
     test_PointwiseBoundaryConstraint()
 
@@ -21,7 +21,9 @@ from sympy import Symbol, sin
 from physicsnemo.sym.geometry.primitives_2d import Rectangle
 from physicsnemo.sym.dataset import (
     DictImportanceSampledPointwiseIterableDataset,
+    DictMemmapPointwiseIterableDataset,
 )
+from physicsnemo.sym.domain.constraint import Constraint
 from physicsnemo.sym.domain.constraint.utils import _compute_outvar
 from physicsnemo.sym.geometry.parameterization import Bounds
 
@@ -63,5 +65,58 @@ def test_DictImportanceSampledPointwiseIterableDataset():
     assert np.isclose(torch.sum(outvar["u"] * invar["area"]), 0.0, rtol=1e-2, atol=1e-2)
 
 
+def test_DictMemmapPointwiseIterableDataset(tmp_path):
+    "check one epoch of block shuffled batches visits every example once, also with dataloader workers"
+
+    n = 1000
+    x = np.arange(n, dtype=np.float32)[:, None]
+    np.save(tmp_path / "x.npy", x)
+    dataset = DictMemmapPointwiseIterableDataset(
+        invar={"x": str(tmp_path / "x.npy"), "area": 1.0},
+        outvar={"u": 2 * x},
+        batch_size=100,
+        lambda_weighting={"u": 3.0},
+        block_size=64,
+        shuffle_blocks=4,
+    )
+    assert isinstance(dataset.arrays["x"], np.memmap)
+
+    for num_workers in [0, 2]:
+        dataloader = Constraint.get_dataloader(
+            dataset=dataset,
+            batch_size=100,
+            shuffle=True,
+            drop_last=True,
+            num_workers=num_workers,
+        )
+        dataloader = iter(dataloader)
+        batches = [next(dataloader) for _ in range(n // 100)]
+        for invar, outvar, lambda_weighting in batches:
+            assert invar["x"].shape == (100, 1)
+            assert torch.equal(outvar["u"], 2 * invar["x"])
+            assert torch.all(invar["area"] == 1.0)
+            assert torch.all(lambda_weighting["u"] == 3.0)
+        x_epoch = torch.cat([invar["x"] for invar, _, _ in batches])
+        if num_workers == 0:
+            # shuffled, every example once
+            assert not torch.equal(x_epoch[:, 0], torch.arange(n, dtype=torch.float32))
+            assert torch.equal(
+                torch.sort(x_epoch[:, 0]).values, torch.arange(n, dtype=torch.float32)
+            )
+        else:
+            # workers read disjoint blocks
+            assert len(torch.unique(x_epoch)) > n // 2
+
+    # the seed fixes the order of the batches
+    np.random.seed(0)
+    first = next(iter(dataset))[0]["x"]
+    np.random.seed(1)
+    assert torch.equal(next(iter(dataset))[0]["x"], first)
+
+
 if __name__ == "__main__":
+    import tempfile
+    import pathlib
+
     test_DictImportanceSampledPointwiseIterableDataset()
+    test_DictMemmapPointwiseIterableDataset(pathlib.Path(tempfile.mkdtemp()))
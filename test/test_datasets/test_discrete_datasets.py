@@ -0,0 +1,66 @@
+# SPDX-FileCopyrightText: Copyright (c) 2023 - 2024 NVIDIA CORPORATION & AFFILIATES.
+# SPDX-FileCopyrightText: All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import h5py
+import numpy as np
+import torch
+
+from physicsnemo.sym.dataset import HDF5GridDataset
+from physicsnemo.sym.domain.constraint import Constraint
+
+
+def test_HDF5GridDataset(tmp_path):
+    "check batched reads of a chunked, compressed file match the file contents"
+
+    filename = tmp_path / "data.hdf5"
+    data = {
+        "coeff": np.random.rand(20, 1, 8, 8).astype(np.float32),
+        "sol": np.random.rand(20, 1, 8, 8).astype(np.float32),
+    }
+    with h5py.File(filename, "w") as f:
+        for key, value in data.items():
+            f.create_dataset(key, data=value, chunks=(4, 1, 8, 8), compression="gzip")
+
+    dataset = HDF5GridDataset(filename, invar_keys=["coeff"], outvar_keys=["sol"])
+    dataset.worker_init_fn(0)
+
+    # unsorted batch with repeated indices, contiguous batch and single example
+    for idx in [[7, 2, 19, 2, 11], [4, 5, 6, 7], 3]:
+        invar, outvar, lambda_weighting = dataset[idx]
+        assert np.array_equal(invar["coeff"].numpy(), data["coeff"][idx])
+        assert np.array_equal(outvar["sol"].numpy(), data["sol"][idx])
+        assert lambda_weighting["sol"].shape == outvar["sol"].shape
+        assert torch.all(lambda_weighting["sol"] == 1.0)
+
+    # dataloader passes batches of indices to the dataset
+    dataloader = iter(
+        Constraint.get_dataloader(
+            dataset=dataset,
+            batch_size=8,
+            shuffle=True,
+            drop_last=True,
+            num_workers=0,
+        )
+    )
+    invar, outvar, lambda_weighting = next(dataloader)
+    assert invar["coeff"].shape == (8, 1, 8, 8)
+
+
+if __name__ == "__main__":
+    import tempfile
+    import pathlib
+
+    test_HDF5GridDataset(pathlib.Path(tempfile.mkdtemp()))
@@ -0,0 +1,109 @@
+# SPDX-FileCopyrightText: Copyright (c) 2023 - 2024 NVIDIA CORPORATION & AFFILIATES.
+# SPDX-FileCopyrightText: All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import socket
+
+import torch
+import torch.distributed as dist
+import torch.multiprocessing as mp
+
+from physicsnemo.sym.distributed.helpers import (
+    all_reduce_gradients,
+    broadcast_parameters,
+)
+
+
+def _free_port():
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind(("localhost", 0))
+        return s.getsockname()[1]
+
+
+def _run(rank, world_size, port, bucket_cap_mb):
+    os.environ["MASTER_ADDR"] = "localhost"
+    os.environ["MASTER_PORT"] = str(port)
+    dist.init_process_group("gloo", rank=rank, world_size=world_size)
+    try:
+        torch.manual_seed(rank)
+        model = torch.nn.Sequential(
+            torch.nn.Linear(4, 16), torch.nn.Tanh(), torch.nn.Linear(16, 2)
+        )
+        unused = torch.nn.Linear(2, 2)
+        model.append(unused)
+
+        # parameters are broadcast from rank 0
+        broadcast_parameters(model)
+        reference = [[p.detach().clone() for p in model.parameters()]]
+        dist.broadcast_object_list(reference, src=0)
+        for p, p_ref in zip(model.parameters(), reference[0]):
+            assert torch.equal(p, p_ref)
+
+        # every rank sees different data, unused layer has no gradient
+        x = torch.full((8, 4), float(rank + 1))
+        model[:3](x).pow(2).sum().backward()
+        local_grads = [
+            torch.zeros_like(p) if p.grad is None else p.grad.clone()
+            for p in model.parameters()
+        ]
+        all_reduce_gradients(model.parameters(), bucket_cap_mb=bucket_cap_mb)
+
+        gathered = [None] * world_size
+        dist.all_gather_object(gathered, local_grads)
+        for i, p in enumerate(model.parameters()):
+            expected = sum(g[i] for g in gathered) / world_size
+            assert torch.allclose(p.grad, expected, atol=1e-6)
+
+        # keep_graph averages the values, Hessian-vector products stay local
+        params = list(model[:3].parameters())
+        grads = torch.autograd.grad(
+            model[:3](x).pow(2).sum(), params, create_graph=True
+        )
+        v = [torch.ones_like(p) for p in params]
+        local_hvp = torch.autograd.grad(
+            grads, params, grad_outputs=v, retain_graph=True
+        )
+        for p, grad in zip(params, grads):
+            p.grad = grad
+        local_grads = [grad.detach().clone() for grad in grads]
+        all_reduce_gradients(params, bucket_cap_mb=bucket_cap_mb, keep_graph=True)
+        hvp = torch.autograd.grad([p.grad for p in params], params, grad_outputs=v)
+
+        gathered = [None] * world_size
+        dist.all_gather_object(gathered, local_grads)
+        for i, p in enumerate(params):
+            expected = sum(g[i] for g in gathered) / world_size
+            assert torch.allclose(p.grad, expected, atol=1e-6)
+            assert torch.allclose(hvp[i], local_hvp[i])
+    finally:
+        dist.destroy_process_group()
+
+
+def test_all_reduce_gradients():
+    "check the bucketed gradient all-reduce averages gradients over gloo ranks"
+    world_size = 2
+    # single bucket and one bucket per tensor
+    for bucket_cap_mb in [25, 1e-6]:
+        mp.spawn(
+            _run,
+            args=(world_size, _free_port(), bucket_cap_mb),
+            nprocs=world_size,
+            join=True,
+        )
+
+
+if __name__ == "__main__":
+    test_all_reduce_gradients()
@@ -15,7 +15,9 @@
 # limitations under the License.
 
 import numpy as np
+import pytest
 from pathlib import Path
+from sympy import And, Eq, Symbol
 from physicsnemo.sym.geometry import Parameterization, Parameter
 from physicsnemo.sym.geometry.primitives_1d import Point1D, Line1D
 from physicsnemo.sym.geometry.primitives_2d import (
@@ -34,6 +36,7 @@ from physicsnemo.sym.geometry.primitives_3d import (
     Sphere,
     Cylinder,
     Torus,
+    VectorizedBoxes,
 )
 from physicsnemo.sym.geometry.tessellation import Tessellation
 from physicsnemo.sym.utils.io.vtk import var_to_polyvtk
@@ -239,3 +242,184 @@ def test_primitives():
 
 
 test_primitives()
+
+
+def test_boundary_area_cache():
+    r = Parameter("r")
+    geo = Circle((0, 0), r, parameterization=Parameterization({r: (1.0, 2.0)}))
+    curve = geo.curves[0]
+    calls = []
+    approx_area = curve.approx_area
+
+    def counted_approx_area(*args, **kwargs):
+        calls.append(kwargs.get("approx_nr"))
+        return approx_area(*args, **kwargs)
+
+    curve.approx_area = counted_approx_area
+
+    # the areas are computed once and reused
+    geo.sample_boundary(100, area_nr_points=1000)
+    geo.sample_boundary(100, area_nr_points=1000)
+    assert calls == [1000]
+
+    # a different parameterization, criteria or accuracy recomputes them
+    geo.sample_boundary(100, parameterization={r: 1.5}, area_nr_points=1000)
+    geo.sample_boundary(100, criteria=r > 1.2, area_nr_points=1000)
+    geo.sample_boundary(100)
+    assert calls == [1000, 1000, 1000, 10000]
+
+    # explicit invalidation
+    geo.clear_area_cache()
+    geo.sample_boundary(100, area_nr_points=1000)
+    assert len(calls) == 5
+
+    # large discrete ranges that only differ in the middle have different keys
+    radii = np.linspace(1.0, 2.0, 2000).reshape(-1, 1)
+    geo.sample_boundary(100, parameterization={r: radii}, area_nr_points=1000)
+    radii = radii.copy()
+    radii[1000] = 1.9
+    geo.sample_boundary(100, parameterization={r: radii}, area_nr_points=1000)
+    assert len(calls) == 7
+
+
+def test_vectorized_boxes():
+    box_bounds = np.array(
+        [[[0.0, 1.0], [0.0, 2.0], [0.0, 3.0]], [[2.0, 3.0], [0.0, 1.0], [0.0, 1.0]]]
+    )
+    geo = VectorizedBoxes(box_bounds)
+    check_geometry(geo, boundary_area=28.0, interior_area=7.0, max_sdf=0.5)
+
+    # points lie on the faces with outward normals
+    boundary = geo.sample_boundary(1000)
+    xyz = np.concatenate([boundary[d] for d in ["x", "y", "z"]], axis=1)
+    normal = np.concatenate([boundary["normal_" + d] for d in ["x", "y", "z"]], axis=1)
+    assert np.allclose(np.linalg.norm(normal, axis=1), 1.0)
+    assert np.allclose(geo.sdf(boundary, {})["sdf"], 0.0)
+    outside = {
+        d: xyz[:, i : i + 1] + 0.01 * normal[:, i : i + 1]
+        for i, d in enumerate(["x", "y", "z"])
+    }
+    assert np.all(geo.sdf(outside, {})["sdf"] < 0)
+
+
+def test_criteria_restricted_boundary():
+    x, y, z = Symbol("x"), Symbol("y"), Symbol("z")
+
+    # only the faces in the box of the criteria are sampled, with exact areas
+    geo = Box((0, 0, 0), (10, 10, 10)).translate([1, 0, 0])
+    criteria = And(Eq(x, 1), y < 0.1, z < 0.1)
+    assert len(geo._restricted_curves(criteria, geo.parameterization)) == 1
+    boundary = geo.sample_boundary(1000, criteria=criteria)
+    assert np.isclose(np.sum(boundary["area"]), 0.01)
+    assert np.all(boundary["x"] == 1.0)
+    assert np.all(np.logical_and(boundary["y"] < 0.1, boundary["z"] < 0.1))
+
+    # curves that can not be restricted are sampled with the criteria
+    geo = Rectangle((0, 0), (2, 1)) - Circle((2, 1), 0.5)
+    boundary = geo.sample_boundary(1000, criteria=And(y > 0.25, y < 0.75))
+    assert np.isclose(np.sum(boundary["area"]), 0.75 + np.pi / 6, rtol=2e-2)
+    assert np.all(np.logical_and(boundary["y"] > 0.25, boundary["y"] < 0.75))
+
+    # vectorized boxes clip the faces
+    box_bounds = np.array(
+        [[[0.0, 1.0], [0.0, 1.0], [0.0, 1.0]], [[2.0, 3.0], [0.0, 1.0], [0.0, 1.0]]]
+    )
+    geo = VectorizedBoxes(box_bounds)
+    boundary = geo.sample_boundary(1000, criteria=And(x > 0.5, x < 2.5))
+    assert np.isclose(np.sum(boundary["area"]), 6.0)
+    assert geo.curves[0].restrict({"x": (4.0, 5.0)}) is None
+
+    # ranges of geometry parameters are not restricted, they are given when sampling
+    np.random.seed(0)
+    length = Parameter("l")
+    geo = Rectangle(
+        (0, 0), (length, 1), parameterization=Parameterization({length: (1, 2)})
+    )
+    boundary = geo.sample_boundary(1000, criteria=x > 1.5)
+    assert np.isclose(np.sum(boundary["area"]), 0.75, rtol=2e-2)
+    boundary = geo.sample_boundary(
+        1000, criteria=x > 1.5, parameterization={length: 1.8}
+    )
+    assert np.isclose(np.sum(boundary["area"]), 1.6, rtol=2e-2)
+    assert np.all(boundary["x"] > 1.5)
+    assert len(geo._restricted_curve_cache) == 2
+
+
+def test_cache_sdf():
+    for geo in [
+        Rectangle((0, 0), (2, 1)) - Circle((1, 0.5), 0.2),
+        (Box((0, 0, 0), (1, 1, 1)) - Sphere((0.5, 0.5, 1), 0.4))
+        + Cylinder((0.5, 0.5, 0), 0.2, 1.0),
+    ]:
+        cached_geo = geo.cache_sdf(resolution=32)
+        points = np.random.uniform(-0.2, 2.2, size=(10000, len(geo.dims)))
+        invar = {d: points[:, i : i + 1] for i, d in enumerate(geo.dims)}
+        sdf = geo.sdf(invar, {}, compute_sdf_derivatives=True)
+        cached_sdf = cached_geo.sdf(invar, {}, compute_sdf_derivatives=True)
+
+        # the sign is exact, values are within a cell diagonal
+        diagonal = np.sqrt(len(geo.dims)) * 2.0 / 31
+        assert np.all(np.sign(sdf["sdf"]) == np.sign(cached_sdf["sdf"]))
+        assert np.all(np.abs(sdf["sdf"] - cached_sdf["sdf"]) <= diagonal)
+        for d in geo.dims:
+            error = np.abs(sdf["sdf__" + d] - cached_sdf["sdf__" + d])
+            assert np.mean(error) < 0.1
+
+        # the exact sdf is used close to the surface
+        near = np.abs(sdf["sdf"]) < 0.5 * diagonal
+        assert np.allclose(sdf["sdf"][near], cached_sdf["sdf"][near])
+
+        interior = cached_geo.sample_interior(1000)
+        assert np.all(interior["sdf"] > 0)
+        assert len(cached_geo.sample_boundary(1000)["area"]) == 1000
+
+    # parameterized geometries can not be cached
+    r = Parameter("r")
+    geo = Circle((0, 0), r, parameterization=Parameterization({r: (1.0, 2.0)}))
+    with pytest.raises(ValueError):
+        geo.cache_sdf()
+
+
+def test_sample_designs():
+    np.random.seed(0)
+    r = Parameter("r")
+    circle = Circle((0, 0), r, parameterization=Parameterization({r: (0.5, 2.0)}))
+    radii = np.array([0.5, 1.0, 2.0])
+
+    boundary = circle.sample_boundary_designs(1000, {r: radii})
+    interior = circle.sample_interior_designs(1000, {"r": radii})
+    for samples in [boundary, interior]:
+        assert samples["design_index"].shape == (3000, 1)
+        assert np.all(np.diff(samples["design_index"][:, 0]) >= 0)
+        assert np.all(samples["r"] == radii[samples["design_index"]])
+    for k, radius in enumerate(radii):
+        b = boundary["design_index"][:, 0] == k
+        i = interior["design_index"][:, 0] == k
+        assert np.allclose(np.hypot(boundary["x"][b], boundary["y"][b]), radius)
+        assert np.isclose(np.sum(boundary["area"][b]), 2 * np.pi * radius)
+        assert np.all(np.hypot(interior["x"][i], interior["y"][i]) < radius)
+        assert np.isclose(np.sum(interior["area"][i]), np.pi * radius**2, rtol=1e-1)
+
+    # criteria are applied to all designs
+    boundary = circle.sample_boundary_designs(100, {r: radii}, criteria=Symbol("x") > 0)
+    assert np.all(boundary["x"] > 0)
+    # the half circle fractions are estimated from 10000 points per design
+    assert np.isclose(np.sum(boundary["area"]), np.pi * np.sum(radii), rtol=3e-2)
+
+    # curves with internal criteria and restricted curves give the areas of
+    # every design
+    torus = Torus((0, 0, 0), r, 0.2, parameterization=Parameterization({r: (0.5, 1.5)}))
+    boundary = torus.sample_boundary_designs(100, {r: radii})
+    for k, radius in enumerate(radii):
+        area = np.sum(boundary["area"][boundary["design_index"][:, 0] == k])
+        assert np.isclose(area, 4 * np.pi**2 * radius * 0.2)
+    length = Parameter("l")
+    rec = Rectangle(
+        (0, 0), (length, 1), parameterization=Parameterization({length: (1, 2)})
+    )
+    boundary = rec.sample_boundary_designs(
+        100, {length: [1.6, 1.8]}, criteria=Symbol("x") > 1.5
+    )
+    for k, area in enumerate([1.2, 1.6]):
+        b = boundary["design_index"][:, 0] == k
+        assert np.isclose(np.sum(boundary["area"][b]), area, rtol=3e-2)
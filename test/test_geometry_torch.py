@@ -0,0 +1,142 @@
+# SPDX-FileCopyrightText: Copyright (c) 2023 - 2024 NVIDIA CORPORATION & AFFILIATES.
+# SPDX-FileCopyrightText: All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import numpy as np
+import pytest
+import torch
+from sympy import And, Or, Symbol, Eq, cos, sin
+
+from physicsnemo.sym.node import Node
+from physicsnemo.sym.geometry.primitives_2d import Rectangle, Circle
+from physicsnemo.sym.geometry.primitives_3d import Box, Sphere, VectorizedBoxes
+from physicsnemo.sym.geometry.parameterization import Parameterization, Parameter
+from physicsnemo.sym.domain.constraint import (
+    PointwiseBoundaryConstraint,
+    PointwiseInteriorConstraint,
+)
+
+
+def _geometries():
+    r = Parameter("r")
+    return [
+        Rectangle((0, 0), (1, 1)) - Circle((0.5, 0.5), 0.2),
+        (Box((0, 0, 0), (1, 1, 1)) & Sphere((0.5, 0.5, 0.5), 0.7))
+        .rotate(0.3)
+        .translate([0.1, 0, 0])
+        .scale(2),
+        Circle((0, 0), r, parameterization=Parameterization({r: (0.5, 1.0)})),
+        VectorizedBoxes(
+            np.array([[[0, 1], [0, 1], [0, 1]], [[2, 3], [0, 1], [0, 1]]], dtype=float)
+        ),
+    ]
+
+
+def test_torch_sdf():
+    "check the sdf evaluated on tensors matches the NumPy sdf"
+    for geo in _geometries():
+        invar = geo.sample_interior(1000, compute_sdf_derivatives=True)
+        params = {str(p): invar[str(p)] for p in geo.parameterization.parameters}
+        np_sdf = geo.sdf({k: invar[k] for k in geo.dims}, params, True)
+        torch_sdf = geo.sdf(
+            {k: torch.as_tensor(invar[k]) for k in geo.dims},
+            {k: torch.as_tensor(v) for k, v in params.items()},
+            True,
+        )
+        assert set(np_sdf) == set(torch_sdf)
+        for key, value in torch_sdf.items():
+            assert isinstance(value, torch.Tensor)
+            assert np.allclose(value.numpy(), np_sdf[key])
+
+
+def test_torch_sample():
+    "check sampling on a device returns float64 tensors with the NumPy areas"
+    x = Symbol("x")
+    for geo in _geometries():
+        np.random.seed(0)
+        np_boundary = geo.sample_boundary(1000, criteria=x > 0.2)
+        boundary = geo.sample_boundary(1000, criteria=x > 0.2, device="cpu")
+        interior = geo.sample_interior(1000, device="cpu")
+        assert set(boundary) == set(np_boundary)
+        for value in [*boundary.values(), *interior.values()]:
+            assert isinstance(value, torch.Tensor)
+            assert value.dtype == torch.float64
+            assert value.shape == (1000, 1)
+        assert np.isclose(boundary["area"].sum().item(), np.sum(np_boundary["area"]))
+        assert torch.all(boundary["x"] > 0.2)
+        assert torch.all(interior["sdf"] > 0)
+
+
+def test_torch_boolean_criteria():
+    "check And / Or criteria on a device select the same points as with NumPy"
+    x, y = Symbol("x"), Symbol("y")
+    rec = Rectangle((0, 0), (1, 1))
+    for criteria, in_criteria in [
+        (And(x > 0.2, x < 0.8), lambda p: (p["x"] > 0.2) & (p["x"] < 0.8)),
+        (Or(x < 0.2, y > 0.9), lambda p: (p["x"] < 0.2) | (p["y"] > 0.9)),
+    ]:
+        np.random.seed(0)
+        np_boundary = rec.sample_boundary(1000, criteria=criteria)
+        boundary = rec.sample_boundary(1000, criteria=criteria, device="cpu")
+        interior = rec.sample_interior(1000, criteria=criteria, device="cpu")
+        for points in [boundary, interior]:
+            assert isinstance(points["x"], torch.Tensor)
+            assert torch.all(in_criteria(points))
+        assert np.isclose(boundary["area"].sum().item(), np.sum(np_boundary["area"]))
+
+
+@pytest.mark.parametrize(
+    "device",
+    [
+        "cpu",
+        pytest.param(
+            "cuda",
+            marks=pytest.mark.skipif(
+                not torch.cuda.is_available(), reason="There is no GPU to run this test"
+            ),
+        ),
+    ],
+)
+def test_torch_constraints(device):
+    "check constraints sampled on a device have zero loss"
+    x, y = Symbol("x"), Symbol("y")
+    node = Node.from_sympy(cos(x) + sin(y), "u")
+    rec = Rectangle((0, 0), (1, 1))
+    boundary = PointwiseBoundaryConstraint(
+        nodes=[node],
+        geometry=rec,
+        outvar={"u": cos(x) + sin(1)},
+        batch_size=100,
+        criteria=Eq(y, 1),
+        fixed_dataset=False,
+        sample_device=device,
+    )
+    interior = PointwiseInteriorConstraint(
+        nodes=[node],
+        geometry=rec,
+        outvar={"u": cos(x) + sin(y)},
+        lambda_weighting={"u": Symbol("sdf")},
+        batch_size=100,
+        criteria=And(x > 0.2, x < 0.8),
+        fixed_dataset=False,
+        sample_device=device,
+    )
+    for constraint in [boundary, interior]:
+        assert not constraint.dataset.pin_memory
+        for _ in range(3):
+            constraint.load_data()
+            constraint.forward()
+            loss = constraint.loss(step=0)
+            assert torch.isclose(loss["u"], torch.tensor(0.0), atol=1e-5)
@@ -15,6 +15,11 @@
 # limitations under the License.
 
 import torch
+from sympy import Symbol
+
+from physicsnemo.sym.node import Node
+from physicsnemo.sym.geometry.primitives_2d import Rectangle
+from physicsnemo.sym.domain.constraint import IntegralBoundaryConstraint
 from physicsnemo.sym.loss import (
     PointwiseLossNorm,
     DecayedPointwiseLossNorm,
@@ -89,3 +94,66 @@ def test_loss_norm():
         step=1000000,
     )
     assert torch.isclose(l["u"], torch.tensor(2.0))
+
+    # Test segmented Integral l2 matches list based integral loss
+    list_invar = [
+        {"x": torch.arange(10.0)[:, None], "area": torch.ones(10)[:, None] / 10},
+        {"x": torch.arange(4.0)[:, None], "area": torch.ones(4)[:, None] / 4},
+    ]
+    list_pred_outvar = [{"u": v["x"] ** 2} for v in list_invar]
+    list_true_outvar = [
+        {"u": torch.tensor(2.5)[None, None]},
+        {"u": torch.tensor(1.0)[None, None]},
+    ]
+    list_lambda_weighting = [
+        {"u": torch.ones(1)[None, None]},
+        {"u": 2 * torch.ones(1)[None, None]},
+    ]
+    invar = {
+        key: torch.cat([v[key] for v in list_invar]) for key in list_invar[0].keys()
+    }
+    pred_outvar = {"u": torch.cat([v["u"] for v in list_pred_outvar])}
+    true_outvar = {"u": torch.cat([v["u"] for v in list_true_outvar])}
+    lambda_weighting = {"u": torch.cat([v["u"] for v in list_lambda_weighting])}
+    segment_ids = torch.repeat_interleave(torch.arange(2), torch.tensor([10, 4]))
+    for loss in [IntegralLossNorm(2), DecayedIntegralLossNorm(2, 1)]:
+        l_list = loss.forward(
+            list_invar,
+            list_pred_outvar,
+            list_true_outvar,
+            list_lambda_weighting,
+            step=1000,
+        )
+        l_segment = loss.forward_segmented(
+            invar, pred_outvar, true_outvar, lambda_weighting, segment_ids, step=1000
+        )
+        assert torch.isclose(l_list["u"], l_segment["u"])
+
+
+def test_integral_constraint_loss_override():
+    "check integral losses overriding forward are not replaced by the segment-sum"
+
+    class ConstantIntegralLoss(IntegralLossNorm):
+        def forward(
+            self,
+            list_invar,
+            list_pred_outvar,
+            list_true_outvar,
+            list_lambda_weighting,
+            step,
+        ):
+            assert len(list_invar) == 2
+            return {"u": torch.tensor(7.0)}
+
+    constraint = IntegralBoundaryConstraint(
+        nodes=[Node.from_sympy(Symbol("x"), "u")],
+        geometry=Rectangle((0, 0), (1, 1)),
+        outvar={"u": 0},
+        batch_size=2,
+        integral_batch_size=100,
+        batch_per_epoch=1,
+        loss=ConstantIntegralLoss(),
+    )
+    constraint.load_data()
+    constraint.forward()
+    assert torch.equal(constraint.loss(step=0)["u"], torch.tensor(7.0))
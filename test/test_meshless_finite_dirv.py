@@ -16,7 +16,7 @@
 
 import torch
 
-from physicsnemo.sym.eq.derivatives import MeshlessFiniteDerivative
+from physicsnemo.sym.eq.derivatives import AdaptiveDx, MeshlessFiniteDerivative
 from physicsnemo.sym.node import Node
 from physicsnemo.sym.key import Key
 from physicsnemo.sym.graph import Graph
@@ -243,6 +243,107 @@ def test_meshless_finite_deriv_grads():
     ), "Second derivative gradient test failed"
 
 
+def test_meshless_finite_deriv_single_precision():
+    # Single precision MFD with automatic dx and Richardson extrapolation should
+    # be close to the double precision results
+    function_node = Node(
+        inputs=[Key("w"), Key("x")],
+        outputs=[Key("y"), Key("z")],
+        evaluate=SineNet(),
+        name="Test Node",
+    )
+    derivatives = [
+        Key("y", derivatives=[Key("x")]),
+        Key("y", derivatives=[Key("x"), Key("w")]),
+        Key("z", derivatives=[Key("x"), Key("x")]),
+        Key("y", derivatives=[Key("w"), Key("w"), Key("w")]),
+    ]
+
+    inputs_fp64 = {
+        "x": 2 * torch.rand(1000, 1).double() - 1,
+        "w": 2 * torch.rand(1000, 1).double() - 1,
+    }
+    inputs_fp64.update(function_node.evaluate(inputs_fp64))
+    deriv_fp64 = MeshlessFiniteDerivative.make_node(
+        node_model=function_node, derivatives=derivatives, dx=0.001
+    )
+    outputs_fp64 = deriv_fp64.evaluate(inputs_fp64)
+
+    inputs_fp32 = {key: value.float() for key, value in inputs_fp64.items()}
+    deriv_fp32 = MeshlessFiniteDerivative.make_node(
+        node_model=function_node,
+        derivatives=derivatives,
+        dx=0.001,
+        double_cast=False,
+    )
+    outputs_fp32 = deriv_fp32.evaluate(inputs_fp32)
+    deriv_auto = MeshlessFiniteDerivative.make_node(
+        node_model=function_node,
+        derivatives=derivatives,
+        dx="auto",
+        double_cast=False,
+        richardson=True,
+    )
+    outputs_auto = deriv_auto.evaluate(inputs_fp32)
+
+    for key in derivatives:
+        error_fp32 = torch.max(
+            torch.abs(outputs_fp32[str(key)].double() - outputs_fp64[str(key)])
+        )
+        error_auto = torch.max(
+            torch.abs(outputs_auto[str(key)].double() - outputs_fp64[str(key)])
+        )
+        assert outputs_auto[str(key)].dtype == torch.float32
+        assert error_auto < 2e-3, f"Single precision MFD test failed for {key}"
+        assert error_auto <= error_fp32, f"Auto dx less accurate for {key}"
+
+    # auto dx grows with the derivative order
+    mfd = deriv_auto.evaluate
+    assert mfd.deriv_dx(1) < mfd.deriv_dx(2) < mfd.deriv_dx(3)
+
+
+class MultiScaleNet(torch.nn.Module):
+    def forward(self, inputs):
+        return {"u": torch.sin(20 * inputs["x"]) + torch.exp(inputs["t"])}
+
+
+def test_meshless_finite_deriv_adaptive_dx():
+    # dx of x should shrink to resolve the high frequency, dx of t should not
+    model = MultiScaleNet()
+    dx = AdaptiveDx(dx=0.05, probe_freq=2, probe_size=32)
+    deriv = MeshlessFiniteDerivative.make_node(
+        node_model=model,
+        derivatives=[
+            Key("u", derivatives=[Key("x")]),
+            Key("u", derivatives=[Key("t"), Key("t")]),
+        ],
+        dx=dx,
+        input_keys=[Key("x"), Key("t")],
+        double_cast=False,
+    )
+
+    inputs = {"x": torch.rand(128, 1), "t": torch.rand(128, 1)}
+    inputs.update(model(inputs))
+    errors = []
+    for _ in range(20):
+        outputs = deriv.evaluate(inputs)
+        errors.append(
+            torch.max(torch.abs(outputs["u__x"] - 20 * torch.cos(20 * inputs["x"])))
+        )
+
+    assert dx.count == 20
+    assert dx.dx["x"] < dx.dx["t"]
+    assert errors[-1] < 1e-2, "Adaptive dx did not converge"
+    assert errors[-1] < errors[0]
+
+    # Controller state can be checkpointed
+    restored = AdaptiveDx()
+    restored.load_state_dict(dx.state_dict())
+    assert restored.dx == dx.dx
+
+
 if __name__ == "__main__":
     test_meshless_finite_deriv()
     test_meshless_finite_deriv_grads()
+    test_meshless_finite_deriv_single_precision()
+    test_meshless_finite_deriv_adaptive_dx()
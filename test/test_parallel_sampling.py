@@ -0,0 +1,50 @@
+# SPDX-FileCopyrightText: Copyright (c) 2023 - 2024 NVIDIA CORPORATION & AFFILIATES.
+# SPDX-FileCopyrightText: All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import functools
+
+import numpy as np
+from sympy import Symbol
+
+from physicsnemo.sym.geometry import sample_parallel
+from physicsnemo.sym.geometry.primitives_2d import Circle, Rectangle
+
+
+def test_sample_parallel():
+    x = Symbol("x")
+    geo = Rectangle((0, 0), (2, 1)) - Circle((1, 0.5), 0.25)
+    sample_fn = functools.partial(geo.sample_interior, criteria=x > 0.5)
+
+    # results only depend on the seed and the chunk size
+    serial = sample_parallel(sample_fn, 10000, num_workers=0, chunk_size=3000, seed=1)
+    parallel = sample_parallel(sample_fn, 10000, num_workers=2, chunk_size=3000, seed=1)
+    assert serial["x"].shape == (10000, 1)
+    for key in serial.keys():
+        assert np.array_equal(serial[key], parallel[key])
+
+    # chunks are sampled independently
+    assert not np.allclose(serial["x"][:3000], serial["x"][3000:6000])
+    assert np.all(serial["x"] > 0.5)
+
+    # the area is relative to the total number of points
+    assert np.isclose(np.sum(serial["area"]), 1.5 - np.pi * 0.25**2, rtol=1e-1)
+    boundary = sample_parallel(geo.sample_boundary, 10000, num_workers=2)
+    assert np.isclose(np.sum(boundary["area"]), 6.0 + 2 * np.pi * 0.25, rtol=1e-2)
+
+    # the global random state of the calling process is kept
+    state = np.random.get_state()[1].copy()
+    sample_parallel(sample_fn, 1000, num_workers=0, seed=1)
+    assert np.array_equal(np.random.get_state()[1], state)
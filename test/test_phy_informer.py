@@ -371,6 +371,46 @@ def test_residuals_finite_difference(general_setup):
         )
 
 
+@pytest.mark.parametrize("general_setup", ["cpu"], indirect=True)
+def test_residuals_fused_finite_difference(general_setup):
+    coords, coords_unstructured, residuals_analytical, model = general_setup
+    steps = 100
+    ns = NavierStokes(nu=0.01, rho=1.0, dim=3, time=False)
+    phy_informer = PhysicsInformer(
+        required_outputs=["continuity", "momentum_x"],
+        equations=ns,
+        grad_method="fused_finite_difference",
+        fd_dx=(2 * np.pi / steps),  # computed based on the grid spacing
+        device=coords.device,
+        fd_accuracy_order=4,
+        fd_padding="one_sided",
+    )
+    pred_outvar = model(coords)
+    residuals_fd = phy_informer.forward(
+        {
+            "u": pred_outvar[:, 0:1],
+            "v": pred_outvar[:, 1:2],
+            "w": pred_outvar[:, 2:3],
+            "p": pred_outvar[:, 3:4],
+        },
+    )
+
+    # Validate and assert error
+    pad = 2
+    for key in residuals_analytical.keys():
+        error = torch.mean(
+            torch.abs(
+                residuals_analytical[key].reshape(100, 100, 100)[
+                    pad:-pad, pad:-pad, pad:-pad
+                ]
+                - residuals_fd[key].reshape(100, 100, 100)[pad:-pad, pad:-pad, pad:-pad]
+            )
+        )
+        assert error < 0.5, (
+            f"Fused Finite Difference gradient error too high for {key}: {error}"
+        )
+
+
 @pytest.mark.parametrize("general_setup", ["cuda"], indirect=True)
 def test_residuals_spectral(general_setup):
     coords, coords_unstructured, residuals_analytical, model = general_setup
@@ -452,3 +492,62 @@ def test_residuals_least_squares(least_squares_setup):
             )
         )
         assert error < 0.5, f"Least Squares gradient error too high for {key}: {error}"
+
+
+def _grid_mesh_2d(steps, device):
+    x = torch.linspace(0, 2 * np.pi, steps=steps, device=device)
+    xx, yy = torch.meshgrid(x, x, indexing="ij")
+    coords = torch.stack([xx, yy], dim=-1).reshape(-1, 2)
+
+    index = torch.arange(steps * steps, device=device).reshape(steps, steps)
+    edges = torch.cat(
+        [
+            torch.stack([index[:-1, :].flatten(), index[1:, :].flatten()], dim=1),
+            torch.stack([index[:, :-1].flatten(), index[:, 1:].flatten()], dim=1),
+        ]
+    )
+    node_ids = torch.arange(steps * steps, device=device).reshape(-1, 1)
+    return coords, node_ids, edges
+
+
+@pytest.mark.parametrize("grad_method", ["autodiff", "least_squares"])
+def test_residuals_batched(grad_method):
+    device = "cpu"
+    ns = NavierStokes(nu=0.01, rho=1.0, dim=2, time=False)
+    phy_informer = PhysicsInformer(
+        required_outputs=["continuity", "momentum_x"],
+        equations=ns,
+        grad_method=grad_method,
+        device=device,
+    )
+
+    def fields(coords):
+        return {
+            "u": torch.sin(coords[:, 0:1]) * torch.cos(coords[:, 1:2]),
+            "v": torch.cos(coords[:, 0:1]) * torch.sin(coords[:, 1:2]),
+            "p": torch.sin(coords[:, 0:1] + coords[:, 1:2]),
+        }
+
+    samples = []
+    for steps in [12, 17, 9]:
+        coords, node_ids, edges = _grid_mesh_2d(steps, device)
+        sample = {"coordinates": coords}
+        if grad_method == "least_squares":
+            sample.update({"nodes": node_ids, "edges": edges})
+        samples.append(sample)
+
+    packed, batch = phy_informer.pack(samples)
+    assert batch.shape[0] == packed["coordinates"].shape[0]
+    if grad_method == "autodiff":
+        packed["coordinates"].requires_grad_(True)
+    packed.update(fields(packed["coordinates"]))
+    batched_residuals = phy_informer.forward_batched(packed, batch)
+    assert len(batched_residuals) == len(samples)
+
+    for sample, residuals in zip(samples, batched_residuals):
+        if grad_method == "autodiff":
+            sample["coordinates"].requires_grad_(True)
+        sample.update(fields(sample["coordinates"]))
+        expected = phy_informer.forward(sample)
+        for key in expected.keys():
+            assert torch.allclose(expected[key], residuals[key], atol=1e-5)
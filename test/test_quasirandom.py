@@ -0,0 +1,79 @@
+# SPDX-FileCopyrightText: Copyright (c) 2023 - 2024 NVIDIA CORPORATION & AFFILIATES.
+# SPDX-FileCopyrightText: All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import numpy as np
+import pytest
+from physicsnemo.sym.geometry import (
+    Parameter,
+    Parameterization,
+    QuasiRandomStream,
+    get_quasirandom_stream,
+    set_quasirandom_stream,
+)
+from physicsnemo.sym.geometry.primitives_2d import Rectangle
+
+
+@pytest.mark.parametrize("method", ["halton", "sobol"])
+def test_quasirandom_stream(method):
+    stream = QuasiRandomStream(method, seed=1)
+    first = stream.sample(64, 2)
+    second = stream.sample(64, 2)
+    assert first.shape == (64, 2)
+    assert np.all((first >= 0) & (first < 1))
+
+    # the sequence continues across calls
+    assert not np.allclose(first, second)
+    reference = QuasiRandomStream(method, seed=1).sample(128, 2)
+    assert np.allclose(np.concatenate([first, second]), reference)
+
+    # restore the state in a new stream
+    state = stream.state_dict()
+    restored = QuasiRandomStream()
+    restored.load_state_dict(state)
+    assert np.allclose(restored.sample(32, 2), stream.sample(32, 2))
+
+    stream.reset()
+    assert np.allclose(stream.sample(64, 2), first)
+
+
+def test_quasirandom_sampling():
+    previous_stream = get_quasirandom_stream()
+    try:
+        set_quasirandom_stream(QuasiRandomStream(scramble=False))
+        a, b = Parameter("a"), Parameter("b")
+        parameterization = Parameterization({a: (1.0, 2.0), b: (-1.0, 0.0)})
+
+        # unscrambled halton sequence in base 2 and 3
+        params = parameterization.sample(4, quasirandom=True)
+        assert np.allclose(params["a"][:, 0], [1.0, 1.5, 1.25, 1.75])
+        assert np.allclose(params["b"][:, 0], [-1.0, -2 / 3, -1 / 3, -8 / 9])
+
+        # repeated batches are not identical
+        params = parameterization.sample(4, quasirandom=True)
+        assert np.allclose(params["a"][:, 0], [1.125, 1.625, 1.375, 1.875])
+
+        # an explicit stream can be given
+        stream = QuasiRandomStream(seed=0)
+        params = parameterization.sample(4, quasirandom=stream)
+        assert stream.state_dict()["num_generated"] == {2: 4}
+
+        # geometries sample from the same stream
+        geo = Rectangle((0, 0), (1, 1))
+        interior = geo.sample_interior(100, quasirandom=True)
+        assert np.isclose(np.sum(interior["area"]), 1.0)
+        assert get_quasirandom_stream().state_dict()["num_generated"][2] > 8
+    finally:
+        set_quasirandom_stream(previous_stream)
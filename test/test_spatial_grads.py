@@ -320,3 +320,57 @@ def test_gradients_least_squares(least_squares_setup):
             )
         )
         assert error < 0.2, f"Least Squares gradient error too high for {key}: {error}"
+
+
+@pytest.mark.parametrize("general_setup", ["cpu"], indirect=True)
+@pytest.mark.parametrize("accuracy_order", [2, 4])
+@pytest.mark.parametrize("padding", ["replicate", "one_sided"])
+def test_gradients_fused_finite_difference(general_setup, accuracy_order, padding):
+    coords, coords_unstructured, grad_u_analytical, model = general_setup
+    grad_calc = GradientCalculator(device=coords.device)
+
+    # Compute gradients of two variables using fused finite difference
+    u = model(coords)
+    input_dict = {"u": u, "v": 2 * u}
+    grads_fused_fd = grad_calc.compute_gradients(
+        input_dict,
+        method_name="fused_finite_difference",
+        invar=["u", "v"],
+        dx=2 * np.pi / 100,
+        order=[1, 2],
+        return_mixed_derivs=True,
+        accuracy_order=accuracy_order,
+        padding=padding,
+    )
+    assert "u__x__y" in grads_fused_fd and "v__z__y" in grads_fused_fd
+
+    # Validate and assert error
+    pad = 2
+    for key in grad_u_analytical.keys():
+        for var, scale in [("u", 1.0), ("v", 2.0)]:
+            error = torch.mean(
+                torch.abs(
+                    scale
+                    * grad_u_analytical[key].reshape(100, 100, 100)[
+                        pad:-pad, pad:-pad, pad:-pad
+                    ]
+                    - grads_fused_fd[var + key[1:]].reshape(100, 100, 100)[
+                        pad:-pad, pad:-pad, pad:-pad
+                    ]
+                )
+            )
+            assert error < 0.2 * scale, (
+                f"Fused Finite Difference gradient error too high for {key}: {error}"
+            )
+
+    # Second order accurate stencils should match the per variable module
+    if accuracy_order == 2 and padding == "replicate":
+        grads_u_fd = grad_calc.compute_gradients(
+            input_dict,
+            method_name="finite_difference",
+            invar="u",
+            dx=2 * np.pi / 100,
+            order=2,
+        )
+        for key, value in grads_u_fd.items():
+            assert torch.allclose(value, grads_fused_fd[key], atol=1e-3)
@@ -18,12 +18,43 @@ from sympy import Symbol
 import numpy as np
 from pathlib import Path
 
+from stl import mesh as np_mesh, Mode
+
+from physicsnemo.sym.geometry.stl_reader import read_stl
 from physicsnemo.sym.geometry.tessellation import Tessellation
+from physicsnemo.sym.geometry.primitives_3d import Box
 from physicsnemo.sym.geometry import Parameterization
 
 dir_path = Path(__file__).parent
 
 
+def _unit_cube_mesh():
+    # unit cube with outward facing triangles
+    vertices = np.array(
+        [[x, y, z] for x in (0, 1) for y in (0, 1) for z in (0, 1)], dtype=np.float64
+    )
+    faces = np.array(
+        [
+            [0, 3, 2],
+            [0, 1, 3],
+            [4, 7, 5],
+            [4, 6, 7],
+            [0, 5, 1],
+            [0, 4, 5],
+            [2, 7, 6],
+            [2, 3, 7],
+            [0, 6, 4],
+            [0, 2, 6],
+            [1, 7, 3],
+            [1, 5, 7],
+        ]
+    )
+    mesh = np_mesh.Mesh(np.zeros(faces.shape[0], dtype=np_mesh.Mesh.dtype))
+    mesh.vectors = vertices[faces]
+    mesh.update_normals()
+    return mesh
+
+
 def test_tesselated_geometry():
     # read in cube file
     cube = Tessellation.from_stl(dir_path / "stls/cube.stl")
@@ -43,3 +74,64 @@ def test_tesselated_geometry():
 
     # check if volume is right for interior
     assert np.isclose(np.sum(interior["area"]), 1.0)
+
+
+def test_tessellation_sdf():
+    mesh = _unit_cube_mesh()
+
+    # small chunks to query in several launches
+    cube = Tessellation(mesh, sdf_device="cpu", sdf_chunk_size=100)
+    # fixed points, the derivatives are ill defined on the medial axis of the cube
+    points = np.random.default_rng(0).uniform(-0.5, 1.5, size=(1000, 3))
+    invar = {"x": points[:, 0:1], "y": points[:, 1:2], "z": points[:, 2:3]}
+    sdf = cube.sdf(invar, {}, compute_sdf_derivatives=True)
+    box_sdf = Box((0, 0, 0), (1, 1, 1)).sdf(invar, {}, compute_sdf_derivatives=True)
+    for key in ["sdf", "sdf__x", "sdf__y", "sdf__z"]:
+        assert np.allclose(sdf[key], box_sdf[key], atol=1e-3)
+
+    # the second query reuses the mesh
+    assert np.allclose(cube.sdf(invar, {})["sdf"], sdf["sdf"])
+
+    interior = cube.sample_interior(1000)
+    assert np.isclose(np.sum(interior["area"]), 1.0)
+    assert np.all(interior["sdf"] > 0)
+
+
+def test_read_stl(tmp_path):
+    mesh = _unit_cube_mesh()
+
+    for mode in [Mode.BINARY, Mode.ASCII]:
+        filename = str(tmp_path / "cube.stl")
+        mesh.save(filename, mode=mode)
+
+        # small chunks to merge vertices across chunks
+        stl_vertices, stl_faces, stl_normals = read_stl(filename, chunk_size=5)
+        assert stl_vertices.shape == (8, 3) and stl_vertices.dtype == np.float32
+        assert stl_faces.shape == (12, 3) and stl_faces.dtype == np.int32
+        assert np.array_equal(stl_vertices[stl_faces], mesh.vectors)
+        assert np.allclose(stl_normals, mesh.normals)
+
+        cube = Tessellation.from_stl(filename, sdf_device="cpu")
+        boundary = cube.sample_boundary(1000)
+        assert np.isclose(np.sum(boundary["area"]), 6.0)
+        interior = cube.sample_interior(1000)
+        assert np.isclose(np.sum(interior["area"]), 1.0)
+
+    # the stored normals are used, zero normals fall back to the winding
+    flipped = np_mesh.Mesh(mesh.data.copy())
+    flipped.normals[:] = -mesh.normals
+    flipped.normals[0] = 0
+    for mode in [Mode.BINARY, Mode.ASCII]:
+        filename = str(tmp_path / "flipped_cube.stl")
+        flipped.save(filename, mode=mode, update_normals=False)
+        cube = Tessellation.from_stl(filename, sdf_device="cpu")
+        boundary = cube.sample_boundary(1000)
+        xyz = np.concatenate([boundary[k] for k in ["x", "y", "z"]], axis=1)
+        normal = np.concatenate(
+            [boundary[k] for k in ["normal_x", "normal_y", "normal_z"]], axis=1
+        )
+        outward = np.sum(normal * (xyz - 0.5), axis=1) > 0
+        # the first triangle is the half of the x = 0 face below z = y
+        first = np.logical_and(xyz[:, 0] == 0, xyz[:, 2] < xyz[:, 1])
+        assert np.any(first)
+        assert np.array_equal(outward, first)
@@ -0,0 +1,59 @@
+# SPDX-FileCopyrightText: Copyright (c) 2023 - 2024 NVIDIA CORPORATION & AFFILIATES.
+# SPDX-FileCopyrightText: All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+
+import torch
+from physicsnemo.sym.utils.training.checkpoint import CheckpointWriter
+
+
+def test_checkpoint_writer(tmp_path):
+    model = torch.nn.Linear(3, 2)
+    optimizer = torch.optim.Adam(model.parameters())
+    model_file = str(tmp_path / "model.0.pth")
+    optim_file = str(tmp_path / "optim_checkpoint.0.pth")
+
+    for asynchronous in [True, False]:
+        writer = CheckpointWriter(asynchronous=asynchronous, keep=2)
+        for step in range(4):
+            writer.save(
+                {
+                    model_file: model.state_dict(),
+                    optim_file: {"step": step, "state": optimizer.state_dict()},
+                },
+                step,
+            )
+            # snapshot is taken at save, later updates do not leak into it
+            expected_weight = model.weight.detach().clone()
+            with torch.no_grad():
+                model.weight.add_(1.0)
+            writer.flush()
+            assert torch.equal(torch.load(model_file)["weight"], expected_weight)
+            assert torch.load(optim_file)["step"] == step
+        writer.close()
+
+        # only the last two step directories are kept and no temporary files
+        step_dirs = sorted(os.listdir(tmp_path / "checkpoints"))
+        assert step_dirs == ["step_00000002", "step_00000003"]
+        assert torch.load(tmp_path / "checkpoints" / "step_00000002" / "model.0.pth")
+        assert not [f for f in os.listdir(tmp_path) if f.endswith(".tmp")]
+
+
+if __name__ == "__main__":
+    import tempfile
+    import pathlib
+
+    test_checkpoint_writer(pathlib.Path(tempfile.mkdtemp()))
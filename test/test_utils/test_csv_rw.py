@@ -0,0 +1,58 @@
+# SPDX-FileCopyrightText: Copyright (c) 2023 - 2024 NVIDIA CORPORATION & AFFILIATES.
+# SPDX-FileCopyrightText: All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import glob
+import os
+
+import numpy as np
+from physicsnemo.sym.utils.io import csv_to_dict, dict_to_csv
+
+
+def test_csv_to_dict(tmp_path):
+    filename = str(tmp_path / "data.csv")
+    data = {key: np.random.rand(100, 1) for key in ["x", "y", "u"]}
+    dict_to_csv(data, filename)
+
+    # full file, parsed in several chunks
+    csv_dict = csv_to_dict(filename, chunk_rows=32)
+    assert list(csv_dict.keys()) == ["x", "y", "u"]
+    for key, value in data.items():
+        assert csv_dict[key].shape == (100, 1)
+        assert np.allclose(csv_dict[key], value)
+
+    # mapped columns only, cached as float32
+    mapping = {"x": "x_0", "u": "u_0"}
+    for _ in range(2):
+        csv_dict = csv_to_dict(filename, mapping, dtype=np.float32, cache=True)
+        assert list(csv_dict.keys()) == ["x_0", "u_0"]
+        assert csv_dict["u_0"].dtype == np.float32
+        assert np.allclose(csv_dict["u_0"], data["u"])
+        assert len(glob.glob(filename + ".*.npy")) == 1
+    assert isinstance(csv_dict["x_0"].base, np.memmap)
+
+    # cache is invalidated when the file changes
+    data["x"] += 1.0
+    dict_to_csv(data, filename)
+    os.utime(filename, ns=(0, 0))
+    csv_dict = csv_to_dict(filename, mapping, dtype=np.float32, cache=True)
+    assert np.allclose(csv_dict["x_0"], data["x"])
+
+
+if __name__ == "__main__":
+    import tempfile
+    import pathlib
+
+    test_csv_to_dict(pathlib.Path(tempfile.mkdtemp()))
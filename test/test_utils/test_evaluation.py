@@ -0,0 +1,76 @@
+# SPDX-FileCopyrightText: Copyright (c) 2023 - 2024 NVIDIA CORPORATION & AFFILIATES.
+# SPDX-FileCopyrightText: All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import logging
+import threading
+
+import torch
+from physicsnemo.sym.utils.training.evaluation import (
+    BackgroundEvaluator,
+    evaluation_copy,
+)
+
+
+class _Validator:
+    def __init__(self, model):
+        self.model = model
+        self.forward = self._forward
+
+    def _forward(self, x):
+        return self.model(x)
+
+
+def test_background_evaluator():
+    model = torch.nn.Linear(2, 1)
+    models = torch.nn.ModuleList([model])
+    evaluator = BackgroundEvaluator(models, logging.getLogger(__name__))
+
+    # evaluation copy runs on the snapshot networks
+    validator = _Validator(torch.nn.Sequential(model))
+    validator_copy = evaluation_copy(validator, evaluator.memo)
+    assert validator_copy.model[0] is evaluator.snapshot_models[0]
+    assert validator_copy.forward.__self__ is validator_copy
+
+    # weights are copied at submit, later updates do not leak into the evaluation
+    x = torch.ones(1, 2)
+    release = threading.Event()
+    results = []
+
+    def job(step):
+        release.wait()
+        results.append((step, validator_copy.forward(x)))
+
+    expected = model(x).detach()
+    assert evaluator.submit(0, [job])
+    with torch.no_grad():
+        model.weight.add_(1.0)
+
+    # previous evaluation still running, the new one is dropped
+    assert evaluator.busy
+    assert not evaluator.submit(1, [job])
+    release.set()
+    evaluator.wait()
+    assert len(results) == 1 and results[0][0] == 0
+    assert torch.equal(results[0][1], expected)
+
+    assert evaluator.submit(2, [job])
+    evaluator.close()
+    assert results[1][0] == 2
+    assert torch.equal(results[1][1], model(x).detach())
+
+
+if __name__ == "__main__":
+    test_background_evaluator()
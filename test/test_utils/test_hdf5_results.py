@@ -0,0 +1,46 @@
+# SPDX-FileCopyrightText: Copyright (c) 2023 - 2024 NVIDIA CORPORATION & AFFILIATES.
+# SPDX-FileCopyrightText: All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import numpy as np
+from physicsnemo.sym.utils.io import HDF5ResultsWriter, HDF5ResultsReader, var_to_hdf5
+
+
+def test_hdf5_results(tmp_path):
+    file_path = str(tmp_path / "results")
+    x = np.random.rand(100, 1).astype(np.float32)
+    u = np.random.rand(100, 3, 4)
+
+    # write a step batch by batch and another step at once
+    for compression in [None, "lzf"]:
+        with HDF5ResultsWriter(file_path, step=10, compression=compression) as writer:
+            for i in range(0, 100, 30):
+                writer.append({"x": x[i : i + 30], "u": u[i : i + 30]})
+        var_to_hdf5({"x": 2 * x, "u": 2 * u}, file_path, step=20)
+
+        with HDF5ResultsReader(file_path) as reader:
+            assert reader.steps == [10, 20]
+            results = reader.read(10)
+            assert results["x"].dtype == np.float32
+            assert np.array_equal(results["x"][:], x)
+            assert np.array_equal(results["u"][:], u)
+            assert np.array_equal(reader.read()["u"][50:60], 2 * u[50:60])
+
+
+if __name__ == "__main__":
+    import tempfile
+    import pathlib
+
+    test_hdf5_results(pathlib.Path(tempfile.mkdtemp()))
@@ -0,0 +1,66 @@
+# SPDX-FileCopyrightText: Copyright (c) 2023 - 2024 NVIDIA CORPORATION & AFFILIATES.
+# SPDX-FileCopyrightText: All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import logging
+
+import torch
+from physicsnemo.sym.utils.training.metrics import MetricsBuffer
+
+
+class RecordingWriter:
+    def __init__(self):
+        self.scalars = []
+
+    def add_scalar(self, tag, value, step, new_style=False):
+        self.scalars.append((tag, value, step))
+
+
+def test_metrics_buffer(caplog):
+    log = logging.getLogger("test_metrics_buffer")
+    for asynchronous in [True, False]:
+        writer = RecordingWriter()
+        metrics = MetricsBuffer(writer, log, asynchronous=asynchronous)
+
+        loss = torch.tensor(0.5)
+        for step in range(3):
+            metrics.add_scalar("Train/loss", loss, step)
+            metrics.add_scalar("Train/learning_rate", 1e-3, step)
+            metrics.check_finite(step, loss)
+            # tensors are cloned when buffered, in place updates do not leak in
+            loss.add_(1.0)
+
+        with caplog.at_level(logging.INFO, logger="test_metrics_buffer"):
+            metrics.add_message(
+                "loss: {loss:.1f}, time: {time:.1f}", loss=loss, time=lambda: 2.0
+            )
+            # nothing is written before the flush
+            assert writer.scalars == []
+            assert metrics.flush() is None
+            metrics.close()
+        assert [v for t, v, _ in writer.scalars if t == "Train/loss"] == [
+            0.5,
+            1.5,
+            2.5,
+        ]
+        assert ("Train/learning_rate", 1e-3, 2) in writer.scalars
+        assert "loss: 3.5, time: 2.0" in caplog.text
+
+        # first non-finite step is reported on flush
+        metrics.check_finite(10, torch.tensor(1.0))
+        metrics.check_finite(11, torch.tensor(float("nan")))
+        metrics.check_finite(12, torch.tensor(float("inf")))
+        assert metrics.flush() == 11
+        metrics.close()
@@ -0,0 +1,70 @@
+# SPDX-FileCopyrightText: Copyright (c) 2023 - 2024 NVIDIA CORPORATION & AFFILIATES.
+# SPDX-FileCopyrightText: All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+
+import numpy as np
+import torch
+from sympy import Symbol, sin
+from torch.utils.tensorboard import SummaryWriter
+from physicsnemo.sym.node import Node
+from physicsnemo.sym.utils.io import HDF5ResultsReader
+from physicsnemo.sym.domain.validator import (
+    PointwiseValidator,
+    StreamingPointwiseValidator,
+)
+
+
+def test_StreamingPointwiseValidator(tmp_path):
+    "check the streaming validator matches the in-memory validator on a biased node"
+
+    x = Symbol("x")
+    node = Node.from_sympy(sin(x) + 0.1 * x, "u")
+    invar = {"x": np.linspace(0, 3, 1000)[:, None]}
+    true_outvar = {"u": np.sin(invar["x"])}
+
+    writer = SummaryWriter(log_dir=str(tmp_path))
+    results_dir = str(tmp_path) + "/"
+    losses = PointwiseValidator([node], invar, true_outvar, batch_size=64).save_results(
+        "val", results_dir, writer, ["np"], 0
+    )
+    streaming = StreamingPointwiseValidator([node], invar, true_outvar, batch_size=64)
+    streaming_losses = streaming.save_results("val", results_dir, writer, ["np"], 0)
+
+    assert torch.allclose(
+        streaming_losses["l2_relative_error_u"], losses["l2_relative_error_u"]
+    )
+    error = np.abs(0.1 * invar["x"])
+    assert np.isclose(streaming_losses["max_error_u"].item(), error.max())
+    assert np.isclose(streaming_losses["mean_absolute_error_u"].item(), error.mean())
+
+    # results are written to a structured memory mapped file
+    results = np.load(results_dir + "val.npy", mmap_mode="r")
+    assert np.allclose(results["x"], invar["x"])
+    assert np.allclose(results["true_u"], true_outvar["u"])
+    assert np.allclose(results["pred_u"], true_outvar["u"] + error)
+
+    # results appended batch by batch to the hdf5 results file
+    streaming.save_results("val", results_dir, writer, ["hdf5"], 10)
+    with HDF5ResultsReader(results_dir + "val") as reader:
+        assert reader.steps == [10]
+        assert np.allclose(reader.read()["pred_u"][:], true_outvar["u"] + error)
+
+    # no results file unless requested
+    os.remove(results_dir + "val.npy")
+    streaming.save_results("val", results_dir, writer, [], 0)
+    assert not os.path.exists(results_dir + "val.npy")
+    writer.close()